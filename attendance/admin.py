@@ -1,3 +1,12 @@
 from django.contrib import admin
 
+from attendance.models import SectionAttendance, SectionRoster
+
 # Register your models here.
+@admin.register(SectionAttendance)
+class SectionAttendanceAdmin(admin.ModelAdmin):
+    list_display = ('section', 'date', 'roster', 'updated_at')
+    list_filter = ('date',)
+
+
+admin.site.register(SectionRoster)
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from attendance.summaries import rebuild_school_summaries
+from school.models import School
+
+
+class Command(BaseCommand):
+    help = "Recompute attendance summaries from the daily section records."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', type=int, action='append', dest='schools', help="Only rebuild this school (repeatable).")
+
+    def handle(self, *args, **options):
+        school_ids = options['schools'] or list(School.objects.order_by('id').values_list('id', flat=True))
+        for school_id in school_ids:
+            started = time.perf_counter()
+            sections, students = rebuild_school_summaries(school_id)
+            self.stdout.write(
+                f"School {school_id}: {sections} section and {students} student summaries "
+                f"in {time.perf_counter() - started:.2f}s."
+            )
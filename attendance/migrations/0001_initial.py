@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('section', '0002_section_unique_grade_section'),
+        ('student', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionRoster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rosters', to='section.section')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SectionAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('states', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='section.section')),
+                ('taken_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('roster', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='attendance', to='attendance.sectionroster')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('section', 'date'), name='unique_section_attendance_date')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RosterEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='roster_entries', to='student.student')),
+                ('roster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='attendance.sectionroster')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('roster', 'position'), name='unique_roster_position'), models.UniqueConstraint(fields=('student', 'roster'), name='unique_roster_student')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+        ('section', '0002_section_unique_grade_section'),
+        ('student', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('WEEK', 'Week'), ('TERM', 'Term'), ('YEAR', 'Year')], max_length=4)),
+                ('period_start', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('days', models.PositiveIntegerField(default=0)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='section.section')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('section', 'period', 'period_start'), name='unique_section_summary_period')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('WEEK', 'Week'), ('TERM', 'Term'), ('YEAR', 'Year')], max_length=4)),
+                ('period_start', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='student.student')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('student', 'period', 'period_start'), name='unique_student_summary_period')],
+            },
+        ),
+    ]
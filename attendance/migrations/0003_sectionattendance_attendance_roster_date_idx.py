@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_sectionattendancesummary_studentattendancesummary'),
+        ('section', '0002_section_unique_grade_section'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sectionattendance',
+            index=models.Index(fields=['roster', 'date'], name='attendance_roster_date_idx'),
+        ),
+    ]
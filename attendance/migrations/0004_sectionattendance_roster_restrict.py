@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_sectionattendance_attendance_roster_date_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sectionattendance',
+            name='roster',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.RESTRICT, related_name='attendance', to='attendance.sectionroster'),
+        ),
+    ]
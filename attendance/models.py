@@ -1,3 +1,96 @@
 from django.db import models
 
+from section.models import Section
+from student.models import Student
+from users.models import User
+
 # Create your models here.
+class SectionRoster(models.Model):
+    """
+    Ordered snapshot of a section's students. Daily attendance is stored in roster
+    order, so a new roster is only created when the section's students change.
+    """
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='rosters')
+    size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Roster {self.id} - {self.section} ({self.size} students)'
+
+
+class RosterEntry(models.Model):
+    """Position of a student in a roster, so one student's state can be read directly."""
+    roster = models.ForeignKey(SectionRoster, on_delete=models.CASCADE, related_name='entries')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='roster_entries')
+    position = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['roster', 'position'], name='unique_roster_position'),
+            models.UniqueConstraint(fields=['student', 'roster'], name='unique_roster_student'),
+        ]
+
+
+class SectionAttendance(models.Model):
+    """Attendance of a whole section for one day: one 2-bit state per roster position."""
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='attendance')
+    roster = models.ForeignKey(SectionRoster, on_delete=models.RESTRICT, related_name='attendance')  # Deleted with its section, never on its own
+    date = models.DateField()
+    states = models.BinaryField()  # See attendance.storage
+    taken_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'date'], name='unique_section_attendance_date'),
+        ]
+        indexes = [
+            # A student's history is read by roster, in date order
+            models.Index(fields=['roster', 'date'], name='attendance_roster_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.section} - {self.date}'
+
+
+class AttendanceSummary(models.Model):
+    """
+    Running totals of student-day states over a week, term or year, kept up to date
+    by attendance.summaries whenever a section's day is written or corrected.
+    """
+    WEEK = 'WEEK'
+    TERM = 'TERM'
+    YEAR = 'YEAR'
+    PERIOD_CHOICES = [(WEEK, 'Week'), (TERM, 'Term'), (YEAR, 'Year')]
+
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def marked(self):
+        return self.present + self.absent + self.late
+
+
+class SectionAttendanceSummary(AttendanceSummary):
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='attendance_summaries')
+    days = models.PositiveIntegerField(default=0)  # Days attendance was taken
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'period', 'period_start'], name='unique_section_summary_period'),
+        ]
+
+
+class StudentAttendanceSummary(AttendanceSummary):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance_summaries')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'period', 'period_start'], name='unique_student_summary_period'),
+        ]
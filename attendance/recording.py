@@ -0,0 +1,71 @@
+from collections import Counter
+
+from django.db import transaction
+
+from attendance.models import RosterEntry, SectionAttendance, SectionRoster
+from attendance.storage import PRESENT, UNMARKED, pack_states, unpack_states
+from attendance.summaries import apply_attendance_change
+from student.models import Student
+
+
+def current_roster(section):
+    """The section's roster for its current students, reusing the latest one if nothing changed."""
+    student_ids = list(Student.objects.filter(section=section).order_by('id').values_list('id', flat=True))
+
+    latest = SectionRoster.objects.filter(section=section).order_by('-id').first()
+    if latest is not None:
+        latest_ids = list(latest.entries.order_by('position').values_list('student_id', flat=True))
+        if latest_ids == student_ids and latest.size == len(student_ids):
+            return latest, student_ids
+
+    roster = SectionRoster.objects.create(section=section, size=len(student_ids))
+    RosterEntry.objects.bulk_create([
+        RosterEntry(roster=roster, student_id=student_id, position=position)
+        for position, student_id in enumerate(student_ids)
+    ])
+    return roster, student_ids
+
+
+def record_attendance(section, date, states_by_student, taken_by_id=None):
+    """
+    Write a section's attendance for `date` as one row; students missing from
+    `states_by_student` are marked present. Taking attendance again for the same
+    day replaces it and corrects the summaries. Returns the record and the
+    previous one (None if new).
+    """
+    with transaction.atomic():
+        roster, student_ids = current_roster(section)
+        states = [states_by_student.get(student_id, PRESENT) for student_id in student_ids]
+
+        previous = SectionAttendance.objects.select_for_update().filter(section=section, date=date).first()
+        if previous is not None:
+            # Keep what was there so callers can compute what changed
+            previous = SectionAttendance(
+                id=previous.id, section=section, roster_id=previous.roster_id, date=date, states=bytes(previous.states),
+            )
+        attendance, _ = SectionAttendance.objects.update_or_create(
+            section=section,
+            date=date,
+            defaults={'roster': roster, 'states': pack_states(states), 'taken_by_id': taken_by_id},
+        )
+        if previous is None:
+            apply_attendance_change(section.id, date, None, dict(zip(student_ids, states)))
+        else:
+            old_states, dropped = decode_attendance(previous, with_dropped=True)
+            apply_attendance_change(section.id, date, old_states, dict(zip(student_ids, states)), dropped)
+    return attendance, previous
+
+
+def decode_attendance(attendance, with_dropped=False):
+    """
+    {student_id: state} for a whole section day. With `with_dropped`, also return
+    the states recorded for students deleted since, as {state: count}.
+    """
+    entries = dict(RosterEntry.objects.filter(roster_id=attendance.roster_id).values_list('position', 'student_id'))
+    # Trailing padding decodes as UNMARKED, so every packed position can be read
+    states = unpack_states(attendance.states, len(attendance.states) * 4)
+    decoded = {student_id: int(states[position]) for position, student_id in entries.items()}
+    if not with_dropped:
+        return decoded
+    dropped = Counter(int(state) for position, state in enumerate(states) if position not in entries and state != UNMARKED)
+    return decoded, dropped
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from attendance.storage import STATUS_CODES
+
+
+class AttendanceRecordSerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=list(STATUS_CODES))
+
+
+class TakeAttendanceSerializer(serializers.Serializer):
+    """A day's attendance for a section; students not listed are marked present."""
+    date = serializers.DateField()
+    records = AttendanceRecordSerializer(many=True, required=False, default=list)
+
+    def validate_records(self, records):
+        students = [record['student'] for record in records]
+        if len(students) != len(set(students)):
+            raise serializers.ValidationError("Each student can only be listed once.")
+        return records
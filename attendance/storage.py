@@ -0,0 +1,30 @@
+import numpy as np
+
+# Attendance states, packed 2 bits per student (4 students per byte) in roster order
+UNMARKED, PRESENT, ABSENT, LATE = 0, 1, 2, 3
+STATUS_CODES = {'PRESENT': PRESENT, 'ABSENT': ABSENT, 'LATE': LATE}
+STATUS_NAMES = {UNMARKED: 'UNMARKED', PRESENT: 'PRESENT', ABSENT: 'ABSENT', LATE: 'LATE'}
+
+_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+
+def pack_states(states):
+    """Pack a sequence of state codes (0-3) into bytes, 4 per byte."""
+    states = np.asarray(states, dtype=np.uint8)
+    padded = np.zeros(-(-len(states) // 4) * 4, dtype=np.uint8)
+    padded[:len(states)] = states
+    quads = padded.reshape(-1, 4) << _SHIFTS
+    return np.bitwise_or.reduce(quads, axis=1).astype(np.uint8).tobytes()
+
+
+def unpack_states(data, count):
+    """Decode the first `count` state codes from packed bytes, as a NumPy array."""
+    packed = np.frombuffer(bytes(data), dtype=np.uint8)
+    return ((packed[:, None] >> _SHIFTS) & 3).reshape(-1)[:count]
+
+
+def state_at(data, position):
+    """Decode a single student's state without unpacking the rest."""
+    if position // 4 >= len(data):
+        return UNMARKED
+    return (data[position // 4] >> (position % 4) * 2) & 3
@@ -0,0 +1,177 @@
+import datetime
+import operator
+from collections import Counter, defaultdict
+from functools import reduce
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+
+from attendance.models import (
+    AttendanceSummary, RosterEntry, SectionAttendance, SectionAttendanceSummary, SectionRoster,
+    StudentAttendanceSummary,
+)
+from attendance.storage import ABSENT, LATE, PRESENT, UNMARKED, unpack_states
+
+PERIODS = [AttendanceSummary.WEEK, AttendanceSummary.TERM, AttendanceSummary.YEAR]
+COUNTERS = {PRESENT: 'present', ABSENT: 'absent', LATE: 'late'}
+
+
+def period_start(day, period):
+    """First day of the week (Monday), term or school year containing `day`."""
+    if period == AttendanceSummary.WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    if period == AttendanceSummary.YEAR:
+        month = settings.ATTENDANCE_YEAR_START_MONTH
+        return datetime.date(day.year if day.month >= month else day.year - 1, month, 1)
+    starts = [
+        datetime.date(year, month, 1)
+        for year in (day.year - 1, day.year) for month in settings.ATTENDANCE_TERM_START_MONTHS
+    ]
+    return max(start for start in starts if start <= day)
+
+
+def apply_attendance_change(section_id, day, old_states, new_states, dropped=None):
+    """
+    Move the summary counters of every period containing `day` from `old_states`
+    to `new_states` ({student_id: state}); `old_states` is None for a new day.
+    `dropped` ({state: count}) are old states of students deleted since, which
+    only the section totals still include.
+
+    Students are grouped by (old, new) state so each group is one UPDATE, whatever
+    the section size.
+    """
+    new_day = old_states is None
+    old_states = old_states or {}
+    changes = defaultdict(list)
+    for student_id in old_states.keys() | new_states.keys():
+        old, new = old_states.get(student_id, UNMARKED), new_states.get(student_id, UNMARKED)
+        if old != new:
+            changes[old, new].append(student_id)
+
+    section_delta = Counter({COUNTERS.get(state): -count for state, count in (dropped or {}).items()})
+    for (old, new), student_ids in changes.items():
+        section_delta[COUNTERS.get(old)] -= len(student_ids)
+        section_delta[COUNTERS.get(new)] += len(student_ids)
+    section_update = {name: F(name) + delta for name, delta in section_delta.items() if name and delta}
+    if new_day:
+        section_update['days'] = F('days') + 1
+
+    # Each change applies equally to the week, term and year rows, so one statement covers all three
+    keys = [{'period': period, 'period_start': period_start(day, period)} for period in PERIODS]
+    in_periods = reduce(operator.or_, (Q(**key) for key in keys))
+
+    if section_update:
+        SectionAttendanceSummary.objects.bulk_create(
+            [SectionAttendanceSummary(section_id=section_id, **key) for key in keys], ignore_conflicts=True,
+        )
+        SectionAttendanceSummary.objects.filter(in_periods, section_id=section_id).update(**section_update)
+
+    if changes:
+        StudentAttendanceSummary.objects.bulk_create(
+            [
+                StudentAttendanceSummary(student_id=student_id, **key)
+                for key in keys for student_ids in changes.values() for student_id in student_ids
+            ],
+            ignore_conflicts=True,
+        )
+    for (old, new), student_ids in changes.items():
+        update = {}
+        if old in COUNTERS:
+            update[COUNTERS[old]] = F(COUNTERS[old]) - 1
+        if new in COUNTERS:
+            update[COUNTERS[new]] = F(COUNTERS[new]) + 1
+        StudentAttendanceSummary.objects.filter(in_periods, student_id__in=student_ids).update(**update)
+
+
+def _tally(keys, states):
+    """Unique rows of `keys` and, for each, how many of `states` were 0, 1, 2 and 3."""
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    counts = np.bincount(inverse.reshape(-1) * 4 + states, minlength=len(unique) * 4)
+    return unique, counts.reshape(-1, 4)
+
+
+def _load_rosters(school_id):
+    """{roster_id: student ids by position}, -1 where the student has since been deleted."""
+    rosters = {
+        roster_id: np.full(size, -1, dtype=np.int64)
+        for roster_id, size in SectionRoster.objects.filter(section__grade__school_id=school_id).values_list('id', 'size')
+    }
+    entries = RosterEntry.objects.filter(roster_id__in=list(rosters)).values_list('roster_id', 'position', 'student_id')
+    for roster_id, position, student_id in entries.iterator(chunk_size=5000):
+        rosters[roster_id][position] = student_id
+    return rosters
+
+
+def compute_school_summaries(school_id):
+    """
+    Recompute every summary of a school from its raw daily records.
+
+    Each day is unpacked into a (student, state) array and the counters are
+    tallied with NumPy per (student, period start) and (section, period start),
+    rather than row by row in Python.
+    """
+    rosters = _load_rosters(school_id)
+    days = SectionAttendance.objects.filter(section__grade__school_id=school_id).values_list(
+        'section_id', 'date', 'roster_id', 'states',
+    )
+
+    day_sections, day_dates, student_ids, states, day_index = [], [], [], [], []
+    for index, (section_id, date, roster_id, packed) in enumerate(days.iterator(chunk_size=2000)):
+        ids = rosters[roster_id]
+        day_sections.append(section_id)
+        day_dates.append(date)
+        student_ids.append(ids)
+        states.append(unpack_states(packed, len(ids)))
+        day_index.append(np.full(len(ids), index, dtype=np.int64))
+    if not day_dates:
+        return [], []
+
+    day_sections = np.array(day_sections, dtype=np.int64)
+    student_ids = np.concatenate(student_ids)
+    states = np.concatenate(states).astype(np.int64)
+    day_index = np.concatenate(day_index)
+    marked = states != UNMARKED
+    # Deleted students still count towards their section's past totals, but get no summary of their own
+    known = marked & (student_ids >= 0)
+
+    section_summaries, student_summaries = [], []
+    for period in PERIODS:
+        # Period starts are computed once per distinct date, then broadcast to every student-day
+        starts = {date: period_start(date, period).toordinal() for date in set(day_dates)}
+        day_starts = np.array([starts[date] for date in day_dates], dtype=np.int64)
+
+        section_keys = np.column_stack([day_sections[day_index], day_starts[day_index]])[marked]
+        keys, counts = _tally(section_keys, states[marked])
+        totals = dict(zip(map(tuple, keys.tolist()), counts.tolist()))
+        # Every day taken counts, even one with no student marked
+        day_keys, day_counts = np.unique(np.column_stack([day_sections, day_starts]), axis=0, return_counts=True)
+        for (section_id, start), taken in zip(day_keys.tolist(), day_counts.tolist()):
+            row = totals.get((section_id, start), [0, 0, 0, 0])
+            section_summaries.append(SectionAttendanceSummary(
+                section_id=section_id, period=period, period_start=datetime.date.fromordinal(start),
+                present=row[PRESENT], absent=row[ABSENT], late=row[LATE], days=taken,
+            ))
+
+        student_keys = np.column_stack([student_ids, day_starts[day_index]])[known]
+        keys, counts = _tally(student_keys, states[known])
+        student_summaries += [
+            StudentAttendanceSummary(
+                student_id=student_id, period=period, period_start=datetime.date.fromordinal(start),
+                present=row[PRESENT], absent=row[ABSENT], late=row[LATE],
+            )
+            for (student_id, start), row in zip(keys.tolist(), counts.tolist())
+        ]
+    return section_summaries, student_summaries
+
+
+def rebuild_school_summaries(school_id, batch_size=1000):
+    """Replace a school's summaries with ones recomputed from raw data; returns (sections, students) rows written."""
+    section_summaries, student_summaries = compute_school_summaries(school_id)
+    with transaction.atomic():
+        SectionAttendanceSummary.objects.filter(section__grade__school_id=school_id).delete()
+        StudentAttendanceSummary.objects.filter(student__school_id=school_id).delete()
+        SectionAttendanceSummary.objects.bulk_create(section_summaries, batch_size=batch_size)
+        StudentAttendanceSummary.objects.bulk_create(student_summaries, batch_size=batch_size)
+    return len(section_summaries), len(student_summaries)
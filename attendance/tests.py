@@ -1,3 +1,272 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.db.models import RestrictedError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from attendance.models import SectionAttendance, SectionAttendanceSummary, SectionRoster, StudentAttendanceSummary
+from attendance.recording import decode_attendance, record_attendance
+from attendance.storage import ABSENT, LATE, PRESENT, UNMARKED, pack_states, state_at, unpack_states
+from attendance.summaries import rebuild_school_summaries
+from core.endpoints import client_for
+from core.testing import create_grade, create_school, create_section, create_student, create_teacher
+from grade.models import Grade
+from section.models import Section
+
+MONDAY = datetime.date(2026, 10, 5)
+
+
+class StorageTests(SimpleTestCase):
+    def test_pack_round_trip(self):
+        for states in ([], [PRESENT], [ABSENT, LATE, UNMARKED], [PRESENT, ABSENT, LATE, UNMARKED, LATE], [LATE] * 9):
+            packed = pack_states(states)
+            self.assertEqual(len(packed), -(-len(states) // 4))
+            self.assertEqual(unpack_states(packed, len(states)).tolist(), states)
+            self.assertEqual([state_at(packed, position) for position in range(len(states))], states)
+
+    def test_packs_four_states_per_byte_from_the_low_bits(self):
+        self.assertEqual(pack_states([PRESENT, ABSENT, LATE, UNMARKED, ABSENT]), bytes([0b00111001, 0b00000010]))
+
+    def test_positions_past_the_end_are_unmarked(self):
+        packed = pack_states([ABSENT] * 5)
+        self.assertEqual(state_at(packed, 7), UNMARKED)
+        self.assertEqual(state_at(packed, 8), UNMARKED)
+        self.assertEqual(state_at(b'', 0), UNMARKED)
+
+
+class TakeAttendanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.teacher = create_teacher(cls.school)
+        cls.section = create_section(cls.school)
+        cls.students = [create_student(cls.section) for _ in range(5)]
+
+    def take(self, date, records, user=None):
+        return client_for(user or self.teacher.user).post(
+            reverse('section-attendance', args=[self.section.pk]),
+            {'date': date.isoformat(), 'records': [{'student': student.pk, 'status': status} for student, status in records]},
+            content_type='application/json',
+        )
+
+    def read(self, date):
+        return client_for(self.teacher.user).get(
+            reverse('section-attendance', args=[self.section.pk]), {'date': date.isoformat()},
+        )
+
+    def test_take_and_read_a_day(self):
+        first, second, third = self.students[:3]
+        response = self.take(MONDAY, [(first, 'ABSENT'), (second, 'LATE')])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'section': self.section.pk, 'date': MONDAY.isoformat(), 'marked': 2})
+
+        attendance = SectionAttendance.objects.get(section=self.section, date=MONDAY)
+        self.assertEqual(attendance.taken_by_id, self.teacher.user_id)
+        self.assertEqual(bytes(attendance.states), pack_states([ABSENT, LATE, PRESENT, PRESENT, PRESENT]))
+
+        response = self.read(MONDAY)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['records'], [
+            {'student': student.pk, 'status': status}
+            for student, status in zip(self.students, ['ABSENT', 'LATE', 'PRESENT', 'PRESENT', 'PRESENT'])
+        ])
+
+        # Taking it again replaces the day
+        response = self.take(MONDAY, [(third, 'ABSENT')])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(SectionAttendance.objects.filter(section=self.section).count(), 1)
+        self.assertEqual(
+            [record['status'] for record in self.read(MONDAY).json()['records']],
+            ['PRESENT', 'PRESENT', 'ABSENT', 'PRESENT', 'PRESENT'],
+        )
+
+    def test_rejects_students_outside_the_section(self):
+        outsider = create_student(create_section(self.school))
+        response = self.take(MONDAY, [(self.students[0], 'ABSENT'), (outsider, 'ABSENT')])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Some students are not in this section.', 'students': [outsider.pk]})
+
+        response = self.take(MONDAY, [(self.students[0], 'ABSENT'), (self.students[0], 'LATE')])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SectionAttendance.objects.exists())
+
+    def test_day_not_taken_and_other_schools(self):
+        self.assertEqual(self.read(MONDAY).status_code, 404)
+        self.assertEqual(self.take(MONDAY, [], user=create_school().user).status_code, 403)
+
+    def test_roster_is_reused_until_the_students_change(self):
+        self.take(MONDAY, [(self.students[0], 'ABSENT')])
+        self.take(MONDAY + datetime.timedelta(days=1), [(self.students[1], 'LATE')])
+        self.assertEqual(SectionRoster.objects.filter(section=self.section).count(), 1)
+
+        # A student joins and another leaves: old days keep decoding through their own roster
+        newcomer = create_student(self.section)
+        leaver = self.students[1]
+        leaver.delete()
+        tuesday = MONDAY + datetime.timedelta(days=1)
+        wednesday = MONDAY + datetime.timedelta(days=2)
+        self.take(wednesday, [(newcomer, 'LATE'), (self.students[4], 'ABSENT')])
+        self.assertEqual(SectionRoster.objects.filter(section=self.section).count(), 2)
+
+        ids = [student.pk for student in self.students]
+        self.assertEqual(
+            decode_attendance(SectionAttendance.objects.get(section=self.section, date=tuesday)),
+            {ids[0]: PRESENT, ids[2]: PRESENT, ids[3]: PRESENT, ids[4]: PRESENT},
+        )
+        self.assertEqual(
+            decode_attendance(SectionAttendance.objects.get(section=self.section, date=wednesday)),
+            {ids[0]: PRESENT, ids[2]: PRESENT, ids[3]: PRESENT, ids[4]: ABSENT, newcomer.pk: LATE},
+        )
+        # The leaver's state is still counted on the old day
+        _, dropped = decode_attendance(SectionAttendance.objects.get(section=self.section, date=tuesday), with_dropped=True)
+        self.assertEqual(dropped, {LATE: 1})
+
+    def test_student_history_across_rosters(self):
+        student = self.students[2]
+        record_attendance(self.section, MONDAY, {student.pk: ABSENT})
+        create_student(self.section)  # New roster from here on
+        record_attendance(self.section, MONDAY + datetime.timedelta(days=1), {student.pk: LATE})
+        record_attendance(self.section, MONDAY + datetime.timedelta(days=2), {})
+
+        url = reverse('student-attendance', args=[student.pk])
+        response = client_for(self.school.user).get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'student': student.pk, 'records': [
+            {'date': '2026-10-05', 'status': 'ABSENT'},
+            {'date': '2026-10-06', 'status': 'LATE'},
+            {'date': '2026-10-07', 'status': 'PRESENT'},
+        ]})
+
+        response = client_for(self.school.user).get(url, {'from': '2026-10-06', 'to': '2026-10-06'})
+        self.assertEqual(response.json()['records'], [{'date': '2026-10-06', 'status': 'LATE'}])
+        # A student who joined later has no record of earlier days
+        newcomer = self.section.students.order_by('-id').first()
+        self.assertEqual(len(client_for(self.school.user).get(reverse('student-attendance', args=[newcomer.pk])).json()['records']), 2)
+
+
+class SummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.grades = [create_grade(cls.school) for _ in range(2)]
+        cls.sections = [create_section(grade=cls.grades[0]), create_section(grade=cls.grades[0]), create_section(grade=cls.grades[1])]
+        a, b, c = cls.students = [create_student(cls.sections[0]) for _ in range(3)]
+        d = create_student(cls.sections[1])
+        create_student(cls.sections[1])
+        create_student(cls.sections[2])
+
+        tuesday, next_monday = MONDAY + datetime.timedelta(days=1), MONDAY + datetime.timedelta(days=7)
+        record_attendance(cls.sections[0], MONDAY, {a.pk: ABSENT, b.pk: LATE})
+        record_attendance(cls.sections[0], tuesday, {a.pk: ABSENT})
+        record_attendance(cls.sections[1], MONDAY, {d.pk: LATE})
+        record_attendance(cls.sections[2], MONDAY, {})
+        # Corrections, including one after a student has left
+        record_attendance(cls.sections[0], MONDAY, {a.pk: PRESENT, b.pk: LATE, c.pk: ABSENT})
+        b.delete()
+        record_attendance(cls.sections[0], tuesday, {a.pk: LATE})
+        record_attendance(cls.sections[0], next_monday, {a.pk: ABSENT})
+
+    def summaries(self):
+        sections = SectionAttendanceSummary.objects.filter(section__grade__school=self.school)
+        students = StudentAttendanceSummary.objects.filter(student__school=self.school)
+        return (
+            {(row[0], row[1], row[2]): row[3:] for row in sections.values_list(
+                'section_id', 'period', 'period_start', 'present', 'absent', 'late', 'days',
+            )},
+            {(row[0], row[1], row[2]): row[3:] for row in students.values_list(
+                'student_id', 'period', 'period_start', 'present', 'absent', 'late',
+            )},
+        )
+
+    def test_incremental_updates_match_a_rebuild(self):
+        sections, students = self.summaries()
+        a, _, c = self.students
+        self.assertEqual(sections[self.sections[0].pk, 'WEEK', MONDAY], (2, 1, 2, 2))
+        self.assertEqual(sections[self.sections[0].pk, 'TERM', datetime.date(2026, 9, 1)], (3, 2, 2, 3))
+        self.assertEqual(students[a.pk, 'WEEK', MONDAY], (1, 0, 1))
+        self.assertEqual(students[c.pk, 'YEAR', datetime.date(2026, 9, 1)], (2, 1, 0))
+
+        self.assertEqual(rebuild_school_summaries(self.school.pk), (len(sections), len(students)))
+        self.assertEqual(self.summaries(), (sections, students))
+
+    def get(self, name, pk, period='week', date='2026-10-07'):
+        response = client_for(self.school.user).get(reverse(name, args=[pk]), {'period': period, 'date': date})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_section_summary(self):
+        a, _, c = self.students
+        self.assertEqual(self.get('section-attendance-summary', self.sections[0].pk), {
+            'section': self.sections[0].pk, 'period': 'WEEK', 'period_start': '2026-10-05', 'days': 2,
+            'present': 2, 'absent': 1, 'late': 2, 'absence_rate': 0.2,
+            'students': [
+                {'student': a.pk, 'present': 1, 'absent': 0, 'late': 1, 'absence_rate': 0.0},
+                {'student': c.pk, 'present': 1, 'absent': 1, 'late': 0, 'absence_rate': 0.5},
+            ],
+        })
+        term = self.get('section-attendance-summary', self.sections[0].pk, period='term', date='2026-10-14')
+        self.assertEqual((term['period_start'], term['days'], term['absent']), ('2026-09-01', 3, 2))
+
+    def test_grade_and_school_summaries(self):
+        first, second, third = self.sections
+        self.assertEqual(self.get('grade-attendance-summary', self.grades[0].pk), {
+            'grade': self.grades[0].pk, 'period': 'WEEK', 'period_start': '2026-10-05',
+            'present': 3, 'absent': 1, 'late': 3, 'absence_rate': 0.1429,
+            'sections': [
+                {'section': first.pk, 'days': 2, 'present': 2, 'absent': 1, 'late': 2, 'absence_rate': 0.2},
+                {'section': second.pk, 'days': 1, 'present': 1, 'absent': 0, 'late': 1, 'absence_rate': 0.0},
+            ],
+        })
+        self.assertEqual(self.get('school-attendance-summary', self.school.pk), {
+            'school': self.school.pk, 'period': 'WEEK', 'period_start': '2026-10-05',
+            'present': 4, 'absent': 1, 'late': 3, 'absence_rate': 0.125,
+            'grades': [
+                {'grade': self.grades[0].pk, 'section_days': 3, 'present': 3, 'absent': 1, 'late': 3, 'absence_rate': 0.1429},
+                {'grade': self.grades[1].pk, 'section_days': 1, 'present': 1, 'absent': 0, 'late': 0, 'absence_rate': 0.0},
+            ],
+        })
+
+    def test_periods_without_attendance(self):
+        summary = self.get('section-attendance-summary', self.sections[2].pk, date='2026-11-02')
+        self.assertEqual((summary['days'], summary['absence_rate'], summary['students']), (0, None, []))
+        response = client_for(self.school.user).get(reverse('school-attendance-summary', args=[self.school.pk]), {'period': 'month'})
+        self.assertEqual(response.status_code, 400)
+
+
+class AttendanceDeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.grades = [create_grade(cls.school) for _ in range(2)]
+        for grade in cls.grades:
+            for _ in range(2):
+                section = create_section(grade=grade)
+                students = [create_student(section) for _ in range(3)]
+                record_attendance(section, MONDAY, {students[0].pk: ABSENT})
+                create_student(section)
+                record_attendance(section, MONDAY + datetime.timedelta(days=1), {students[1].pk: LATE})
+
+    def test_sections_and_grades_with_attendance_can_be_deleted(self):
+        section = Section.objects.filter(grade=self.grades[0]).first()
+        section_id = section.pk
+        section.delete()
+        self.assertFalse(SectionAttendance.objects.filter(section_id=section_id).exists())
+        self.assertFalse(SectionRoster.objects.filter(section_id=section_id).exists())
+
+        Grade.objects.filter(school=self.school).delete()
+        self.assertFalse(SectionAttendance.objects.exists())
+        self.assertFalse(SectionRoster.objects.exists())
+
+    def test_roster_in_use_cannot_be_deleted_on_its_own(self):
+        roster = SectionRoster.objects.filter(attendance__isnull=False).first()
+        with self.assertRaises(RestrictedError):
+            roster.delete()
+
+    def test_section_and_grade_endpoints_delete_attendance_within_budget(self):
+        # Strict query budgets turn an over-budget request into a 500
+        client = client_for(self.school.user)
+        section = Section.objects.filter(grade=self.grades[0]).first()
+        self.assertEqual(client.delete(reverse('section-detail', args=[section.pk])).status_code, 204)
+        self.assertEqual(client.delete(reverse('grade-delete-sections', args=[self.grades[0].pk])).status_code, 204)
+        self.assertEqual(client.delete(reverse('grade-detail', args=[self.grades[1].pk])).status_code, 204)
+        self.assertFalse(SectionAttendance.objects.exists())
@@ -0,0 +1,14 @@
+from django.urls import path
+
+from attendance.views import (
+    GradeAttendanceSummaryView, SchoolAttendanceSummaryView, SectionAttendanceSummaryView, SectionAttendanceView,
+    StudentAttendanceView,
+)
+
+urlpatterns = [
+    path('sections/<int:section_id>/attendance/', SectionAttendanceView.as_view(), name='section-attendance'),
+    path('students/<int:student_id>/attendance/', StudentAttendanceView.as_view(), name='student-attendance'),
+    path('sections/<int:section_id>/attendance/summary/', SectionAttendanceSummaryView.as_view(), name='section-attendance-summary'),
+    path('grades/<int:grade_id>/attendance/summary/', GradeAttendanceSummaryView.as_view(), name='grade-attendance-summary'),
+    path('schools/<int:school_id>/attendance/summary/', SchoolAttendanceSummaryView.as_view(), name='school-attendance-summary'),
+]
@@ -1,3 +1,222 @@
-from django.shortcuts import render
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from attendance.models import (
+    AttendanceSummary, RosterEntry, SectionAttendance, SectionAttendanceSummary, StudentAttendanceSummary,
+)
+from attendance.recording import decode_attendance, record_attendance
+from attendance.serializers import TakeAttendanceSerializer
+from attendance.storage import STATUS_CODES, STATUS_NAMES, state_at
+from attendance.summaries import period_start
+from core.permissions import check_school_staff
+from grade.models import Grade
+from school.models import School
+from section.models import Section
+from student.models import Student
+
+
+def parse_date(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    try:
+        return serializers.DateField().run_validation(value)
+    except ValidationError as exc:
+        raise ValidationError({param: exc.detail})
+
+
+def parse_period(request):
+    """The (period, period_start) selected by ?period=week|term|year and ?date= (default today)."""
+    period = request.query_params.get('period', AttendanceSummary.WEEK).upper()
+    if period not in dict(AttendanceSummary.PERIOD_CHOICES):
+        raise ValidationError({'period': "Choose one of week, term or year."})
+    day = parse_date(request, 'date') or timezone.localdate()
+    return period, period_start(day, period)
+
+
+def summary_totals(present, absent, late, **extra):
+    marked = present + absent + late
+    return {
+        **extra,
+        'present': present,
+        'absent': absent,
+        'late': late,
+        'absence_rate': round(absent / marked, 4) if marked else None,
+    }
+
+
+SUMMARY_SUMS = {'present': Sum('present'), 'absent': Sum('absent'), 'late': Sum('late'), 'days': Sum('days')}
+
+
+class SectionAttendanceView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_section(self, request, section_id):
+        section = Section.objects.select_related('grade').filter(id=section_id).first()
+        if section is None:
+            return None
+        check_school_staff(request, section.grade.school_id)
+        return section
+
+    def get(self, request, section_id):
+        section = self.get_section(request, section_id)
+        if section is None:
+            return Response({"error": "Section not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        date = parse_date(request, 'date')
+        if date is None:
+            return Response({"error": "The date query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        attendance = SectionAttendance.objects.filter(section=section, date=date).first()
+        if attendance is None:
+            return Response({"message": "Attendance has not been taken for this date."}, status=status.HTTP_404_NOT_FOUND)
+
+        states = decode_attendance(attendance)
+        return Response({
+            'section': section.id,
+            'date': attendance.date,
+            'records': [
+                {'student': student_id, 'status': STATUS_NAMES[state]}
+                for student_id, state in sorted(states.items())
+            ],
+        })
+
+    def post(self, request, section_id):
+        """Take attendance for the whole section in one request."""
+        section = self.get_section(request, section_id)
+        if section is None:
+            return Response({"error": "Section not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TakeAttendanceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        records = serializer.validated_data['records']
+
+        states = {record['student']: STATUS_CODES[record['status']] for record in records}
+        in_section = set(
+            Student.objects.filter(section=section, id__in=list(states)).values_list('id', flat=True)
+        )
+        unknown = sorted(set(states) - in_section)
+        if unknown:
+            return Response(
+                {"error": "Some students are not in this section.", "students": unknown},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # request.user may be a stateless token user, so record the id only
+        attendance, previous = record_attendance(
+            section, serializer.validated_data['date'], states, taken_by_id=request.user.pk,
+        )
+        return Response(
+            {'section': section.id, 'date': attendance.date, 'marked': len(states)},
+            status=status.HTTP_200_OK if previous else status.HTTP_201_CREATED,
+        )
+
+
+class StudentAttendanceView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, student_id):
+        """One student's attendance, decoded from each day's section record by roster position."""
+        school_id = Student.objects.filter(id=student_id).values_list('school_id', flat=True).first()
+        if school_id is None:
+            return Response({"error": "Student not found."}, status=status.HTTP_404_NOT_FOUND)
+        check_school_staff(request, school_id)
+
+        positions = dict(RosterEntry.objects.filter(student_id=student_id).values_list('roster_id', 'position'))
+        days = SectionAttendance.objects.filter(roster_id__in=list(positions))
+        date_from, date_to = parse_date(request, 'from'), parse_date(request, 'to')
+        if date_from:
+            days = days.filter(date__gte=date_from)
+        if date_to:
+            days = days.filter(date__lte=date_to)
+
+        records = [
+            {'date': date, 'status': STATUS_NAMES[state_at(states, positions[roster_id])]}
+            for date, roster_id, states in days.order_by('date').values_list('date', 'roster_id', 'states')
+        ]
+        return Response({'student': student_id, 'records': records})
+
+
+class SectionAttendanceSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, section_id):
+        """The section's totals for a period plus one row per student, read from the summaries."""
+        section = Section.objects.select_related('grade').filter(id=section_id).first()
+        if section is None:
+            return Response({"error": "Section not found."}, status=status.HTTP_404_NOT_FOUND)
+        check_school_staff(request, section.grade.school_id)
+        period, start = parse_period(request)
+
+        summary = SectionAttendanceSummary.objects.filter(section=section, period=period, period_start=start).first()
+        students = StudentAttendanceSummary.objects.filter(
+            student__section=section, period=period, period_start=start,
+        ).order_by('student_id').values('student_id', 'present', 'absent', 'late')
+        return Response({
+            **summary_totals(
+                summary.present if summary else 0, summary.absent if summary else 0, summary.late if summary else 0,
+                section=section.id, period=period, period_start=start, days=summary.days if summary else 0,
+            ),
+            'students': [
+                summary_totals(row['present'], row['absent'], row['late'], student=row['student_id'])
+                for row in students
+            ],
+        })
+
+
+class GradeAttendanceSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, grade_id):
+        """The grade's totals for a period plus one row per section."""
+        school_id = Grade.objects.filter(id=grade_id).values_list('school_id', flat=True).first()
+        if school_id is None:
+            return Response({"error": "Grade not found."}, status=status.HTTP_404_NOT_FOUND)
+        check_school_staff(request, school_id)
+        period, start = parse_period(request)
+
+        sections = list(
+            SectionAttendanceSummary.objects.filter(section__grade_id=grade_id, period=period, period_start=start)
+            .order_by('section_id').values('section_id', 'present', 'absent', 'late', 'days')
+        )
+        return Response({
+            **summary_totals(
+                sum(row['present'] for row in sections), sum(row['absent'] for row in sections),
+                sum(row['late'] for row in sections), grade=grade_id, period=period, period_start=start,
+            ),
+            'sections': [
+                summary_totals(row['present'], row['absent'], row['late'], section=row['section_id'], days=row['days'])
+                for row in sections
+            ],
+        })
+
+
+class SchoolAttendanceSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, school_id):
+        """The school's totals for a period plus one row per grade, summed over section summaries."""
+        if not School.objects.filter(id=school_id).exists():
+            return Response({"error": "School not found."}, status=status.HTTP_404_NOT_FOUND)
+        check_school_staff(request, school_id)
+        period, start = parse_period(request)
+
+        grades = list(
+            SectionAttendanceSummary.objects.filter(section__grade__school_id=school_id, period=period, period_start=start)
+            .values('section__grade_id').annotate(**SUMMARY_SUMS).order_by('section__grade_id')
+        )
+        return Response({
+            **summary_totals(
+                sum(row['present'] for row in grades), sum(row['absent'] for row in grades),
+                sum(row['late'] for row in grades), school=school_id, period=period, period_start=start,
+            ),
+            'grades': [
+                summary_totals(row['present'], row['absent'], row['late'], grade=row['section__grade_id'], section_days=row['days'])
+                for row in grades
+            ],
+        })
@@ -0,0 +1,68 @@
+"""
+Plain `async def` views for the busiest read endpoints.
+
+Under ASGI, DRF views are sync and each request holds a worker thread for its whole
+run. These views run on the event loop and only hand the individual ORM calls to
+Django's async API, so a slow query doesn't tie up a thread for the serialization
+and authentication around it. They answer like their DRF counterparts: same JWT
+authentication, keyset pages and error bodies.
+"""
+import functools
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated
+from rest_framework.request import Request
+
+from core.pagination import KeysetPagination
+from core.renderers import FastJSONRenderer
+from users.authentication import aauthenticate
+
+
+def api_response(data, status=status.HTTP_200_OK):
+    # Rendered as DRF views render JSON
+    renderer = FastJSONRenderer()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def async_api_view(view):
+    """
+    Authenticate the request from its JWT (request.user is AnonymousUser without one)
+    and turn APIException and Http404 into JSON error responses, as DRF does.
+    Only GET and HEAD are answered.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method not in wrapper.allowed_methods:
+                raise MethodNotAllowed(request.method)
+            request.user = await aauthenticate(request) or AnonymousUser()
+            return await view(request, *args, **kwargs)
+        except Http404 as e:
+            return api_response({'detail': str(e) or 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        except APIException as e:
+            response = api_response(e.detail if isinstance(e.detail, (dict, list)) else {'detail': e.detail}, e.status_code)
+            if e.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = 'Bearer realm="api"'
+            return response
+
+    wrapper.allowed_methods = ('GET', 'HEAD')
+    return wrapper
+
+
+def require_authentication(request):
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+
+
+async def paginate(request, queryset, serializer_class, empty_message):
+    """
+    A keyset page of `queryset` serialized with `serializer_class`, or a 404 with
+    `empty_message` when the first page is empty.
+    """
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(queryset, Request(request))
+    if not page and paginator.cursor_query_param not in request.GET:
+        return api_response({'message': empty_message}, status.HTTP_404_NOT_FOUND)
+    return api_response(paginator.get_paginated_data(serializer_class(page, many=True).data))
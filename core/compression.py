@@ -0,0 +1,153 @@
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip is offered without it
+    brotli = None
+
+# Content types worth compressing; images, spreadsheets and archives already are
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
+
+def parse_accept_encoding(header):
+    """'gzip;q=0.5, br' -> {'gzip': 0.5, 'br': 1.0}"""
+    accepted = {}
+    for part in header.split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def negotiate(header, encodings):
+    """The one of `encodings` (in order of preference) the client accepts with the highest q-value, or None."""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# Each returns (process, flush, finish): flush() ends the data so far on a byte boundary,
+# so a client can decode it before the rest arrives
+
+def gzip_compressor(config):
+    # wbits=31 writes a gzip header (with mtime 0, so equal bodies compress to equal bytes)
+    compressor = zlib.compressobj(config['gzip_level'], zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def brotli_compressor(config):
+    compressor = brotli.Compressor(quality=config['brotli_quality'])
+    return compressor.process, compressor.flush, compressor.finish
+
+
+COMPRESSORS = {'gzip': gzip_compressor}
+if brotli is not None:
+    COMPRESSORS['br'] = brotli_compressor
+
+
+def get_config(request):
+    """RESPONSE_COMPRESSION for the resolved view, merged over the default, or None when it is off."""
+    config = settings.RESPONSE_COMPRESSION['default']
+    match = request.resolver_match
+    if match is not None:
+        for key in (f'{request.method} {match.view_name}', match.view_name):
+            if key in settings.RESPONSE_COMPRESSION:
+                override = settings.RESPONSE_COMPRESSION[key]
+                return None if override is None else {**config, **override}
+    return config
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best encoding the client accepts among
+    RESPONSE_COMPRESSION's 'encodings' (br only when the brotli package is installed).
+
+    Bodies shorter than 'min_size' are sent as they are, as are streaming responses
+    of views with compression turned off. Streamed bodies are compressed and flushed chunk by chunk.
+    Works under WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        config = get_config(request)
+        if (
+            config is None
+            or response.status_code in (204, 304)
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+            or (not response.streaming and len(response.content) < config['min_size'])
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encodings = [encoding for encoding in config['encodings'] if encoding in COMPRESSORS]
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), encodings)
+        if encoding is None:
+            return response
+
+        process, flush, finish = COMPRESSORS[encoding](config)
+        if response.streaming:
+            response.streaming_content = (
+                self.acompress_stream(response.streaming_content, process, flush, finish) if response.is_async
+                else self.compress_stream(response.streaming_content, process, flush, finish)
+            )
+            # Unknown until the stream is done
+            del response.headers['Content-Length']
+        else:
+            content = process(response.content) + finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+
+        # The body now differs from the uncompressed one's, so a strong ETag must be weakened
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = f'W/{etag}'
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    # Each chunk is flushed as it comes, not buffered until the compressor fills a block,
+    # so a slow stream still reaches the client piece by piece
+    @staticmethod
+    def compress_stream(chunks, process, flush, finish):
+        for chunk in chunks:
+            yield process(chunk) + flush()
+        yield finish()
+
+    @staticmethod
+    async def acompress_stream(chunks, process, flush, finish):
+        async for chunk in chunks:
+            yield process(chunk) + flush()
+        yield finish()
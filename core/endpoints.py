@@ -0,0 +1,128 @@
+from django.test import Client
+from django.urls import get_resolver, resolve, reverse
+
+from attendance.models import SectionAttendance
+from gradebook.models import Assessment
+from grade.models import Grade
+from imports.models import ImportJob
+from parent.models import Parent
+from requests.models import Request
+from school.models import SchoolDeletionJob
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+from users.tokens import RoleRefreshToken
+
+# Model whose first row (within the sample school) fills the `pk` of each router basename
+PK_MODELS = {
+    'assessment': (Assessment, 'section__grade__school'),
+    'crud-assignment': (TeacherSectionSubject, 'section__grade__school'),
+    'grade': (Grade, 'school'),
+    'import-job': (ImportJob, 'school'),
+    'parents': (Parent, 'school'),
+    'request': (Request, 'school'),
+    'section': (Section, 'grade__school'),
+    'students': (Student, 'school'),
+    'subject': (Subject, 'school'),
+    'teachers': (Teacher, 'school'),
+}
+
+# Named URL arguments and the basename whose sample fills them
+NAMED_ARGUMENTS = {
+    'grade_id': 'grade',
+    'section_id': 'section',
+    'student_id': 'students',
+}
+
+# Query strings some views need to do any real work
+QUERY_STRINGS = {
+    'assessment-section-statistics': lambda samples: f"section={samples['section']}&subject={samples['subject']}",
+    'grade-attendance-summary': lambda samples: 'period=year',
+    'request-list': lambda samples: 'status=pending',
+    'school-attendance-summary': lambda samples: 'period=year',
+    'section-attendance': lambda samples: f"date={samples['attendance_date']}",
+    'section-attendance-summary': lambda samples: 'period=year',
+}
+
+
+def get_samples(school):
+    """Ids of the first object of each kind in `school`, to fill in URL arguments."""
+    samples = {'school': school.pk, 'users': school.user_id, 'email': school.email, 'kind': 'students'}
+    for basename, (model, school_lookup) in PK_MODELS.items():
+        samples[basename] = model.objects.filter(**{school_lookup: school}).order_by('id').values_list('id', flat=True).first()
+    samples['attendance_date'] = (
+        SectionAttendance.objects.filter(section_id=samples['section']).order_by('-date').values_list('date', flat=True).first()
+    )
+    samples['job_id'] = SchoolDeletionJob.objects.order_by('-id').values_list('id', flat=True).first()
+    return samples
+
+
+def url_kwargs(name, params, samples):
+    """URL kwargs for route `name`, or None when there is no sample object for one of them."""
+    name = name.removeprefix('async-')  # Async views are named after their DRF counterparts
+    basename = max((key for key in samples if name == key or name.startswith(f'{key}-')), key=len, default=None)
+    kwargs = {}
+    for param in params:
+        if param == 'pk':
+            value = samples.get(basename)
+        elif param in NAMED_ARGUMENTS:
+            value = samples.get(NAMED_ARGUMENTS[param])
+        elif param.endswith('_id') and param[:-3] in samples:
+            value = samples[param[:-3]]
+        else:
+            value = samples.get(param)
+        if value is None:
+            return None
+        kwargs[param] = value
+    return kwargs
+
+
+def answers_get(path):
+    func = resolve(path).func
+    if hasattr(func, 'actions'):  # ViewSet routes map methods to actions
+        return 'get' in func.actions
+    if hasattr(func, 'view_class'):
+        return hasattr(func.view_class, 'get')
+    return 'GET' in getattr(func, 'allowed_methods', ())  # Async views, see core/asyncviews.py
+
+
+def get_endpoints(school):
+    """
+    Every named route of the URLconf that answers GET, as (url name, path) pairs with
+    the arguments filled in from `school`'s objects. Routes with no sample object
+    are returned separately, as a list of names.
+    """
+    samples = get_samples(school)
+    endpoints, skipped = [], []
+    for name, possibilities in sorted(get_resolver().reverse_dict.lists(), key=lambda item: str(item[0])):
+        if not isinstance(name, str):
+            continue
+        # Format suffix variants of a route take an extra `format` argument
+        params = next(bits[0][1] for bits, *_ in possibilities if 'format' not in bits[0][1])
+        kwargs = url_kwargs(name, params, samples)
+        if kwargs is None:
+            skipped.append(name)
+            continue
+        path = reverse(name, kwargs=kwargs)
+        if not answers_get(path):
+            continue
+        if name in QUERY_STRINGS:
+            path = f'{path}?{QUERY_STRINGS[name](samples)}'
+        endpoints.append((name, path))
+    return endpoints, skipped
+
+
+def sample_users(school):
+    """The school's login account and the accounts of its first teacher and parent, by role."""
+    teacher = school.teachers.select_related('user').order_by('id').first()
+    parent = school.studentss.select_related('user').order_by('id').first()
+    return {'school': school.user, 'teacher': teacher.user, 'parent': parent.user}
+
+
+def client_for(user):
+    """A test client authenticated as `user`; errors come back as 500 responses instead of raising."""
+    return Client(
+        raise_request_exception=False,
+        HTTP_AUTHORIZATION=f'Bearer {RoleRefreshToken.for_user(user).access_token}',
+    )
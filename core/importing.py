@@ -0,0 +1,176 @@
+import zipfile
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from openpyxl import load_workbook
+from pandas.api.types import is_float_dtype
+
+
+# Row 1 of an uploaded sheet is the header, so the first data row is row 2
+FIRST_DATA_ROW = 2
+
+
+class SpreadsheetError(Exception):
+    """Raised when an uploaded sheet cannot be imported at all (e.g. missing columns)."""
+
+
+class ImportReport:
+    """Collects the outcome of a spreadsheet import, keyed by sheet row number."""
+
+    def __init__(self):
+        self.created = 0
+        self._errors = {}
+
+    def add_error(self, row, field, message):
+        self._errors.setdefault(int(row), {}).setdefault(field, []).append(message)
+
+    def add_errors(self, rows, field, message):
+        # Record the same error for every row in `rows`
+        for row in rows:
+            self.add_error(row, field, message)
+
+    def has_error(self, row):
+        return int(row) in self._errors
+
+    @property
+    def failed(self):
+        return len(self._errors)
+
+    @property
+    def errors(self):
+        return [{'row': row, 'errors': self._errors[row]} for row in sorted(self._errors)]
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+
+def check_columns(df, required):
+    """Raise SpreadsheetError if any of the `required` columns is missing from `df`."""
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise SpreadsheetError(f"Missing required column(s): {', '.join(missing)}.")
+
+
+def text_column(series):
+    """
+    Normalise a sheet column to stripped strings, with blanks as <NA>.
+
+    Numeric ids such as 1001 come back from pandas as 1001.0 when the column has
+    gaps, so integral floats are converted back to their integer form first.
+    """
+    if is_float_dtype(series):
+        integral = series.notna() & (series % 1 == 0)
+        if integral[series.notna()].all():
+            series = series.astype('Int64')
+    series = series.astype('string').str.strip()
+    return series.mask(series == '')
+
+
+def row_numbers(df, offset=0):
+    """Sheet row numbers for each row of `df`, `offset` being the rows read before it."""
+    return pd.Series(range(len(df)), index=df.index) + FIRST_DATA_ROW + offset
+
+
+def read_sheet_chunks(file, chunk_size=None, usecols=None):
+    """
+    Yield (offset, DataFrame) pairs of at most `chunk_size` rows from the first sheet
+    of an .xlsx upload, `offset` being the number of data rows before the chunk.
+
+    The workbook is streamed with openpyxl's read-only mode, so memory is bounded
+    by the chunk size rather than the size of the sheet. Only the `usecols`
+    columns are kept (all when None); blank trailing rows are dropped, as
+    pd.read_excel does.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    path = file.temporary_file_path() if hasattr(file, 'temporary_file_path') else file
+    try:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError, OSError) as e:
+        raise SpreadsheetError("The uploaded file is not a valid .xlsx workbook.") from e
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(name).strip() if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+        keep = [i for i, name in enumerate(header) if usecols is None or name in usecols]
+        columns = [header[i] for i in keep]
+
+        offset, chunk, blanks = 0, [], []
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in keep]
+            if all(value is None or value == '' for value in values):
+                # Held back until a non-blank row shows they aren't trailing
+                blanks.append(values)
+                continue
+            chunk.extend(blanks)
+            blanks = []
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield offset, pd.DataFrame(chunk[:chunk_size], columns=columns).infer_objects()
+                offset += chunk_size
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield offset, pd.DataFrame(chunk, columns=columns).infer_objects()
+    finally:
+        workbook.close()
+
+
+def import_sheet(importer, file, chunk_size=None, progress=None, start=0):
+    """
+    Feed an uploaded workbook to `importer.run` chunk by chunk, skipping the first
+    `start` rows (already imported by an earlier run); returns the number of rows
+    read. `progress(rows_read)` is passed on to `importer.run`, which calls it in
+    the transaction that writes the chunk, so what it records is what was committed.
+    """
+    total = start
+    for offset, df in read_sheet_chunks(file, chunk_size, usecols=importer.REQUIRED_COLUMNS):
+        if offset + len(df) <= start:
+            continue
+        if offset < start:
+            df, offset = df.iloc[start - offset:], start
+        importer.run(df, offset, progress)
+        total = offset + len(df)
+    if not total:
+        raise SpreadsheetError("The uploaded file contains no rows.")
+    return total
+
+
+def check_text_columns(report, model, data, rows):
+    """Flag blank values and values longer than the model field allows in every column of `data`."""
+    for column in data.columns:
+        blank = data[column].isna()
+        report.add_errors(rows[blank], column, "This field is required.")
+
+        max_length = model._meta.get_field(column).max_length
+        too_long = (data[column].str.len() > max_length).fillna(False)
+        report.add_errors(rows[too_long], column, f"Ensure this field has no more than {max_length} characters.")
+
+
+def check_duplicates(report, data, rows, column, seen):
+    """Flag values of `column` repeated within the file; `seen` carries values across chunks."""
+    values = data[column]
+    duplicated = values.notna() & (values.duplicated() | values.isin(seen))
+    report.add_errors(rows[duplicated], column, f"Duplicate {column} in the uploaded file.")
+    seen.update(values.dropna())
+
+
+def is_valid_email(value):
+    try:
+        validate_email(value)
+    except ValidationError:
+        return False
+    return True
+
+
+def check_emails(report, data, rows, column='email'):
+    values = data[column].dropna()
+    invalid = ~values.map(is_valid_email).astype(bool)
+    report.add_errors(rows[invalid[invalid].index], column, "Enter a valid email address.")
@@ -0,0 +1,143 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.views import APIView
+
+logger = logging.getLogger('core.instrumentation')
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode (DEBUG or tests) when a view goes over its QUERY_BUDGETS entry."""
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times every query run through it."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest_duration:
+                self.slowest_duration = elapsed
+                self.slowest_sql = sql
+
+
+def get_budget(request):
+    """The query budget for the resolved view, or None if it is not checked."""
+    match = request.resolver_match
+    if match is None:
+        return None
+    for key in (f'{request.method} {match.view_name}', match.view_name):
+        if key in settings.QUERY_BUDGETS:
+            return settings.QUERY_BUDGETS[key]
+
+    # The default budget only covers API views, not the admin
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is not None and issubclass(view_class, APIView):
+        return settings.QUERY_BUDGETS.get('default')
+    return None
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records the query count, total DB time and slowest query of each request.
+
+    The numbers are sent back in a Server-Timing header and logged as one
+    structured line per request. Views are checked against QUERY_BUDGETS; when
+    QUERY_BUDGET_STRICT is on, going over budget raises QueryBudgetExceeded.
+    Works under WSGI and ASGI; under ASGI, async views stay on the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        # Connections are per thread: wrap those of the thread the request's sync code and ORM calls run in
+        stack = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, start)
+
+    def recording(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def finish(self, request, response, recorder, start):
+        total = time.perf_counter() - start
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f'db-slowest;dur={recorder.slowest_duration * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        stats = {
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+            'slowest_ms': round(recorder.slowest_duration * 1000, 1),
+            'slowest_sql': recorder.slowest_sql[:500],
+        }
+        logger.info(
+            'view=%(view)s method=%(method)s status=%(status)s queries=%(queries)s '
+            'db_ms=%(db_ms)s total_ms=%(total_ms)s slowest_ms=%(slowest_ms)s',
+            stats, extra={'request_stats': stats},
+        )
+
+        self.check_budget(request, stats)
+        return response
+
+    def check_budget(self, request, stats):
+        budget = get_budget(request)
+        if not budget:
+            return
+
+        problems = []
+        if budget.get('queries') is not None and stats['queries'] > budget['queries']:
+            problems.append(f"{stats['queries']} queries (budget {budget['queries']})")
+        if budget.get('db_ms') is not None and stats['db_ms'] > budget['db_ms']:
+            problems.append(f"{stats['db_ms']} ms in the database (budget {budget['db_ms']} ms)")
+        if not problems:
+            return
+
+        message = f"{stats['view']} used {' and '.join(problems)}; slowest query: {stats['slowest_sql']}"
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={'request_stats': stats})
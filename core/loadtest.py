@@ -0,0 +1,305 @@
+import asyncio
+import io
+import itertools
+import json
+import random
+import secrets
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from urllib.parse import urlsplit
+
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from openpyxl import Workbook
+
+from core.synthetic import PASSWORD, school_email, teacher_email
+
+# Upper bounds (ms) of the latency histogram buckets; slower requests fall in a last, open-ended one
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Collection endpoints the 'list' operation picks from, with the ids they take
+LIST_ROUTES = [
+    ('school-get-students', 'school'),
+    ('school-get-teachers', 'school'),
+    ('school-get-school-sections', 'school'),
+    ('section-get-subject-and-teachers', 'section'),
+    ('assessment-list', None),
+]
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers  # Lower-cased names
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ASGITransport:
+    """Calls an ASGI application in-process, the way a server would."""
+
+    def __init__(self, application):
+        self.application = application
+
+    async def request(self, method, path, headers=None, body=b'', client='127.0.0.1'):
+        path, _, query = path.partition('?')
+        # DRF only parses a request body that declares its length
+        headers = {**(headers or {}), 'Content-Length': str(len(body))}
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'testserver')] + [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()
+            ],
+            'client': (client, 50000),
+            'server': ('testserver', 80),
+        }
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = asyncio.Event()
+        start, chunks = {}, []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Django watches for a disconnect while the view runs; the client stays until the response is sent
+            await sent.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body'):
+                    sent.set()
+
+        await self.application(scope, receive, send)
+        sent.set()
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in start.get('headers', [])}
+        return Response(start['status'], headers, b''.join(chunks))
+
+
+class HTTPTransport:
+    """
+    Sends HTTP/1.1 requests over a socket to a running server, e.g.
+    `uvicorn schoolApi.asgi:application`, with one connection per request.
+    """
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+
+    async def request(self, method, path, headers=None, body=b'', client=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            lines = [
+                f'{method} {self.prefix}{path} HTTP/1.1',
+                f'Host: {self.host}:{self.port}',
+                'Connection: close',
+                f'Content-Length: {len(body)}',
+            ] + [f'{name}: {value}' for name, value in (headers or {}).items()]
+            writer.write('\r\n'.join(lines).encode('latin-1') + b'\r\n\r\n' + body)
+            await writer.drain()
+
+            status_line, *header_lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').strip().split('\r\n')
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if 'content-length' in headers:
+                body = await reader.readexactly(int(headers['content-length']))
+            elif headers.get('transfer-encoding') == 'chunked':
+                body = await self.read_chunked(reader)
+            else:
+                body = await reader.read()
+            return Response(int(status_line.split()[1]), headers, body)
+        finally:
+            writer.close()
+
+    async def read_chunked(self, reader):
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            chunk = await reader.readexactly(size + 2)  # Each chunk ends with CRLF
+            if not size:
+                return b''.join(chunks)
+            chunks.append(chunk[:-2])
+
+
+class LoadStats:
+    """Latencies, statuses and errors of one run, per operation. Safe to update from worker threads."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.lock_timeouts = Counter()  # Where 'database is locked' was raised: 'requests' or 'import worker'
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, operation, status, milliseconds):
+        self.latencies[operation].append(milliseconds)
+        self.statuses[operation][status] += 1
+
+    def error(self, where, e):
+        with self._lock:
+            self.errors[f'{where}: {type(e).__name__}: {e}'] += 1
+
+    def lock_timeout(self, where):
+        with self._lock:
+            self.lock_timeouts[where] += 1
+
+    def as_dict(self):
+        total = sum(len(timings) for timings in self.latencies.values())
+        operations = {}
+        for operation, timings in sorted(self.latencies.items()):
+            p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+            histogram = np.bincount(np.searchsorted(HISTOGRAM_BUCKETS, timings), minlength=len(HISTOGRAM_BUCKETS) + 1)
+            operations[operation] = {
+                'requests': len(timings),
+                'p50_ms': round(float(p50), 2),
+                'p95_ms': round(float(p95), 2),
+                'p99_ms': round(float(p99), 2),
+                'max_ms': round(max(timings), 2),
+                'statuses': {str(status): count for status, count in sorted(self.statuses[operation].items())},
+                'histogram': histogram.tolist(),
+            }
+        return {
+            'elapsed_s': round(self.elapsed, 2),
+            'requests': total,
+            'throughput_rps': round(total / self.elapsed, 1) if self.elapsed else 0.0,
+            'histogram_buckets_ms': HISTOGRAM_BUCKETS,
+            'operations': operations,
+            'errors': dict(self.errors),
+            'lock_timeouts': dict(self.lock_timeouts),
+        }
+
+
+class LoadTest:
+    """
+    Virtual users on one event loop, each sending a weighted random mix of operations
+    until the deadline: 'login', 'list' (a school/section collection), 'import' (a
+    student sheet upload) and 'approve' (a pending school request).
+
+    The school, its sections and the pending requests are discovered through the API,
+    logged in as the first school of a `seed_synthetic` dataset with `prefix`. Only
+    requests of schools outside the login pool are approved.
+    """
+    OPERATIONS = ('login', 'list', 'import', 'approve')
+
+    def __init__(self, transport, mix, prefix='syn', schools=1, teachers=0, import_rows=100):
+        self.transport = transport
+        self.operations = [operation for operation in self.OPERATIONS if mix.get(operation)]
+        self.weights = [mix[operation] for operation in self.operations]
+        self.prefix = prefix
+        self.school_emails = [school_email(prefix, s) for s in range(schools)]
+        self.login_emails = self.school_emails + [
+            teacher_email(prefix, s, t) for s in range(schools) for t in range(teachers)
+        ]
+        self.import_rows = import_rows
+        # student_id is at most 20 characters, and must not repeat across runs against the same database
+        self.run_token = secrets.token_hex(2)
+        self.student_numbers = itertools.count()
+
+    async def call(self, method, path, body=b'', content_type=None, client='127.0.0.1', auth=True):
+        headers = {}
+        if auth:
+            headers['Authorization'] = f'Bearer {self.token}'
+        if content_type:
+            headers['Content-Type'] = content_type
+        return await self.transport.request(method, path, headers, body, client)
+
+    async def login(self, email, client='127.0.0.1'):
+        body = json.dumps({'email': email, 'password': PASSWORD}).encode()
+        return await self.call('POST', reverse('login'), body, 'application/json', client, auth=False)
+
+    async def setup(self):
+        response = await self.login(self.login_emails[0])
+        if response.status != 200:
+            raise RuntimeError(f"Could not log in as {self.login_emails[0]}: {response.status} {response.body[:200]!r}")
+        self.token = response.json()['access']
+        login_schools = [
+            (await self.call('GET', reverse('school-get-school-by-email', kwargs={'email': email}))).json()['id']
+            for email in self.school_emails
+        ]
+        self.school = login_schools[0]
+        sections = await self.call('GET', reverse('school-get-school-sections', args=[self.school]))
+        self.sections = [section['id'] for section in sections.json()['results']]
+        # Approving a request resets its school's password, so only other schools' requests are approved
+        requests = await self.call('GET', f"{reverse('request-list')}?status=pending&page_size=1000")
+        self.pending_requests = deque(
+            request['id'] for request in requests.json()['results'] if request['school'] not in login_schools
+        )
+
+    async def run(self, concurrency, duration, stats=None):
+        stats = stats or LoadStats()
+        await self.setup()
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(self.user(n, deadline, stats) for n in range(concurrency)))
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    async def user(self, n, deadline, stats):
+        client = f'10.0.{n // 256}.{n % 256}'  # One address per user, as the login throttle sees it
+        while time.perf_counter() < deadline:
+            operation = random.choices(self.operations, self.weights)[0]
+            request = await getattr(self, f'prepare_{operation}')(client)
+            if request is None:
+                await asyncio.sleep(0)
+                continue
+            started = time.perf_counter()
+            try:
+                response = await request
+            except Exception as e:
+                stats.error(operation, e)
+                continue
+            stats.record(operation, response.status, (time.perf_counter() - started) * 1000)
+
+    # Each prepare_<operation> builds the request outside the timed section and returns it unawaited
+
+    async def prepare_login(self, client):
+        return self.login(random.choice(self.login_emails), client)
+
+    async def prepare_list(self, client):
+        name, argument = random.choice(LIST_ROUTES)
+        args = {'school': [self.school], 'section': [random.choice(self.sections)], None: []}[argument]
+        return self.call('GET', reverse(name, args=args), client=client)
+
+    async def prepare_import(self, client):
+        data = await asyncio.to_thread(self.student_sheet)
+        body = encode_multipart(BOUNDARY, {
+            'file': SimpleUploadedFile('students.xlsx', data),
+            'school_id': self.school,
+            'section_id': random.choice(self.sections),
+        })
+        return self.call('POST', reverse('students-upload-excel'), body, MULTIPART_CONTENT, client)
+
+    async def prepare_approve(self, client):
+        if not self.pending_requests:
+            return None
+        return self.call('PUT', reverse('request-approve-request', args=[self.pending_requests.popleft()]), client=client)
+
+    def student_sheet(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['student_id', 'first_name', 'last_name', 'age', 'gender'])
+        for _ in range(self.import_rows):
+            sheet.append([f'{self.prefix}{self.run_token}{next(self.student_numbers)}', 'Load', 'Test', 10, 'F'])
+        output = io.BytesIO()
+        workbook.save(output)
+        return output.getvalue()
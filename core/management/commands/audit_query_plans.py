@@ -0,0 +1,94 @@
+import logging
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from core.endpoints import client_for, get_endpoints, sample_users
+from core.synthetic import ScratchDatabase, seed_dataset
+
+# `SCAN t` reads every row of t, `SCAN t USING [COVERING] INDEX i` every entry of one of its indexes
+SCAN = re.compile(r'\bSCAN (\w+)')
+TEMP_SORT = 'USE TEMP B-TREE'
+STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(sql, plan):
+    """Tables read in full by a filtered statement; unfiltered listings are expected to scan."""
+    if ' WHERE ' not in sql:
+        return []
+    return [
+        line for line in plan
+        if (match := SCAN.search(line)) and match.group(1) not in settings.QUERY_PLAN_ALLOWED_SCANS
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database, GET every API endpoint as a school, teacher and parent user, "
+        "and run EXPLAIN QUERY PLAN on each distinct query to flag full table scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Print the plan of every query, not just the flagged ones.")
+        parser.add_argument('--fail-on-scan', action='store_true', help="Exit with an error if any scan is flagged (for CI).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("The query plan audit reads SQLite's EXPLAIN QUERY PLAN output.")
+
+        # One log line per request (and per 403/404) would drown the report
+        for name in ('core.instrumentation', 'django.request'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        with ScratchDatabase():
+            school = seed_dataset(schools=2)[0]
+            endpoints, skipped = get_endpoints(school)
+            clients = {role: client_for(user) for role, user in sample_users(school).items()}
+            flagged = 0
+            for name, path in endpoints:
+                flagged += self.audit(name, path, clients, options['verbose_plans'])
+
+        if skipped:
+            self.stdout.write(f"Skipped (no sample object): {', '.join(skipped)}")
+        self.stdout.write(f"{len(endpoints)} endpoints audited, {flagged} queries with full scans.")
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f"{flagged} queries read whole tables; add an index or QUERY_PLAN_ALLOWED_SCANS entry.")
+
+    def audit(self, name, path, clients, verbose):
+        """Print the endpoint's summary line and any flagged plans; returns the number of flagged queries."""
+        queries, statuses = {}, []
+        for role, client in clients.items():
+            reset_queries()  # The captured log is a bounded deque
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(path)
+            statuses.append(f'{role}={response.status_code}')
+            for query in context.captured_queries:
+                if query['sql'].lstrip().upper().startswith(STATEMENTS):
+                    queries.setdefault(query['sql'], role)
+
+        report = []
+        for sql, role in queries.items():
+            plan = query_plan(sql)
+            scans = full_scans(sql, plan)
+            sorts = [line for line in plan if TEMP_SORT in line]
+            if scans or verbose:
+                report.append((role, sql, plan, scans, sorts))
+
+        flagged = sum(1 for *_, scans, _ in report if scans)
+        style = self.style.ERROR if flagged else self.style.SUCCESS
+        self.stdout.write(style(f"{name:<40} {len(queries):>3} queries  {flagged:>2} scans  {' '.join(statuses)}"))
+        for role, sql, plan, scans, sorts in report:
+            self.stdout.write(f"    [{role}] {sql}")
+            for line in plan:
+                marker = '!' if line in scans else '~' if line in sorts else ' '
+                self.stdout.write(f"      {marker} {line}")
+        return flagged
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.urls import reverse
+
+from core.endpoints import get_samples, sample_users
+from core.loadtest import ASGITransport, LoadStats
+from core.synthetic import ScratchDatabase, add_dataset_arguments, dataset_options, seed_dataset
+from schoolApi.asgi import application
+from users.tokens import RoleRefreshToken
+
+# DRF route, its async counterpart and the sample id both take
+ROUTES = [
+    ('school-get-grades', 'async-school-get-grades', 'school'),
+    ('school-get-school-sections', 'async-school-get-school-sections', 'school'),
+    ('school-get-subjects', 'async-school-get-subjects', 'school'),
+    ('school-get-teachers', 'async-school-get-teachers', 'school'),
+    ('school-get-students', 'async-school-get-students', 'school'),
+    ('section-get-subject-and-teachers', 'async-section-get-subject-and-teachers', 'section'),
+    ('students-detail', 'async-students-detail', 'students'),
+    ('students-get-teacher-subject', 'async-students-get-teacher-subject', 'students'),
+]
+VARIANTS = ('sync', 'async')
+
+
+async def drive(transport, paths, token, concurrency, duration):
+    """`concurrency` users GET random (name, path) pairs until `duration` is up."""
+    stats = LoadStats()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    async def user():
+        while time.perf_counter() < deadline:
+            name, path = random.choice(paths)
+            started = time.perf_counter()
+            try:
+                response = await transport.request('GET', path, headers)
+            except Exception as e:
+                stats.error(name, e)
+                continue
+            stats.record(name, response.status, (time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the concurrent throughput of the DRF read endpoints with their async "
+        "counterparts under the ASGI application, in-process against a scratch SQLite file "
+        "seeded with a synthetic dataset. Each variant gets the same users, duration and route mix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=20, help="Virtual users. Default: 20.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds of load per variant. Default: 10.")
+        parser.add_argument('--warmup', type=float, default=1.0, help="Untimed seconds of load before each variant. Default: 1.")
+        parser.add_argument('--page-size', type=int, help="?page_size= for the collection routes. Default: REST_FRAMEWORK['PAGE_SIZE'].")
+        parser.add_argument('--profile', choices=list(settings.SQLITE_PROFILES), default='production',
+                            help="SQLite profile of the scratch database. Default: production.")
+        parser.add_argument('--json', help="Also write the results as JSON to this file.")
+        add_dataset_arguments(parser, students=100, teachers=10, attendance_days=0, assessments=0)
+
+    def handle(self, *args, **options):
+        for name in ('core.instrumentation', 'django.request'):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+        with ExitStack() as stack:
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            stack.enter_context(ScratchDatabase(
+                path=os.path.join(directory, 'bench.sqlite3'), options=settings.SQLITE_PROFILES[options['profile']],
+            ))
+            school = seed_dataset(**dataset_options(options))[0]
+            samples = get_samples(school)
+            token = str(RoleRefreshToken.for_user(sample_users(school)['school']).access_token)
+            connection.close()
+            report = {
+                variant: self.run_variant(variant, samples, token, options)
+                for variant in VARIANTS
+            }
+
+        self.print_report(report, options)
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+    def run_variant(self, variant, samples, token, options):
+        # students-detail ignores the page size
+        query = f"?page_size={options['page_size']}" if options['page_size'] else ''
+        paths = [
+            (sync_name, reverse(sync_name if variant == 'sync' else async_name, args=[samples[argument]]) + query)
+            for sync_name, async_name, argument in ROUTES
+        ]
+
+        transport = ASGITransport(application)
+        if options['warmup']:
+            asyncio.run(drive(transport, paths, token, options['concurrency'], options['warmup']))
+        return asyncio.run(drive(transport, paths, token, options['concurrency'], options['duration'])).as_dict()
+
+    def print_report(self, report, options):
+        sync, async_ = report['sync'], report['async']
+        self.stdout.write(
+            f"{options['concurrency']} users, {options['duration']} s per variant: "
+            f"sync {sync['throughput_rps']} requests/s, async {async_['throughput_rps']} requests/s"
+        )
+        self.stdout.write(f"\n{'route':<36} {'sync p50':>9} {'p95':>8} {'async p50':>10} {'p95':>8}  statuses")
+        for name, result in sync['operations'].items():
+            other = async_['operations'].get(name)
+            if other is None:
+                continue
+            statuses = ' '.join(sorted(set(result['statuses']) | set(other['statuses'])))
+            self.stdout.write(
+                f"{name:<36} {result['p50_ms']:>9.1f} {result['p95_ms']:>8.1f} "
+                f"{other['p50_ms']:>10.1f} {other['p95_ms']:>8.1f}  {statuses}"
+            )
+        errors = {**sync['errors'], **async_['errors']}
+        style = self.style.ERROR if errors else self.style.SUCCESS
+        self.stdout.write(style(f"Errors: {sum(sync['errors'].values())} sync, {sum(async_['errors'].values())} async"))
+        for message, count in errors.items():
+            self.stdout.write(f"  {count} x {message}")
@@ -0,0 +1,144 @@
+import gc
+import json
+import logging
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.endpoints import client_for, get_endpoints, sample_users
+from core.instrumentation import QueryRecorder
+from core.synthetic import ScratchDatabase, add_dataset_arguments, dataset_options, seed_dataset
+
+
+def fetch(client, path, **headers):
+    """GET `path` and read the whole body (streaming responses included); returns (response, body size)."""
+    response = client.get(path, **headers)
+    if response.streaming:
+        return response, sum(len(chunk) for chunk in response.streaming_content)
+    return response, len(response.content)
+
+
+def compare(results, baseline, threshold):
+    """Regressions against a baseline run: slower p95 (beyond `threshold`), more queries or larger responses."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        # Sub-millisecond differences are noise, whatever the ratio
+        if result['p95_ms'] > before['p95_ms'] * (1 + threshold) and result['p95_ms'] - before['p95_ms'] > 1:
+            regressions.append({'endpoint': name, 'metric': 'p95_ms', 'baseline': before['p95_ms'], 'current': result['p95_ms']})
+        for metric in ('queries', 'bytes'):
+            if result[metric] > before[metric]:
+                regressions.append({'endpoint': name, 'metric': metric, 'baseline': before[metric], 'current': result[metric]})
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with a synthetic dataset, GET every API endpoint through the "
+        "test client and report p50/p95 latency, query count and response size per endpoint as JSON, "
+        "optionally compared against a saved baseline."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser, schools=2, grades=6, sections=3, students=40, teachers=20, attendance_days=20, assessments=3)
+        parser.add_argument('--role', choices=['school', 'teacher', 'parent'], default='school', help="Account the requests are made as.")
+        parser.add_argument('--iterations', type=int, default=30, help="Timed requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per endpoint first (fills caches).")
+        parser.add_argument('--endpoint', action='append', help="Only benchmark this URL name; may be repeated.")
+        parser.add_argument('--output', help="Write the JSON results to this file instead of stdout.")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare against.")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p95 slowdown against the baseline. Default: 0.2 (20%%).")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Exit with an error if anything regressed (for CI).")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        for name in ('core.instrumentation', 'django.request'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        dataset = dataset_options(options)
+        with ScratchDatabase():
+            school = seed_dataset(**dataset)[0]
+            endpoints, skipped = get_endpoints(school)
+            if options['endpoint']:
+                endpoints = [(name, path) for name, path in endpoints if name in options['endpoint']]
+            client = client_for(sample_users(school)[options['role']])
+            results = {name: self.measure(client, path, options) for name, path in endpoints}
+
+        report = {
+            'dataset': dataset,
+            'role': options['role'],
+            'iterations': options['iterations'],
+            'endpoints': results,
+            'skipped': skipped,
+        }
+        if baseline is not None:
+            if baseline.get('dataset') != dataset or baseline.get('role') != options['role']:
+                self.stderr.write(self.style.WARNING("The baseline was run with a different dataset or role."))
+            report['regressions'] = compare(results, baseline, options['threshold'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.print_table(report, baseline)
+        else:
+            self.stdout.write(output)
+
+        if report.get('regressions') and options['fail_on_regression']:
+            raise CommandError(f"{len(report['regressions'])} regressions against {options['baseline']}.")
+
+    def measure(self, client, path, options):
+        for _ in range(options['warmup']):
+            fetch(client, path)
+
+        # Queries are counted on a separate request, so the wrapper doesn't skew the timings
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response, size = fetch(client, path)
+
+        # As timeit does, keep garbage collection pauses out of the timings
+        timings = []
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(options['iterations']):
+                started = time.perf_counter()
+                fetch(client, path)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+
+        p50, p95 = np.percentile(timings, [50, 95]) if timings else (0.0, 0.0)
+        return {
+            'path': path,
+            'status': response.status_code,
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'queries': recorder.count,
+            'bytes': size,
+        }
+
+    def print_table(self, report, baseline):
+        self.stdout.write(f"{'endpoint':<40} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'queries':>7} {'bytes':>9}  {'p95 vs baseline':>15}")
+        for name, result in report['endpoints'].items():
+            change = ''
+            before = baseline and baseline['endpoints'].get(name)
+            if before and before['p95_ms']:
+                change = f"{(result['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%"
+            self.stdout.write(
+                f"{name:<40} {result['status']:>6} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['queries']:>7} {result['bytes']:>9}  {change:>15}"
+            )
+        for regression in report.get('regressions', []):
+            self.stdout.write(self.style.ERROR(
+                f"Regression: {regression['endpoint']} {regression['metric']} "
+                f"{regression['baseline']} -> {regression['current']}"
+            ))
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import django
+import pandas as pd
+from django.core.management.base import BaseCommand
+from openpyxl import Workbook
+
+from core.importing import read_sheet_chunks, text_column
+
+
+def write_workbook(path, rows):
+    from student.importers import StudentImporter
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(StudentImporter.REQUIRED_COLUMNS + ['notes'])
+    for i in range(rows):
+        sheet.append([100000 + i, f'First {i}', f'Last {i}', 10 + i % 8, 'F' if i % 2 else 'M', 'x' * 40])
+    workbook.save(path)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+
+
+def measure(mode, path, chunk_size, results):
+    """Runs in a fresh process, so ru_maxrss is the peak of this reader alone."""
+    # Spawned processes start without Django, and model imports need the app registry
+    django.setup()
+    from student.importers import StudentImporter
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'read_excel':
+        chunks = [(0, pd.read_excel(path))]
+    else:
+        chunks = read_sheet_chunks(path, chunk_size, usecols=StudentImporter.REQUIRED_COLUMNS)
+
+    rows = 0
+    for _, df in chunks:
+        # The same column normalisation the importers run on each chunk
+        for column in StudentImporter.TEXT_COLUMNS:
+            text_column(df[column])
+        rows += len(df)
+    results.put((mode, rows, time.perf_counter() - start, baseline, peak_rss_mb()))
+
+
+class Command(BaseCommand):
+    help = "Compare peak RSS and time of pd.read_excel with the chunked read-only reader on a generated workbook."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=80000, help="Data rows in the generated workbook.")
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per chunk for the chunked reader.")
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'students.xlsx')
+            write_workbook(path, options['rows'])
+            self.stdout.write(f"Workbook: {options['rows']} rows, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+            self.stdout.write(f"{'reader':>10}  {'rows':>7}  {'time (s)':>8}  {'baseline (MB)':>13}  {'peak RSS (MB)':>13}")
+
+            for mode in ('read_excel', 'chunked'):
+                results = context.Queue()
+                process = context.Process(target=measure, args=(mode, path, options['chunk_size'], results))
+                process.start()
+                mode, rows, elapsed, baseline, peak = results.get()
+                process.join()
+                self.stdout.write(f"{mode:>10}  {rows:>7}  {elapsed:>8.2f}  {baseline:>13.1f}  {peak:>13.1f}")
@@ -0,0 +1,111 @@
+import gc
+import json
+import logging
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from core.compression import COMPRESSORS
+from core.endpoints import client_for, sample_users
+from core.management.commands.bench_endpoints import fetch
+from core.renderers import BACKENDS, FastJSONRenderer
+from core.synthetic import ScratchDatabase, add_dataset_arguments, dataset_options, seed_dataset
+
+# Large school-wide responses: (URL name, extra URL arguments)
+ROUTES = [
+    ('school-get-students', []),
+    ('school-get-teachers', []),
+    ('school-get-school-sections', []),
+    ('school-structure', []),
+    ('school-export', ['students']),
+]
+
+
+def median_ms(function, iterations):
+    """Median wall time of `function()` over `iterations` calls, with garbage collection paused as timeit does."""
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return round(float(np.median(timings)), 3)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with a large school (about 5,000 students) and, for its biggest "
+        "responses, report the render time and size of each JSON_RENDERER_BACKEND and the bytes "
+        "on the wire and request time for each response encoding."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser, grades=6, sections=4, students=210, teachers=60, subjects=8, attendance_days=0, assessments=0)
+        parser.add_argument('--page-size', type=int, default=1000, help="?page_size= for the collection routes. Default: 1000 (the maximum).")
+        parser.add_argument('--iterations', type=int, default=20, help="Timed renders and requests per measurement. Default: 20.")
+        parser.add_argument('--json', help="Also write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        for name in ('core.instrumentation', 'django.request'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        with ScratchDatabase():
+            school = seed_dataset(**dataset_options(options))[0]
+            client = client_for(sample_users(school)['school'])
+            results = {}
+            for name, args in ROUTES:
+                path = f"{reverse(name, args=[school.pk, *args])}?page_size={options['page_size']}"
+                results[name] = self.measure(client, path, options['iterations'])
+
+        self.print_report(results)
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump({'dataset': dataset_options(options), 'endpoints': results}, f, indent=2)
+
+    def measure(self, client, path, iterations):
+        response, size = fetch(client, path)
+        result = {'path': path, 'status': response.status_code, 'render': {}, 'wire': {}}
+
+        # Render time of the view's data alone; streamed responses (CSV) aren't rendered
+        data = getattr(response, 'data', None)
+        if data is not None and not response.streaming:
+            for backend, dumps in BACKENDS.items():
+                if backend != 'json' and dumps is None:
+                    continue  # Not installed
+                renderer = FastJSONRenderer()
+                renderer.backend = backend
+                result['render'][backend] = {
+                    'ms': median_ms(lambda: renderer.render(data), iterations),
+                    'bytes': len(renderer.render(data)),
+                }
+
+        for encoding in ('identity', *COMPRESSORS):
+            response, size = fetch(client, path, HTTP_ACCEPT_ENCODING=encoding)
+            result['wire'][encoding] = {
+                'encoding': response.get('Content-Encoding', 'identity'),
+                'bytes': size,
+                'request_ms': median_ms(lambda: fetch(client, path, HTTP_ACCEPT_ENCODING=encoding), iterations),
+            }
+        return result
+
+    def print_report(self, results):
+        self.stdout.write(f"{'endpoint':<28} {'backend':<8} {'render ms':>10} {'bytes':>10}")
+        for name, result in results.items():
+            for backend, render in result['render'].items():
+                self.stdout.write(f"{name:<28} {backend:<8} {render['ms']:>10.2f} {render['bytes']:>10}")
+
+        self.stdout.write(f"\n{'endpoint':<28} {'encoding':<8} {'bytes':>10} {'ratio':>6} {'request ms':>11}")
+        for name, result in results.items():
+            identity = result['wire']['identity']['bytes'] or 1
+            for wire in result['wire'].values():
+                self.stdout.write(
+                    f"{name:<28} {wire['encoding']:<8} {wire['bytes']:>10} "
+                    f"{wire['bytes'] / identity:>6.2f} {wire['request_ms']:>11.2f}"
+                )
+
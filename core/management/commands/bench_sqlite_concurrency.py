@@ -0,0 +1,158 @@
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from grade.models import Grade
+from school.models import School
+from section.models import Section
+from student.models import Student
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Load:
+    """Shared state of one benchmark run."""
+
+    def __init__(self, alias, duration):
+        self.alias = alias
+        self.deadline = time.perf_counter() + duration
+        self.lock = threading.Lock()
+        self.read_ms = []
+        self.write_ms = []
+        self.errors = Counter()
+
+    def running(self):
+        return time.perf_counter() < self.deadline
+
+    def record(self, timings, started):
+        with self.lock:
+            timings.append((time.perf_counter() - started) * 1000)
+
+    def error(self, e):
+        with self.lock:
+            self.errors[str(e)] += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent roster reads against chunked imports and bulk deletes on a scratch "
+        "SQLite file, once per SQLITE_PROFILES entry, and report latency and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default=','.join(settings.SQLITE_PROFILES), help="Comma separated profile names.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds of load per profile.")
+        parser.add_argument('--readers', type=int, default=4, help="Threads paging through a school's students.")
+        parser.add_argument('--writers', type=int, default=2, help="Threads importing and deleting students.")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Rows per import/delete transaction.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'profile':>12}  {'reads':>6}  {'read p50':>8}  {'read p95':>8}  {'read max':>8}  "
+            f"{'chunks':>6}  {'write p95':>9}  {'errors':>6}"
+        )
+        for profile in options['profiles'].split(','):
+            with tempfile.TemporaryDirectory() as directory:
+                load = self.run_profile(profile, os.path.join(directory, 'bench.sqlite3'), options)
+            self.stdout.write(
+                f"{profile:>12}  {len(load.read_ms):>6}  {percentile(load.read_ms, 50):>8.1f}  "
+                f"{percentile(load.read_ms, 95):>8.1f}  {max(load.read_ms, default=0):>8.1f}  "
+                f"{len(load.write_ms):>6}  {percentile(load.write_ms, 95):>9.1f}  {sum(load.errors.values()):>6}"
+            )
+            for message, count in load.errors.most_common():
+                self.stdout.write(f"{'':>12}  {count} x {message}")
+        self.stdout.write("Latencies in ms; a write is one chunk, including any wait for the lock.")
+
+    def run_profile(self, profile, path, options):
+        alias = f'bench_{profile}'
+        connections.settings[alias] = {
+            **connections.settings['default'],
+            'NAME': path,
+            'OPTIONS': settings.SQLITE_PROFILES[profile],
+        }
+        try:
+            call_command('migrate', database=alias, verbosity=0)
+            school = School.objects.using(alias).create(name='Bench', address='-', phone='-', email='bench@example.com')
+            grade = Grade.objects.using(alias).create(grade_name='G1', school=school)
+            section = Section.objects.using(alias).create(section='A', grade=grade)
+            self.add_students(alias, school, section, 'seed', 5000)
+
+            load = Load(alias, options['duration'])
+            threads = [
+                threading.Thread(target=self.reader, args=(load, school.id))
+                for _ in range(options['readers'])
+            ] + [
+                threading.Thread(target=self.writer, args=(load, school, section, n, options['chunk_size']))
+                for n in range(options['writers'])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return load
+        finally:
+            connections[alias].close()
+            del connections.settings[alias]
+
+    def add_students(self, alias, school, section, prefix, count):
+        Student.objects.using(alias).bulk_create(
+            [
+                Student(student_id=f'{prefix}-{i}', first_name='Bench', last_name='Student', age=10,
+                        gender='F', section=section, school=school)
+                for i in range(count)
+            ],
+            batch_size=500,
+        )
+
+    def reader(self, load, school_id):
+        try:
+            last_id = 0
+            while load.running():
+                started = time.perf_counter()
+                try:
+                    page = list(
+                        Student.objects.using(load.alias).filter(school_id=school_id, id__gt=last_id)
+                        .order_by('id').values_list('id', 'student_id', 'first_name')[:100]
+                    )
+                except OperationalError as e:
+                    load.error(e)
+                    continue
+                load.record(load.read_ms, started)
+                last_id = page[-1][0] if page else 0
+        finally:
+            connections[load.alias].close()
+
+    def writer(self, load, school, section, n, chunk_size):
+        """Like an import: check existing ids, insert a chunk; then delete it again in chunks."""
+        try:
+            batch = 0
+            while load.running():
+                prefix = f'w{n}-{batch}'
+                started = time.perf_counter()
+                try:
+                    with transaction.atomic(using=load.alias):
+                        Student.objects.using(load.alias).filter(student_id__startswith=prefix).exists()
+                        self.add_students(load.alias, school, section, prefix, chunk_size)
+                    load.record(load.write_ms, started)
+
+                    started = time.perf_counter()
+                    with transaction.atomic(using=load.alias):
+                        Student.objects.using(load.alias).filter(student_id__startswith=f'{prefix}-')._raw_delete(load.alias)
+                    load.record(load.write_ms, started)
+                except OperationalError as e:
+                    load.error(e)
+                batch += 1
+        finally:
+            connections[load.alias].close()
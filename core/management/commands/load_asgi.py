@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import got_request_exception
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+
+from core.loadtest import HISTOGRAM_BUCKETS, ASGITransport, HTTPTransport, LoadStats, LoadTest
+from core.synthetic import ScratchDatabase, add_dataset_arguments, dataset_options, seed_dataset
+from imports.jobs import run_pending_jobs
+from requests.models import Request
+from school.models import School
+from schoolApi.asgi import application
+
+
+def parse_mix(value):
+    """'list=8,login=1' -> {'list': 8.0, 'login': 1.0}"""
+    mix = {}
+    for part in value.split(','):
+        operation, _, weight = part.partition('=')
+        if operation not in LoadTest.OPERATIONS:
+            raise CommandError(f"Unknown operation '{operation}'; choose from {', '.join(LoadTest.OPERATIONS)}.")
+        try:
+            mix[operation] = float(weight or 1)
+        except ValueError:
+            raise CommandError(f"Invalid weight for '{operation}': {weight}.")
+    return mix
+
+
+def is_lock_timeout(e):
+    return isinstance(e, OperationalError) and 'locked' in str(e)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the ASGI application with concurrent virtual users on an asyncio event loop and "
+        "report throughput, latency histograms, errors and SQLite lock timeouts. By default the "
+        "application is called in-process against a scratch SQLite file seeded with a synthetic "
+        "dataset; with --url, requests go over a socket to a running server whose database was "
+        "seeded with `manage.py seed_synthetic`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Base URL of a running server, e.g. http://127.0.0.1:8000.")
+        parser.add_argument('--concurrency', type=int, default=20, help="Virtual users. Default: 20.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds of load. Default: 10.")
+        parser.add_argument('--mix', type=parse_mix, default='list=8,login=1,import=1,approve=1',
+                            help="Weighted operations: login, list, import, approve. Default: list=8,login=1,import=1,approve=1.")
+        parser.add_argument('--import-rows', type=int, default=100, help="Rows per uploaded sheet. Default: 100.")
+        parser.add_argument('--prefix', default='syn', help="seed_synthetic prefix of the dataset to log in to. Default: syn.")
+        parser.add_argument('--profile', choices=list(settings.SQLITE_PROFILES), default='production',
+                            help="SQLite profile of the scratch database (in-process only). Default: production.")
+        parser.add_argument('--no-import-worker', action='store_true',
+                            help="Don't run queued imports in a background thread during the load (in-process only).")
+        parser.add_argument('--pending-requests', type=int, default=500,
+                            help="Schools without accounts created with a pending request, for approvals (in-process only). Default: 500.")
+        parser.add_argument('--json', help="Also write the results as JSON to this file.")
+        add_dataset_arguments(parser, students=30, teachers=10, attendance_days=0, assessments=1)
+
+    def handle(self, *args, **options):
+        for name in ('core.instrumentation', 'django.request'):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+        if options['url']:
+            stats = asyncio.run(self.load(HTTPTransport(options['url']), options, LoadStats()))
+        else:
+            stats = self.run_in_process(options)
+
+        report = stats.as_dict()
+        self.print_report(report, options)
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+    def load(self, transport, options, stats):
+        test = LoadTest(
+            transport, options['mix'], prefix=options['prefix'], schools=options['schools'],
+            teachers=options['teachers'], import_rows=options['import_rows'],
+        )
+        return test.run(options['concurrency'], options['duration'], stats)
+
+    def run_in_process(self, options):
+        stats = LoadStats()
+
+        def count_exception(sender, **kwargs):
+            e = sys.exc_info()[1]
+            if is_lock_timeout(e):
+                stats.lock_timeout('requests')
+            elif e is not None:
+                stats.error('requests', e)
+
+        with ExitStack() as stack:
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            stack.enter_context(override_settings(MEDIA_ROOT=directory))
+            # A file, not the in-memory test database, so the profile's journal mode and locking apply
+            stack.enter_context(ScratchDatabase(
+                path=os.path.join(directory, 'load.sqlite3'), options=settings.SQLITE_PROFILES[options['profile']],
+            ))
+            seed_dataset(prefix=options['prefix'], **dataset_options(options))
+            self.create_pending_requests(options['prefix'], options['pending_requests'])
+            connection.close()
+
+            got_request_exception.connect(count_exception)
+            stack.callback(got_request_exception.disconnect, count_exception)
+            stop = threading.Event()
+            if not options['no_import_worker']:
+                worker = threading.Thread(target=self.import_worker, args=(stop, stats))
+                worker.start()
+                stack.callback(worker.join)
+            stack.callback(stop.set)
+
+            return asyncio.run(self.load(ASGITransport(application), options, stats))
+
+    def create_pending_requests(self, prefix, count):
+        """One pending request each for `count` new schools without accounts, none of them in the login pool."""
+        applicants = School.objects.bulk_create([
+            School(name=f'{prefix} Applicant {n}', address='Synthetic', phone='0000000000', email=f'{prefix}-applicant-{n}@example.com')
+            for n in range(count)
+        ])
+        Request.objects.bulk_create([Request(school=school) for school in applicants])
+
+    def import_worker(self, stop, stats):
+        """Run queued imports while the load runs, as `run_import_jobs --loop` would."""
+        try:
+            while not stop.is_set():
+                try:
+                    for _ in run_pending_jobs():
+                        pass
+                except Exception as e:
+                    if is_lock_timeout(e):
+                        stats.lock_timeout('import worker')
+                    else:
+                        stats.error('import worker', e)
+                stop.wait(0.2)
+        finally:
+            connection.close()
+
+    def print_report(self, report, options):
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_s']} s from {options['concurrency']} users: "
+            f"{report['throughput_rps']} requests/s"
+        )
+        self.stdout.write(f"\n{'operation':<10} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+        for operation, result in report['operations'].items():
+            statuses = ' '.join(f'{status}={count}' for status, count in result['statuses'].items())
+            self.stdout.write(
+                f"{operation:<10} {result['requests']:>8} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['max_ms']:>8.1f}  {statuses}"
+            )
+
+        labels = [f'<={bound}' for bound in HISTOGRAM_BUCKETS] + [f'>{HISTOGRAM_BUCKETS[-1]}']
+        self.stdout.write(f"\nLatency histogram (ms)\n{'':<10} " + ' '.join(f'{label:>6}' for label in labels))
+        for operation, result in report['operations'].items():
+            self.stdout.write(f"{operation:<10} " + ' '.join(f'{count:>6}' for count in result['histogram']))
+
+        self.stdout.write(f"\nLock timeouts: {sum(report['lock_timeouts'].values())} {report['lock_timeouts'] or ''}")
+        style = self.style.ERROR if report['errors'] else self.style.SUCCESS
+        self.stdout.write(style(f"Errors: {sum(report['errors'].values())}"))
+        for message, count in report['errors'].items():
+            self.stdout.write(f"  {count} x {message}")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.synthetic import PASSWORD, add_dataset_arguments, dataset_options, seed_dataset
+from student.models import Student
+
+# student_id is at most 20 characters: '<prefix>-<running number>'
+MAX_PREFIX_LENGTH = 10
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert a synthetic dataset (schools, grades, sections, students, teachers, assignments, "
+        "parents, attendance and assessments) in bulk into the configured database."
+    )
+
+    def add_arguments(self, parser):
+        add_dataset_arguments(parser)
+        parser.add_argument('--prefix', default='syn', help="Prefix of usernames, emails and student ids. Default: syn.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if options['schools'] < 1:
+            raise CommandError("--schools must be at least 1.")
+        if len(prefix) > MAX_PREFIX_LENGTH:
+            raise CommandError(f"--prefix can be at most {MAX_PREFIX_LENGTH} characters.")
+        if Student.objects.filter(student_id__startswith=f'{prefix}-').exists():
+            raise CommandError(f"A dataset with prefix '{prefix}' already exists; choose another --prefix.")
+
+        schools = seed_dataset(prefix=prefix, **dataset_options(options))
+        students = Student.objects.filter(student_id__startswith=f'{prefix}-').count()
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(schools)} schools with {students} students. "
+            f"Log in as {schools[0].email} (password '{PASSWORD}')."
+        ))
@@ -0,0 +1,54 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on the primary key.
+
+    Each page is fetched with `WHERE id > <cursor> ORDER BY id LIMIT n`, which the
+    primary key (and any `<fk>_id` index, as SQLite stores the rowid in it) can
+    answer directly, so every page costs the same as the first one.
+    The page size defaults to REST_FRAMEWORK['PAGE_SIZE'] and can be set per
+    request with `?page_size=`.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        paginate_queryset for async views (see core/asyncviews.py), with the page
+        fetched through async iteration. `request` must provide query_params. As ids
+        are unique, a cursor's position alone marks the page and its offset is unused.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, None)
+        self.cursor = self.decode_cursor(request)
+        reverse, current_position = (False, None) if self.cursor is None else self.cursor[1:]
+
+        queryset = queryset.order_by('-id' if reverse else 'id')
+        if current_position is not None:
+            queryset = queryset.filter(**{'id__lt' if reverse else 'id__gt': current_position})
+
+        # One extra row tells whether there is a following page
+        results = [item async for item in queryset[:self.page_size + 1]]
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = self._get_position_from_instance(results[-1], self.ordering) if has_following_position else None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = current_position is not None, current_position
+            self.has_previous, self.previous_position = has_following_position, following_position
+        else:
+            self.has_next, self.next_position = has_following_position, following_position
+            self.has_previous, self.previous_position = current_position is not None, current_position
+        return self.page
+
+    def get_paginated_data(self, data):
+        return {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
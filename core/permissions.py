@@ -0,0 +1,8 @@
+from rest_framework.exceptions import PermissionDenied
+
+
+def check_school_staff(request, school_id, message="You do not have permission to manage this school's records."):
+    """Only the school itself and its teachers get through."""
+    principal = request.user.principal
+    if principal.role not in ('SCHOOL', 'TEACHER') or str(principal.school_id) != str(school_id):
+        raise PermissionDenied(message)
@@ -0,0 +1,58 @@
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional: without it every backend falls back to the stdlib encoder
+    orjson = None
+
+
+def orjson_dumps(data, encoder):
+    """
+    Serialize with orjson, straight to UTF-8 bytes. Whatever orjson doesn't handle
+    itself goes through `encoder`, and so do datetimes, which DRF's encoder writes
+    with a 'Z' suffix for UTC.
+    """
+    return orjson.dumps(
+        data,
+        default=encoder().default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+# JSON_RENDERER_BACKEND values; None is the stdlib json module, through JSONRenderer
+BACKENDS = {
+    'orjson': orjson_dumps if orjson is not None else None,
+    'json': None,
+}
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with a pluggable serializer, chosen by settings.JSON_RENDERER_BACKEND
+    (or the `backend` attribute). The output is byte-for-byte that of JSONRenderer,
+    \\u2028/\\u2029 escapes included, except that NaN and infinities become null.
+
+    Indented output (`Accept: application/json; indent=4`, the browsable API) and
+    non-default UNICODE_JSON/COMPACT_JSON settings are always rendered by JSONRenderer.
+    """
+    backend = None
+
+    def get_dumps(self):
+        return BACKENDS.get(self.backend or settings.JSON_RENDERER_BACKEND)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        dumps = self.get_dumps()
+        if (
+            data is None or dumps is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data, self.encoder_class)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
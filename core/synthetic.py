@@ -0,0 +1,251 @@
+import datetime
+import inspect
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from attendance.models import RosterEntry, SectionAttendance, SectionRoster
+from attendance.storage import ABSENT, LATE, PRESENT, pack_states
+from attendance.summaries import rebuild_school_summaries
+from gradebook.models import Assessment, Score
+from grade.models import Grade
+from imports.models import ImportJob
+from parent.models import Parent
+from requests.models import Request
+from school.models import School
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+from users.models import User
+
+# Every synthetic account logs in with this password
+PASSWORD = 'synthetic'
+BATCH_SIZE = 1000
+
+
+def bulk(model, objects):
+    # SQLite returns the new primary keys from bulk_create, so the objects can be referenced straight away
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def school_email(prefix, school):
+    return f'{prefix}-school-{school}@example.com'
+
+
+def teacher_email(prefix, school, teacher):
+    return f'{prefix}-teacher-{school}-{teacher}@example.com'
+
+
+def school_days(count, end=None):
+    """The last `count` weekdays up to `end` (yesterday by default), oldest first."""
+    day = end or datetime.date.today() - datetime.timedelta(days=1)
+    days = []
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= datetime.timedelta(days=1)
+    return days[::-1]
+
+
+def seed_dataset(schools=1, grades=3, sections=2, students=30, teachers=6, subjects=4, parents=1.0,
+                 attendance_days=5, assessments=1, prefix='syn', seed=0):
+    """
+    Insert a synthetic dataset in bulk and return the created schools.
+
+    Each school gets `grades` grades of `sections` sections, `students` students per
+    section, `teachers` teachers and `subjects` subjects. Every section is taught every
+    subject, by teachers assigned round robin; `parents` is the fraction of students
+    with a parent. Sections get `attendance_days` days of attendance and `assessments`
+    scored assessments per subject. Unique fields are derived from `prefix`, so
+    datasets with different prefixes can share a database.
+    """
+    rng = np.random.default_rng(seed)
+    password = make_password(PASSWORD)  # Hashed once for every account
+
+    def users(role, emails):
+        return bulk(User, [
+            User(username=email.split('@')[0], email=email, role=role, password=password)
+            for email in emails
+        ])
+
+    with transaction.atomic():
+        school_users = users('SCHOOL', [school_email(prefix, n) for n in range(schools)])
+        school_objs = bulk(School, [
+            School(name=f'{prefix} School {n}', address='Synthetic', phone='0000000000', email=user.email, user=user)
+            for n, user in enumerate(school_users)
+        ])
+        bulk(Request, [Request(school=school) for school in school_objs])
+        bulk(ImportJob, [
+            ImportJob(kind='STUDENTS', school=school, created_by=school.user, status='DONE',
+                      rows_processed=students, created=students)
+            for school in school_objs
+        ])
+
+        grade_objs = bulk(Grade, [
+            Grade(grade_name=f'Grade {n + 1}', school=school) for school in school_objs for n in range(grades)
+        ])
+        section_objs = bulk(Section, [
+            Section(section=f'{chr(65 + n % 26)}{n // 26 or ""}', grade=grade) for grade in grade_objs for n in range(sections)
+        ])
+        subject_objs = bulk(Subject, [
+            Subject(subject=f'Subject {n + 1}', school=school) for school in school_objs for n in range(subjects)
+        ])
+        teacher_emails = [teacher_email(prefix, s, n) for s in range(schools) for n in range(teachers)]
+        teacher_objs = bulk(Teacher, [
+            Teacher(first_name=f'Teacher {n % teachers + 1}', last_name='Synthetic', phone='0000000000',
+                    email=user.email, school=school_objs[n // teachers], user=user)
+            for n, user in enumerate(users('TEACHER', teacher_emails))
+        ])
+
+        by_school = defaultdict(lambda: defaultdict(list))
+        for section in section_objs:
+            by_school[section.grade.school_id]['sections'].append(section)
+        for subject in subject_objs:
+            by_school[subject.school_id]['subjects'].append(subject)
+        for teacher in teacher_objs:
+            by_school[teacher.school_id]['teachers'].append(teacher)
+
+        assignments = []
+        for school in school_objs:
+            objs = by_school[school.id]
+            if not objs['teachers']:
+                continue
+            for i, section in enumerate(objs['sections']):
+                for j, subject in enumerate(objs['subjects']):
+                    teacher = objs['teachers'][(i * subjects + j) % teachers]
+                    assignments.append(TeacherSectionSubject(teacher=teacher, section=section, subject=subject))
+        bulk(TeacherSectionSubject, assignments)
+
+        student_objs = bulk(Student, [
+            Student(student_id=f'{prefix}-{n}', first_name=f'Student {n}', last_name='Synthetic',
+                    age=int(age), gender='F' if girl else 'M', section=section, school_id=section.grade.school_id)
+            for n, (section, age, girl) in enumerate(zip(
+                (section for section in section_objs for _ in range(students)),
+                rng.integers(6, 19, len(section_objs) * students),
+                rng.random(len(section_objs) * students) < 0.5,
+            ))
+        ])
+
+        with_parent = [student for student, keep in zip(student_objs, rng.random(len(student_objs)) < parents) if keep]
+        parent_users = users('PARENT', [f'{student.student_id}-parent@example.com' for student in with_parent])
+        bulk(Parent, [
+            Parent(stu_id=student.student_id, first_name=f'Parent {student.id}', last_name='Synthetic',
+                   phone='0000000000', email=user.email, student=student, school_id=student.school_id, user=user)
+            for student, user in zip(with_parent, parent_users)
+        ])
+
+        by_section = defaultdict(list)
+        for student in student_objs:
+            by_section[student.section_id].append(student)
+
+        if attendance_days:
+            seed_attendance(section_objs, by_section, school_days(attendance_days), rng)
+            for school in school_objs:
+                rebuild_school_summaries(school.id)
+        if assessments:
+            seed_assessments(assignments, by_section, assessments, rng)
+
+    return school_objs
+
+
+def seed_attendance(sections, by_section, days, rng):
+    rosters = bulk(SectionRoster, [SectionRoster(section=section, size=len(by_section[section.id])) for section in sections])
+    bulk(RosterEntry, [
+        RosterEntry(roster=roster, student=student, position=position)
+        for roster in rosters
+        for position, student in enumerate(by_section[roster.section_id])
+    ])
+    bulk(SectionAttendance, [
+        SectionAttendance(
+            section_id=roster.section_id, roster=roster, date=day,
+            states=pack_states(rng.choice([PRESENT, ABSENT, LATE], size=roster.size, p=[0.9, 0.07, 0.03])),
+        )
+        for roster in rosters
+        for day in days
+    ])
+
+
+def seed_assessments(assignments, by_section, count, rng):
+    days = school_days(count)
+    assessment_objs = bulk(Assessment, [
+        Assessment(section=assignment.section, subject=assignment.subject, teacher=assignment.teacher,
+                   title=f'Assessment {n + 1}', max_score=Decimal(100), pass_mark=Decimal(50), date=day)
+        for assignment in assignments
+        for n, day in enumerate(days)
+    ])
+    bulk(Score, [
+        Score(assessment=assessment, student=student, score=Decimal(int(score)))
+        for assessment in assessment_objs
+        for student, score in zip(
+            by_section[assessment.section_id],
+            rng.integers(20, 101, len(by_section[assessment.section_id])),
+        )
+    ])
+
+
+class ScratchDatabase:
+    """
+    Context manager that points the default connection at a freshly migrated test
+    database, with DEBUG off (as `manage.py test` does), and destroys it on exit, so
+    benchmarks and audits never touch real data.
+
+    SQLite test databases live in memory unless `path` is given; `options` replaces
+    the connection OPTIONS, e.g. with one of SQLITE_PROFILES.
+    """
+
+    def __init__(self, keepdb=False, path=None, options=None):
+        self.keepdb = keepdb
+        self.path = path
+        self.options = options
+
+    def __enter__(self):
+        setup_test_environment(debug=False)
+        settings_dict = connection.settings_dict
+        self.old_name = settings_dict['NAME']
+        self.old_test_name = settings_dict['TEST'].get('NAME')
+        self.old_options = settings_dict['OPTIONS']
+        if self.path:
+            settings_dict['TEST']['NAME'] = self.path
+        if self.options is not None:
+            settings_dict['OPTIONS'] = self.options
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=self.keepdb)
+        return connection
+
+    def __exit__(self, *exc_info):
+        connection.creation.destroy_test_db(self.old_name, verbosity=0, keepdb=self.keepdb)
+        connection.settings_dict['TEST']['NAME'] = self.old_test_name
+        connection.settings_dict['OPTIONS'] = self.old_options
+        teardown_test_environment()
+
+
+# Command line options for seed_dataset, shared by the commands that build a dataset
+DATASET_OPTIONS = {
+    'schools': (int, "Number of schools."),
+    'grades': (int, "Grades per school."),
+    'sections': (int, "Sections per grade."),
+    'students': (int, "Students per section."),
+    'teachers': (int, "Teachers per school."),
+    'subjects': (int, "Subjects per school; every section is assigned every subject."),
+    'parents': (float, "Fraction of students with a parent (0-1)."),
+    'attendance_days': (int, "Days of attendance per section."),
+    'assessments': (int, "Scored assessments per section and subject."),
+    'seed': (int, "Random seed."),
+}
+
+
+def add_dataset_arguments(parser, **defaults):
+    """Add a --<option> argument for each DATASET_OPTIONS entry; `defaults` override seed_dataset's."""
+    signature = inspect.signature(seed_dataset).parameters
+    for name, (type_, help_text) in DATASET_OPTIONS.items():
+        default = defaults.get(name, signature[name].default)
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type_, default=default, help=f"{help_text} Default: {default}.")
+
+
+def dataset_options(options):
+    """The seed_dataset keyword arguments from parsed command options."""
+    return {name: options[name] for name in DATASET_OPTIONS}
@@ -0,0 +1,88 @@
+"""
+Builders for the few rows a unit test needs.
+
+Each creates one row, with a login account where the model has one, and picks
+unique names and emails itself. Use seed_dataset (core.synthetic) for benchmarks
+and audits that need a whole school, not for unit tests.
+"""
+import datetime
+import itertools
+
+from grade.models import Grade
+from gradebook.models import Assessment, Score
+from parent.models import Parent
+from school.models import School
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+from users.models import User
+
+sequence = itertools.count(1)
+
+
+def create_user(role, email=None):
+    n = next(sequence)
+    return User.objects.create_user(username=f'{role.lower()}-{n}', email=email or f'{role.lower()}-{n}@example.com', role=role)
+
+
+def create_school(name=None, account=True):
+    n = next(sequence)
+    email = f'school-{n}@example.com'
+    return School.objects.create(
+        name=name or f'School {n}', address='Test', phone='0000000000', email=email,
+        user=create_user('SCHOOL', email) if account else None,
+    )
+
+
+def create_grade(school, name=None):
+    return Grade.objects.create(grade_name=name or f'Grade {next(sequence)}', school=school)
+
+
+def create_section(school=None, grade=None, name=None):
+    return Section.objects.create(section=name or f'S{next(sequence)}', grade=grade or create_grade(school))
+
+
+def create_subject(school, name=None):
+    return Subject.objects.create(subject=name or f'Subject {next(sequence)}', school=school)
+
+
+def create_teacher(school, account=True):
+    n = next(sequence)
+    email = f'teacher-{n}@example.com'
+    return Teacher.objects.create(
+        first_name=f'Teacher {n}', last_name='Test', phone='0000000000', email=email, school=school,
+        user=create_user('TEACHER', email) if account else None,
+    )
+
+
+def create_student(section, **fields):
+    n = next(sequence)
+    fields = {
+        'student_id': f'ST{n}', 'first_name': f'Student {n}', 'last_name': 'Test', 'age': 10, 'gender': 'F',
+        **fields,
+    }
+    return Student.objects.create(section=section, school_id=section.grade.school_id, **fields)
+
+
+def create_parent(student, account=True):
+    n = next(sequence)
+    email = f'parent-{n}@example.com'
+    return Parent.objects.create(
+        stu_id=student.student_id, first_name=f'Parent {n}', last_name='Test', phone='0000000000', email=email,
+        student=student, school_id=student.school_id, user=create_user('PARENT', email) if account else None,
+    )
+
+
+def assign(teacher, section, subject):
+    return TeacherSectionSubject.objects.create(teacher=teacher, section=section, subject=subject)
+
+
+def create_assessment(section, subject, max_score=100, pass_mark=50, scores=()):
+    """An assessment with a score for each (student, score) in `scores`."""
+    assessment = Assessment.objects.create(
+        section=section, subject=subject, title=f'Assessment {next(sequence)}',
+        max_score=max_score, pass_mark=pass_mark, date=datetime.date(2026, 10, 5),
+    )
+    Score.objects.bulk_create([Score(assessment=assessment, student=student, score=score) for student, score in scores])
+    return assessment
@@ -0,0 +1,357 @@
+import datetime
+import gzip
+import io
+import logging
+import os
+import sqlite3
+import tempfile
+import zlib
+from contextlib import nullcontext
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from openpyxl import Workbook
+from rest_framework.renderers import JSONRenderer
+
+from attendance.models import SectionAttendance
+from core.compression import CompressionMiddleware, gzip_compressor, negotiate, parse_accept_encoding
+from core.endpoints import client_for
+from core.importing import SpreadsheetError, read_sheet_chunks
+from core.renderers import FastJSONRenderer
+from core.synthetic import PASSWORD, seed_dataset
+from core.testing import create_school, create_section, create_student
+from core.transactions import collect_on_commit
+from gradebook.models import Assessment, Score
+from parent.models import Parent
+from requests.models import Request
+from school.models import School
+from section.models import Section
+from student.models import Student
+from teacher.models import TeacherSectionSubject
+
+
+class SeedDatasetTests(TestCase):
+    def test_counts_follow_the_options(self):
+        schools = seed_dataset(schools=2, grades=2, sections=3, students=4, teachers=2, subjects=2, parents=0.5,
+                               attendance_days=2, assessments=1)
+
+        self.assertEqual(len(schools), 2)
+        self.assertEqual(Section.objects.count(), 2 * 2 * 3)
+        self.assertEqual(Student.objects.count(), 2 * 2 * 3 * 4)
+        self.assertEqual(TeacherSectionSubject.objects.count(), 2 * 2 * 3 * 2)
+        self.assertEqual(SectionAttendance.objects.count(), 2 * 2 * 3 * 2)
+        self.assertEqual(Assessment.objects.count(), TeacherSectionSubject.objects.count())
+        self.assertEqual(Score.objects.count(), Assessment.objects.count() * 4)
+        self.assertTrue(0 < Parent.objects.count() < Student.objects.count())
+        self.assertTrue(all(school.user.check_password(PASSWORD) for school in School.objects.select_related('user')))
+
+    def test_prefixes_keep_datasets_apart(self):
+        seed_dataset(grades=1, sections=1, students=2, teachers=1, subjects=1, attendance_days=0, assessments=0, prefix='a')
+        seed_dataset(grades=1, sections=1, students=2, teachers=1, subjects=1, attendance_days=0, assessments=0, prefix='b')
+        self.assertEqual(Student.objects.filter(student_id__startswith='b-').count(), 2)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        cls.students = [create_student(section) for _ in range(5)]
+        create_student(create_section(create_school()))
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+
+    def pages(self, url):
+        while url:
+            page = self.client.get(url).json()
+            yield page
+            url = page['next']
+
+    def test_pages_cover_the_collection_once_in_id_order(self):
+        url = f"{reverse('school-get-students', args=[self.school.pk])}?page_size=2"
+        pages = list(self.pages(url))
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        self.assertEqual([student['id'] for page in pages for student in page['results']], [student.id for student in self.students])
+
+        previous = self.client.get(pages[2]['previous']).json()
+        self.assertEqual(previous['results'], pages[1]['results'])
+
+    def test_later_pages_seek_past_the_cursor_instead_of_offsetting(self):
+        url = f"{reverse('school-get-students', args=[self.school.pk])}?page_size=2"
+        next_url = self.client.get(url).json()['next']
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(next_url)
+        page_sql = [query['sql'] for query in context.captured_queries if 'FROM "student_student"' in query['sql']]
+        self.assertIn(f'"student_student"."id" > {self.students[1].id}', page_sql[-1])
+        self.assertNotIn('OFFSET', page_sql[-1])
+
+    def test_filtered_lists_are_paged(self):
+        requests = [Request.objects.create(school=create_school(account=False)) for _ in range(3)]
+        Request.objects.create(school=create_school(account=False), status='APPROVED')
+
+        pages = list(self.pages(f"{reverse('request-list')}?status=pending&page_size=2"))
+        self.assertEqual([request['id'] for page in pages for request in page['results']], [request.id for request in requests])
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        create_student(create_section(cls.school))
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+        self.url = reverse('school-get-students', args=[self.school.pk])
+
+    def test_query_count_and_time_are_reported(self):
+        response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", db-slowest;dur=[\d.]+, total;dur=[\d.]+$')
+
+    @override_settings(QUERY_BUDGETS={'school-get-students': {'queries': 1}})
+    def test_going_over_budget_fails_in_strict_mode(self):
+        with self.assertLogs('django.request', 'ERROR'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 500)
+
+    @override_settings(QUERY_BUDGETS={'school-get-students': {'queries': 1}}, QUERY_BUDGET_STRICT=False)
+    def test_going_over_budget_is_logged_otherwise(self):
+        with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('school-get-students used', logs.records[-1].getMessage())
+
+    @override_settings(QUERY_BUDGETS={'default': {'queries': 1}, 'GET school-get-students': None})
+    def test_method_specific_entries_win(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+def workbook_bytes(rows):
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class NegotiationTests(SimpleTestCase):
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding('gzip;q=0.5, BR ,, deflate;q=x'), {'gzip': 0.5, 'br': 1.0, 'deflate': 0.0})
+
+    def test_negotiate_prefers_the_highest_q_then_the_server_order(self):
+        self.assertEqual(negotiate('gzip, br', ('br', 'gzip')), 'br')
+        self.assertEqual(negotiate('gzip, br;q=0.5', ('br', 'gzip')), 'gzip')
+        self.assertEqual(negotiate('*;q=0.1', ('br', 'gzip')), 'br')
+        self.assertIsNone(negotiate('identity', ('br', 'gzip')))
+        self.assertIsNone(negotiate('gzip;q=0', ('gzip',)))
+
+
+class RendererTests(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            'name': 'Line\u2028and paragraph\u2029separators, ünïcode',
+            'when': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 1, 2),
+            'score': Decimal('12.50'),
+            'ids': [1, 2, 3],
+            'nested': {'ok': True, 'none': None},
+        }
+        for backend in ('orjson', 'json'):
+            renderer = FastJSONRenderer()
+            renderer.backend = backend
+            self.assertEqual(renderer.render(data), JSONRenderer().render(data), backend)
+
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        for _ in range(20):
+            create_student(section)
+
+    def test_large_responses_are_gzipped_when_accepted(self):
+        client = client_for(self.school.user)
+        url = reverse('school-get-students', args=[self.school.pk])
+        plain = client.get(url)
+        compressed = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+    def test_streamed_chunks_are_sent_as_they_come(self):
+        produced = []
+
+        def chunks():
+            for chunk in (b'id,name\n', b'1,Ann\n', b'2,Ben\n'):
+                produced.append(chunk)
+                yield chunk
+
+        stream = CompressionMiddleware.compress_stream(chunks(), *gzip_compressor({'gzip_level': 6}))
+        decompressor = zlib.decompressobj(31)
+        self.assertEqual(decompressor.decompress(next(stream)), b'id,name\n')
+        self.assertEqual(produced, [b'id,name\n'])  # The rest isn't generated yet
+        self.assertEqual(decompressor.decompress(b''.join(stream)), b'1,Ann\n2,Ben\n')
+        self.assertTrue(decompressor.eof)
+
+    def test_streamed_export_decodes_piece_by_piece(self):
+        response = client_for(self.school.user).get(
+            reverse('school-export', args=[self.school.pk, 'students']), HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        pieces = iter(response.streaming_content)
+        decompressor = zlib.decompressobj(31)
+        self.assertTrue(decompressor.decompress(next(pieces)).startswith(b'id,student_id,'))
+        body = decompressor.decompress(b''.join(pieces))
+        self.assertEqual(body.count(b'\n'), 20)
+
+
+class CollectOnCommitTests(TestCase):
+    def test_one_call_per_transaction_with_every_value(self):
+        calls = []
+        with self.captureOnCommitCallbacks(execute=True):
+            for value in (1, 2, 2, 3):
+                collect_on_commit('test', [value], calls.append)
+        with self.captureOnCommitCallbacks(execute=True):
+            collect_on_commit('test', [4], calls.append)
+        self.assertEqual(calls, [{1, 2, 3}, {4}])
+
+    def test_rolled_back_values_are_dropped(self):
+        calls = []
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                collect_on_commit('test', [1], calls.append)
+                transaction.set_rollback(True)
+            collect_on_commit('test', [2], calls.append)
+        self.assertEqual(calls, [{2}])
+
+
+class ReadSheetChunksTests(SimpleTestCase):
+    def test_chunks_carry_the_rows_before_them(self):
+        rows = [['name', 'age']] + [[f'Student {n}', n] for n in range(5)]
+        upload = SimpleUploadedFile('students.xlsx', workbook_bytes(rows))
+
+        chunks = list(read_sheet_chunks(upload, chunk_size=2))
+        self.assertEqual([offset for offset, _ in chunks], [0, 2, 4])
+        self.assertEqual([df.values.tolist() for _, df in chunks], [
+            [['Student 0', 0], ['Student 1', 1]],
+            [['Student 2', 2], ['Student 3', 3]],
+            [['Student 4', 4]],
+        ])
+        self.assertEqual(list(chunks[0][1].columns), ['name', 'age'])
+
+    def test_reads_uploads_spooled_to_disk(self):
+        upload = TemporaryUploadedFile('students.xlsx', 'application/octet-stream', 0, None)
+        upload.write(workbook_bytes([['name'], ['Ann'], ['Ben']]))
+        upload.flush()
+        self.assertEqual([(offset, df['name'].tolist()) for offset, df in read_sheet_chunks(upload)], [(0, ['Ann', 'Ben'])])
+        upload.close()
+
+    def test_keeps_inner_blank_rows_and_drops_trailing_ones(self):
+        rows = [[' name ', 'notes', 'age'], ['Ann', 'x', 9], [None, 'y', None], ['Ben'], [None, 'z'], [None, None, '']]
+        upload = SimpleUploadedFile('students.xlsx', workbook_bytes(rows))
+
+        # Rows stay in sheet order, so row numbers still line up; the short row is padded
+        chunks = list(read_sheet_chunks(upload, chunk_size=10, usecols=['name', 'age']))
+        self.assertEqual(len(chunks), 1)
+        offset, df = chunks[0]
+        self.assertEqual(list(df.columns), ['name', 'age'])
+        self.assertEqual(df.astype(object).where(df.notna(), None).values.tolist(), [['Ann', 9], [None, None], ['Ben', None]])
+
+    def test_only_xlsx_workbooks_are_read(self):
+        for name, content in (('students.csv', b'name,age\nAnn,9\n'), ('students.xlsx', b'')):
+            with self.assertRaisesMessage(SpreadsheetError, 'not a valid .xlsx workbook'):
+                list(read_sheet_chunks(SimpleUploadedFile(name, content)))
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def open(self, profile):
+        """A connection with `profile` to a scratch database, as bench_sqlite_concurrency opens them."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        alias = f'scratch_{profile}'
+        connections.settings[alias] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(directory.name, 'db.sqlite3'),
+            'OPTIONS': settings.SQLITE_PROFILES[profile],
+        }
+        connection = connections.create_connection(alias)
+        # Unlisted in the settings it counts as created on the fly, which SimpleTestCase allows
+        del connections.settings[alias]
+        connections[alias] = connection
+        self.addCleanup(connections.__delitem__, alias)
+        self.addCleanup(connection.close)
+        return connection
+
+    def pragma(self, connection, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_production_uses_wal_and_waits_for_the_lock(self):
+        connection = self.open('production')
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(connection, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(connection, 'busy_timeout'), 20000)
+
+        connection = self.open('development')
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'delete')
+
+    def test_production_transactions_take_the_write_lock_at_begin(self):
+        for profile, locked in (('production', True), ('development', False)):
+            connection = self.open(profile)
+            with connection.cursor() as cursor:
+                cursor.execute('CREATE TABLE t (id integer)')
+            other = sqlite3.connect(connection.settings_dict['NAME'], timeout=0, isolation_level=None)
+            self.addCleanup(other.close)
+
+            # Another writer is locked out as soon as the transaction starts, not at its first write
+            with transaction.atomic(using=connection.alias):
+                if locked:
+                    with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+                        other.execute('INSERT INTO t VALUES (1)')
+                else:
+                    other.execute('INSERT INTO t VALUES (1)')
+
+
+class AuditQueryPlansTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.schools = seed_dataset(schools=2, grades=1, sections=1, students=2, teachers=1, subjects=1, attendance_days=1, assessments=1)
+
+    def setUp(self):
+        # The test database and its small dataset stand in for the command's scratch one
+        command = 'core.management.commands.audit_query_plans'
+        self.enterContext(mock.patch(f'{command}.ScratchDatabase', nullcontext))
+        self.enterContext(mock.patch(f'{command}.seed_dataset', lambda **options: self.schools))
+        for name in ('core.instrumentation', 'django.request'):
+            self.addCleanup(logging.getLogger(name).setLevel, logging.getLogger(name).level)
+
+    def audit(self, out):
+        call_command('audit_query_plans', fail_on_scan=True, stdout=out)
+        return out.getvalue()
+
+    def test_fails_when_a_filtered_query_scans_a_table(self):
+        self.assertIn('0 queries with full scans', self.audit(io.StringIO()))
+
+        with connection.cursor() as cursor:
+            for name, index in connection.introspection.get_constraints(cursor, 'student_student').items():
+                if index['index'] and index['columns'] == ['school_id']:
+                    cursor.execute(f'DROP INDEX "{name}"')
+        out = io.StringIO()
+        with self.assertRaisesMessage(CommandError, 'queries read whole tables'):
+            self.audit(out)
+        self.assertIn('! SCAN student_student', out.getvalue())
+
+        with override_settings(QUERY_PLAN_ALLOWED_SCANS={'student_student'}):
+            self.assertIn('0 queries with full scans', self.audit(io.StringIO()))
@@ -0,0 +1,31 @@
+from django.db import transaction
+
+
+def collect_on_commit(key, values, callback, using=None):
+    """
+    Add `values` to the set collected under `key` in the current transaction, and call
+    `callback(values)` with the whole set once, when the transaction commits. Outside a
+    transaction the callback runs straight away.
+
+    Lets per-row signal receivers defer their writes and queries to one call per
+    transaction, however many rows a bulk delete or cascade sends signals for.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        callback(set(values))
+        return
+
+    pending = connection.__dict__.setdefault('collected_on_commit', {})
+    batch = pending.get(key)
+    # Django replaces run_on_commit on every commit and rollback, so a batch registered
+    # on another list was either run already or discarded with its transaction
+    if batch is None or batch['registered_on'] is not connection.run_on_commit:
+        batch = pending[key] = {'values': set(), 'registered_on': connection.run_on_commit}
+
+        def run(batch=batch):
+            if pending.get(key) is batch:
+                del pending[key]
+            callback(batch['values'])
+
+        transaction.on_commit(run, using=using)
+    batch['values'].update(values)
@@ -42,13 +42,14 @@ class GradeViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You do not have permission to view grades.")
 
         grade = self.get_object()
-        sections = Section.objects.filter(grade=grade)  # Assuming Grade has ForeignKey to School
+        sections = Section.objects.filter(grade=grade).select_related('grade')  # SectionSerializer reads grade.grade_name
 
         if not sections.exists():
             return Response({"message": "No section found for this grade."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = SectionSerializer(sections, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(sections)
+        serializer = SectionSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['delete'], url_path='delete-sections')
     def delete_sections(self, request, pk=None):
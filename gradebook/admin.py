@@ -0,0 +1,7 @@
+from django.contrib import admin
+
+from gradebook.models import Assessment, Score
+
+# Register your models here.
+admin.site.register(Assessment)
+admin.site.register(Score)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class GradebookConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gradebook'
+
+    def ready(self):
+        # Drop cached statistics when scores or assessments are edited one by one
+        from gradebook import signals  # noqa: F401
@@ -0,0 +1,40 @@
+from django.db import models
+
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher
+
+# Create your models here.
+class Assessment(models.Model):
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='assessments')
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='assessments')
+    teacher = models.ForeignKey(Teacher, null=True, blank=True, on_delete=models.SET_NULL, related_name='assessments')
+    title = models.CharField(max_length=255)
+    max_score = models.DecimalField(max_digits=6, decimal_places=2)
+    pass_mark = models.DecimalField(max_digits=6, decimal_places=2)
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['section', 'subject'], name='assessment_section_subject_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.title} - {self.section} ({self.subject})'
+
+
+class Score(models.Model):
+    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name='scores')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='scores')
+    score = models.DecimalField(max_digits=6, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['assessment', 'student'], name='unique_assessment_student_score'),
+        ]
+
+    def __str__(self):
+        return f'{self.student} - {self.assessment}: {self.score}'
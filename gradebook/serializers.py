@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from gradebook.models import Assessment, Score
+
+
+class AssessmentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Assessment
+        fields = "__all__"
+        read_only_fields = ['teacher']
+
+    def validate(self, attrs):
+        section = attrs.get('section', getattr(self.instance, 'section', None))
+        subject = attrs.get('subject', getattr(self.instance, 'subject', None))
+        if section.grade.school_id != subject.school_id:
+            raise serializers.ValidationError({"subject": "The subject does not belong to the section's school."})
+
+        max_score = attrs.get('max_score', getattr(self.instance, 'max_score', None))
+        pass_mark = attrs.get('pass_mark', getattr(self.instance, 'pass_mark', None))
+        if max_score <= 0:
+            raise serializers.ValidationError({"max_score": "Must be greater than zero."})
+        if not 0 <= pass_mark <= max_score:
+            raise serializers.ValidationError({"pass_mark": "Must be between 0 and max_score."})
+        return attrs
+
+
+class ScoreSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Score
+        fields = ['student', 'score', 'updated_at']
+
+
+class ScoreEntrySerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    score = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=Decimal(0), allow_null=True)  # null clears the score
+
+
+class BulkScoreSerializer(serializers.Serializer):
+    """A whole section's scores for one assessment."""
+    scores = ScoreEntrySerializer(many=True, allow_empty=False)
+
+    def validate_scores(self, scores):
+        students = [entry['student'] for entry in scores]
+        if len(students) != len(set(students)):
+            raise serializers.ValidationError("Each student can only be listed once.")
+
+        max_score = self.context['assessment'].max_score
+        too_high = [entry['student'] for entry in scores if entry['score'] is not None and entry['score'] > max_score]
+        if too_high:
+            raise serializers.ValidationError(f"Scores cannot exceed {max_score} (students {too_high}).")
+        return scores
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.transactions import collect_on_commit
+from gradebook.models import Assessment, Score
+from gradebook.statistics import invalidate_assessment_statistics, invalidate_statistics
+
+
+@receiver([post_save, post_delete], sender=Assessment)
+def assessment_changed(sender, instance, **kwargs):
+    invalidate_statistics(instance)
+
+
+@receiver([post_save, post_delete], sender=Score)
+def score_changed(sender, instance, origin=None, **kwargs):
+    # Deleting an assessment cascades to its scores; assessment_changed covers those
+    if isinstance(origin, Assessment):
+        return
+    if Score.assessment.is_cached(instance):
+        invalidate_statistics(instance.assessment)
+    else:
+        # E.g. scores removed with their students: their assessments are read once, on commit
+        collect_on_commit('score-assessments', [instance.assessment_id], invalidate_assessment_statistics)
@@ -0,0 +1,140 @@
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+
+from gradebook.models import Assessment, Score
+
+STATISTICS_CACHE_TIMEOUT = 60 * 60
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def assessment_cache_key(assessment_id):
+    return f'assessment-statistics:{assessment_id}'
+
+
+def section_subject_cache_key(section_id, subject_id):
+    return f'section-subject-statistics:{section_id}:{subject_id}'
+
+
+def _round(value):
+    return round(float(value), 2)
+
+
+def score_statistics(student_ids, scores, pass_mark):
+    """
+    Mean, median, spread, percentiles, pass rate and per-student rank of a score
+    array, all computed with NumPy rather than per student.
+
+    Ranks are competition ranks (equal scores share a rank, 1 being the highest);
+    a student's percentile is the share of scores at or below theirs.
+    """
+    student_ids = np.asarray(student_ids, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+    if not len(scores):
+        return {'count': 0, 'mean': None, 'median': None, 'std': None, 'min': None, 'max': None,
+                'percentiles': {}, 'pass_rate': None, 'students': []}
+
+    ordered = np.sort(scores)
+    at_or_below = np.searchsorted(ordered, scores, side='right')
+    ranks = len(scores) - at_or_below + 1
+    percentile_ranks = at_or_below / len(scores) * 100
+
+    by_rank = np.lexsort((student_ids, ranks))
+    return {
+        'count': len(scores),
+        'mean': _round(scores.mean()),
+        'median': _round(np.median(scores)),
+        'std': _round(scores.std()),
+        'min': _round(ordered[0]),
+        'max': _round(ordered[-1]),
+        'percentiles': {str(p): _round(v) for p, v in zip(PERCENTILES, np.percentile(scores, PERCENTILES))},
+        'pass_rate': round(float((scores >= float(pass_mark)).mean()), 4),
+        'students': [
+            {'student': student, 'score': _round(score), 'rank': rank, 'percentile': _round(percentile)}
+            for student, score, rank, percentile in zip(
+                student_ids[by_rank].tolist(), scores[by_rank].tolist(),
+                ranks[by_rank].tolist(), percentile_ranks[by_rank].tolist(),
+            )
+        ],
+    }
+
+
+def build_assessment_statistics(assessment):
+    rows = list(Score.objects.filter(assessment=assessment).values_list('student_id', 'score'))
+    student_ids, scores = zip(*rows) if rows else ([], [])
+    return {
+        'assessment': assessment.id,
+        'max_score': _round(assessment.max_score),
+        'pass_mark': _round(assessment.pass_mark),
+        **score_statistics(student_ids, scores, assessment.pass_mark),
+    }
+
+
+def build_section_subject_statistics(section_id, subject_id):
+    """
+    Statistics over every assessment of a subject in a section. Each student is
+    scored by their average percentage over the assessments they sat, and passes
+    on the average pass percentage.
+    """
+    assessments = list(
+        Assessment.objects.filter(section_id=section_id, subject_id=subject_id)
+        .order_by('id').values_list('id', 'max_score', 'pass_mark')
+    )
+    result = {'section': section_id, 'subject': subject_id, 'assessments': []}
+    if not assessments:
+        return {**result, **score_statistics([], [], 0)}
+
+    assessment_ids, max_scores, pass_marks = (np.array(column, dtype=np.float64) for column in zip(*assessments))
+    assessment_ids = assessment_ids.astype(np.int64)
+
+    rows = list(Score.objects.filter(assessment_id__in=assessment_ids.tolist()).values_list('assessment_id', 'student_id', 'score'))
+    row_assessments, row_students, scores = (
+        (np.array(column, dtype=np.float64) for column in zip(*rows)) if rows else (np.empty(0) for _ in range(3))
+    )
+    assessment_index = np.searchsorted(assessment_ids, row_assessments.astype(np.int64))
+    percentages = scores / max_scores[assessment_index] * 100
+
+    students, student_index = np.unique(row_students.astype(np.int64), return_inverse=True)
+    averages = np.bincount(student_index, weights=percentages, minlength=len(students)) / np.bincount(student_index, minlength=len(students))
+
+    sat = np.bincount(assessment_index, minlength=len(assessments))
+    means = np.bincount(assessment_index, weights=percentages, minlength=len(assessments)) / np.maximum(sat, 1)
+    result['assessments'] = [
+        {'assessment': assessment_id, 'count': count, 'mean_percentage': _round(mean) if count else None}
+        for assessment_id, count, mean in zip(assessment_ids.tolist(), sat.tolist(), means.tolist())
+    ]
+    pass_percentage = (pass_marks / max_scores * 100).mean()
+    return {**result, 'pass_percentage': _round(pass_percentage), **score_statistics(students, averages, pass_percentage)}
+
+
+def get_assessment_statistics(assessment):
+    key = assessment_cache_key(assessment.id)
+    statistics = cache.get(key)
+    if statistics is None:
+        statistics = build_assessment_statistics(assessment)
+        cache.set(key, statistics, STATISTICS_CACHE_TIMEOUT)
+    return statistics
+
+
+def get_section_subject_statistics(section_id, subject_id):
+    key = section_subject_cache_key(section_id, subject_id)
+    statistics = cache.get(key)
+    if statistics is None:
+        statistics = build_section_subject_statistics(section_id, subject_id)
+        cache.set(key, statistics, STATISTICS_CACHE_TIMEOUT)
+    return statistics
+
+
+def invalidate_statistics(assessment):
+    """Drop the cached statistics of an assessment and of its section/subject, once committed."""
+    keys = [
+        assessment_cache_key(assessment.id),
+        section_subject_cache_key(assessment.section_id, assessment.subject_id),
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_assessment_statistics(assessment_ids):
+    """invalidate_statistics() for assessments known only by id, read in one query."""
+    for assessment in Assessment.objects.filter(id__in=assessment_ids).only('id', 'section_id', 'subject_id'):
+        invalidate_statistics(assessment)
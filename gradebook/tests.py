@@ -0,0 +1,137 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.endpoints import client_for
+from core.testing import assign, create_assessment, create_school, create_section, create_student, create_subject, create_teacher
+from gradebook.statistics import assessment_cache_key, get_assessment_statistics
+from student.models import Student
+
+
+class StatisticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.section = create_section(cls.school)
+        cls.subject = create_subject(cls.school)
+        cls.students = [create_student(cls.section) for _ in range(4)]
+        s1, s2, s3, s4 = cls.students
+        cls.first = create_assessment(cls.section, cls.subject, scores=[(s1, 40), (s2, 70), (s3, 70), (s4, 90)])
+        cls.second = create_assessment(cls.section, cls.subject, max_score=50, pass_mark=20, scores=[(s1, 50), (s2, 10)])
+
+    def setUp(self):
+        cache.clear()  # Statistics are cached by id, which later tests can reuse
+
+    def get(self, url, params=None):
+        response = client_for(self.school.user).get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_assessment_statistics(self):
+        s1, s2, s3, s4 = (student.pk for student in self.students)
+        self.assertEqual(self.get(reverse('assessment-statistics', args=[self.first.pk])), {
+            'assessment': self.first.pk, 'max_score': 100.0, 'pass_mark': 50.0,
+            'count': 4, 'mean': 67.5, 'median': 70.0, 'std': 17.85, 'min': 40.0, 'max': 90.0,
+            'percentiles': {'10': 49.0, '25': 62.5, '50': 70.0, '75': 75.0, '90': 84.0},
+            'pass_rate': 0.75,
+            # Equal scores share a rank; ties are listed by student
+            'students': [
+                {'student': s4, 'score': 90.0, 'rank': 1, 'percentile': 100.0},
+                {'student': s2, 'score': 70.0, 'rank': 2, 'percentile': 75.0},
+                {'student': s3, 'score': 70.0, 'rank': 2, 'percentile': 75.0},
+                {'student': s1, 'score': 40.0, 'rank': 4, 'percentile': 25.0},
+            ],
+        })
+
+    def test_section_subject_statistics(self):
+        # Students are scored by their average percentage over the assessments they sat: 70, 45, 70 and 90
+        statistics = self.get(reverse('assessment-section-statistics'), {'section': self.section.pk, 'subject': self.subject.pk})
+        self.assertEqual(statistics['assessments'], [
+            {'assessment': self.first.pk, 'count': 4, 'mean_percentage': 67.5},
+            {'assessment': self.second.pk, 'count': 2, 'mean_percentage': 60.0},
+        ])
+        self.assertEqual(
+            {key: statistics[key] for key in ('pass_percentage', 'count', 'mean', 'median', 'std', 'min', 'max', 'pass_rate')},
+            {'pass_percentage': 45.0, 'count': 4, 'mean': 68.75, 'median': 70.0, 'std': 15.96, 'min': 45.0, 'max': 90.0, 'pass_rate': 1.0},
+        )
+        self.assertEqual(
+            [(row['student'], row['score'], row['rank']) for row in statistics['students']],
+            [(self.students[3].pk, 90.0, 1), (self.students[0].pk, 70.0, 2), (self.students[2].pk, 70.0, 2), (self.students[1].pk, 45.0, 4)],
+        )
+
+    def test_no_scores(self):
+        statistics = self.get(reverse('assessment-statistics', args=[create_assessment(self.section, self.subject).pk]))
+        self.assertEqual((statistics['count'], statistics['mean'], statistics['students']), (0, None, []))
+
+    def test_saving_scores_refreshes_the_statistics(self):
+        url = reverse('assessment-statistics', args=[self.first.pk])
+        self.assertEqual(self.get(url)['max'], 90.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client_for(self.school.user).post(
+                reverse('assessment-scores', args=[self.first.pk]),
+                {'scores': [{'student': self.students[0].pk, 'score': 100}, {'student': self.students[1].pk, 'score': None}]},
+                content_type='application/json',
+            )
+        self.assertEqual(response.json(), {'message': 'Scores saved.', 'saved': 1, 'cleared': 1})
+        statistics = self.get(url)
+        self.assertEqual((statistics['count'], statistics['max'], statistics['mean']), (3, 100.0, 86.67))
+
+
+class AssessmentPermissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school, cls.other = create_school(), create_school()
+        cls.teacher = create_teacher(cls.school)
+        section, subject = create_section(cls.school), create_subject(cls.school)
+        assign(cls.teacher, section, subject)
+        cls.assessment = create_assessment(section, subject)
+        cls.other_section, cls.other_subject = create_section(cls.other), create_subject(cls.other)
+
+    def test_cannot_move_an_assessment_into_another_school(self):
+        url = reverse('assessment-detail', args=[self.assessment.pk])
+        data = {'section': self.other_section.pk, 'subject': self.other_subject.pk}
+
+        for user in (self.school.user, self.teacher.user):
+            response = client_for(user).patch(url, data, content_type='application/json')
+            self.assertEqual(response.status_code, 403, user.role)
+
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.section.grade.school_id, self.school.pk)
+
+    def test_cannot_read_another_schools_assessment(self):
+        response = client_for(self.other.user).get(reverse('assessment-detail', args=[self.assessment.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_teacher_can_update_own_assessment(self):
+        response = client_for(self.teacher.user).patch(
+            reverse('assessment-detail', args=[self.assessment.pk]), {'title': 'Renamed'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.title, 'Renamed')
+
+
+class StatisticsInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        students = [create_student(section) for _ in range(5)]
+        cls.assessments = [
+            create_assessment(section, create_subject(cls.school), scores=[(student, 60) for student in students])
+            for _ in range(3)
+        ]
+
+    def test_deleting_students_drops_their_assessments_statistics(self):
+        for assessment in self.assessments:
+            get_assessment_statistics(assessment)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            Student.objects.filter(school=self.school).delete()
+
+        # Read once for all of the deleted scores, not once per score
+        self.assertEqual(len([query for query in queries if 'FROM "gradebook_assessment"' in query['sql']]), 1)
+        for assessment in self.assessments:
+            self.assertIsNone(cache.get(assessment_cache_key(assessment.id)))
@@ -0,0 +1,115 @@
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.permissions import check_school_staff
+from gradebook.models import Assessment, Score
+from gradebook.serializers import AssessmentSerializer, BulkScoreSerializer, ScoreSerializer
+from gradebook.statistics import get_assessment_statistics, get_section_subject_statistics, invalidate_statistics
+from section.models import Section
+from student.models import Student
+from teacher.models import TeacherSectionSubject
+
+
+class AssessmentViewSet(viewsets.ModelViewSet):
+    queryset = Assessment.objects.all()
+    serializer_class = AssessmentSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Staff only see their own school's assessments
+        principal = self.request.user.principal
+        if principal.role not in ('SCHOOL', 'TEACHER'):
+            return Assessment.objects.none()
+        return Assessment.objects.filter(section__grade__school_id=principal.school_id).select_related('section')
+
+    def check_can_grade(self, section, subject_id):
+        """The school, or a teacher assigned to this section and subject."""
+        principal = self.request.user.principal
+        check_school_staff(self.request, section.grade.school_id)
+        if principal.role == 'TEACHER' and not TeacherSectionSubject.objects.filter(
+            teacher_id=principal.teacher_id, section=section, subject_id=subject_id,
+        ).exists():
+            raise PermissionDenied("You do not teach this subject in this section.")
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        self.check_can_grade(data['section'], data['subject'].id)
+        serializer.save(teacher_id=self.request.user.principal.teacher_id)
+
+    def perform_update(self, serializer):
+        assessment = serializer.instance
+        data = serializer.validated_data
+        self.check_can_grade(assessment.section, assessment.subject_id)
+        # And where it is moved to, so an assessment can't be moved into another school's section
+        self.check_can_grade(data.get('section', assessment.section), data.get('subject', assessment.subject).id)
+        invalidate_statistics(assessment)  # The old section/subject; the saved one is handled by the signal
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        self.check_can_grade(instance.section, instance.subject_id)
+        instance.delete()
+
+    @action(detail=True, methods=['get', 'post'], url_path='scores')
+    def scores(self, request, pk=None):
+        """GET the scores of an assessment; POST a whole section's scores in one request."""
+        assessment = self.get_object()
+        if request.method == 'GET':
+            page = self.paginate_queryset(Score.objects.filter(assessment=assessment).only('student_id', 'score', 'updated_at'))
+            return self.get_paginated_response(ScoreSerializer(page, many=True).data)
+
+        self.check_can_grade(assessment.section, assessment.subject_id)
+        serializer = BulkScoreSerializer(data=request.data, context={'assessment': assessment})
+        serializer.is_valid(raise_exception=True)
+        entries = serializer.validated_data['scores']
+
+        students = [entry['student'] for entry in entries]
+        in_section = set(
+            Student.objects.filter(section_id=assessment.section_id, id__in=students).values_list('id', flat=True)
+        )
+        unknown = sorted(set(students) - in_section)
+        if unknown:
+            raise ValidationError({"scores": f"Students not in this section: {unknown}."})
+
+        cleared = [entry['student'] for entry in entries if entry['score'] is None]
+        with transaction.atomic():
+            # One upsert for every score, whatever was already recorded
+            Score.objects.bulk_create(
+                [
+                    Score(assessment=assessment, student_id=entry['student'], score=entry['score'])
+                    for entry in entries if entry['score'] is not None
+                ],
+                update_conflicts=True,
+                unique_fields=['assessment', 'student'],
+                update_fields=['score', 'updated_at'],
+                batch_size=500,
+            )
+            if cleared:
+                Score.objects.filter(assessment=assessment, student_id__in=cleared).delete()
+            invalidate_statistics(assessment)  # bulk_create sends no signals
+
+        return Response(
+            {"message": "Scores saved.", "saved": len(entries) - len(cleared), "cleared": len(cleared)},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['get'], url_path='statistics')
+    def statistics(self, request, pk=None):
+        return Response(get_assessment_statistics(self.get_object()))
+
+    @action(detail=False, methods=['get'], url_path='section-statistics')
+    def section_statistics(self, request):
+        """Statistics over all assessments of ?subject= in ?section=."""
+        try:
+            section_id, subject_id = int(request.query_params['section']), int(request.query_params['subject'])
+        except (KeyError, ValueError):
+            raise ValidationError({"error": "The section and subject query parameters are required."})
+
+        school_id = Section.objects.filter(id=section_id).values_list('grade__school_id', flat=True).first()
+        if school_id is None:
+            return Response({"error": "Section not found."}, status=status.HTTP_404_NOT_FOUND)
+        check_school_staff(request, school_id)
+        return Response(get_section_subject_statistics(section_id, subject_id))
@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from imports.models import ImportJob
+
+# Register your models here.
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'school', 'status', 'rows_processed', 'rows_failed', 'created_at')
+    list_filter = ('status', 'kind')
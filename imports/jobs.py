@@ -0,0 +1,133 @@
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from core.importing import SpreadsheetError, import_sheet
+from imports.models import ImportJob
+from parent.importers import ParentImporter
+from student.importers import StudentImporter
+from teacher.importers import TeacherImporter
+
+
+def make_importer(job):
+    if job.kind == 'STUDENTS':
+        return StudentImporter(job.school, job.section)
+    if job.kind == 'TEACHERS':
+        return TeacherImporter(job.school)
+    return ParentImporter(job.school)
+
+
+def enqueue_import(kind, file, school, section=None, user_id=None):
+    """Save the upload and queue it for the worker; returns the ImportJob."""
+    # Reject anything that can't be a workbook now, rather than in the worker
+    if not zipfile.is_zipfile(file):
+        raise SpreadsheetError("The uploaded file is not a valid .xlsx workbook.")
+    file.seek(0)
+    job = ImportJob(kind=kind, school=school, section=section, created_by_id=user_id)
+    job.file.save(file.name, file, save=False)
+    job.save()
+    return job
+
+
+def claim_job(job):
+    """
+    Mark a pending job as running, unless another import for the same school is
+    already running. One conditional UPDATE, so two workers can't both claim it.
+    """
+    running = ImportJob.objects.filter(school_id=OuterRef('school_id'), status='RUNNING')
+    now = timezone.now()
+    return bool(
+        ImportJob.objects.filter(pk=job.pk, status='PENDING')
+        .exclude(Exists(running))
+        .update(status='RUNNING', started_at=now, heartbeat_at=now)
+    )
+
+
+def fail_stale_jobs():
+    """Fail running jobs whose worker stopped sending heartbeats, so their school isn't blocked forever."""
+    cutoff = timezone.now() - timedelta(seconds=settings.IMPORT_JOB_STALE_AFTER)
+    return ImportJob.objects.filter(status='RUNNING', heartbeat_at__lt=cutoff).update(
+        status='FAILED', error="The import worker stopped before the job finished.", finished_at=timezone.now(),
+    )
+
+
+def import_results(importer):
+    """(errors, details) of an importer's report so far, as stored on ImportJob."""
+    result = importer.as_dict() if hasattr(importer, 'as_dict') else importer.report.as_dict()
+    errors = result.pop('errors')
+    return errors, {key: value for key, value in result.items() if key not in ('created', 'failed')}
+
+
+def resume_report(importer, job):
+    """Load what earlier runs of `job` committed into `importer`, so its report covers the whole sheet."""
+    report = importer.report
+    report.created = job.created
+    for entry in job.errors:
+        for field, messages in entry['errors'].items():
+            for message in messages:
+                report.add_error(entry['row'], field, message)
+    for key, value in job.details.items():
+        setattr(importer, key, value)  # E.g. ParentImporter.unmatched_student_ids
+
+
+def run_import_job(job):
+    """
+    Import a claimed job's file chunk by chunk. Progress and the report so far are
+    saved in each chunk's transaction, so if a chunk fails the job records exactly
+    the rows committed before it, keeps its file, and a retry (see retry_job)
+    resumes after them instead of importing them again.
+    """
+    importer = make_importer(job)
+    report = importer.report
+    resume_report(importer, job)
+
+    def save_progress(rows_read=None, extra_fields=()):
+        if rows_read is not None:
+            job.rows_processed = rows_read
+            job.rows_failed = report.failed
+            job.created = report.created
+            job.errors, job.details = import_results(importer)
+        job.heartbeat_at = timezone.now()
+        job.save(update_fields=[
+            'rows_processed', 'rows_failed', 'created', 'errors', 'details', 'heartbeat_at', *extra_fields,
+        ])
+
+    try:
+        import_sheet(importer, job.file.path, progress=save_progress, start=job.rows_processed)
+    except Exception as e:
+        # What the failed chunk added to the report was rolled back with it, so keep the saved report
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        save_progress(extra_fields=['status', 'error', 'finished_at'])
+        return job
+
+    job.status = 'DONE'
+    job.error = ''
+    job.finished_at = timezone.now()
+    job.file.delete(save=False)
+    save_progress(extra_fields=['status', 'error', 'finished_at', 'file'])
+    return job
+
+
+def retry_job(job):
+    """Queue a failed job again; it resumes after the rows already imported. Returns whether it was queued."""
+    if not job.file:
+        return False
+    return bool(
+        ImportJob.objects.filter(pk=job.pk, status='FAILED')
+        .update(status='PENDING', error='', started_at=None, heartbeat_at=None, finished_at=None)
+    )
+
+
+def run_pending_jobs():
+    """Claim and run every pending job whose school has no import running; yields each finished job."""
+    for job in ImportJob.objects.filter(status='PENDING').select_related('school', 'section').order_by('id'):
+        # Skipped if another worker took it or the school already has an import running
+        if not claim_job(job):
+            continue
+        job.refresh_from_db(fields=['status', 'started_at', 'heartbeat_at'])
+        yield run_import_job(job)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from imports.jobs import fail_stale_jobs, retry_job, run_pending_jobs
+from imports.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Run pending spreadsheet import jobs, one at a time per school."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new jobs instead of exiting.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to wait between polls with --loop.")
+        parser.add_argument(
+            '--retry', type=int, nargs='+', default=[], metavar='JOB_ID',
+            help="Queue these failed jobs again; each resumes after the rows it already imported.",
+        )
+
+    def handle(self, *args, **options):
+        for job in ImportJob.objects.filter(pk__in=options['retry']).order_by('id'):
+            if retry_job(job):
+                self.stdout.write(f"Job {job.id}: queued to resume after {job.rows_processed} row(s).")
+            else:
+                self.stderr.write(f"Job {job.id}: only failed jobs whose file is kept can be retried.")
+
+        while True:
+            stale = fail_stale_jobs()
+            if stale:
+                self.stdout.write(f"Marked {stale} stale job(s) as failed.")
+
+            for job in run_pending_jobs():
+                self.stdout.write(
+                    f"Job {job.id}: {job.status}, {job.rows_processed} row(s) processed, "
+                    f"{job.created} created, {job.rows_failed} failed."
+                )
+
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,44 @@
+from django.db import models
+
+from school.models import School
+from section.models import Section
+from users.models import User
+
+# Create your models here.
+class ImportJob(models.Model):
+    """A spreadsheet upload imported by `python manage.py run_import_jobs`."""
+    KIND_CHOICES = [
+        ('STUDENTS', 'STUDENTS'),
+        ('TEACHERS', 'TEACHERS'),
+        ('PARENTS', 'PARENTS'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'PENDING'),
+        ('RUNNING', 'RUNNING'),
+        ('DONE', 'DONE'),
+        ('FAILED', 'FAILED'),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='import_jobs')
+    section = models.ForeignKey(Section, null=True, blank=True, on_delete=models.CASCADE, related_name='import_jobs')  # Student imports only
+    file = models.FileField(upload_to='imports/', blank=True)  # Removed once the job is done; kept after a failure so it can be retried
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list)  # ImportReport.errors: [{'row': ..., 'errors': {field: [messages]}}]
+    details = models.JSONField(default=dict)  # Importer-specific extras, e.g. unmatched student ids
+    error = models.TextField(blank=True)  # Why the job failed as a whole
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'school'], name='import_job_status_school_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} import {self.id} - {self.status}'
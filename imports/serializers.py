@@ -0,0 +1,23 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from imports.models import ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    error_report = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'kind', 'school', 'section', 'status', 'rows_processed', 'rows_failed', 'created',
+            'details', 'error', 'error_report', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_error_report(self, job):
+        # CSV of the failed rows, once there are any
+        if not job.rows_failed:
+            return None
+        url = reverse('import-job-error-report', args=[job.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
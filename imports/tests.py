@@ -0,0 +1,103 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import Workbook
+
+from core.endpoints import client_for
+from core.testing import create_school, create_section, create_teacher
+from imports.jobs import run_pending_jobs
+from imports.models import ImportJob
+from student.models import Student
+
+
+def student_sheet(rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['student_id', 'first_name', 'last_name', 'age', 'gender'])
+    for row in rows:
+        sheet.append(row)
+    output = io.BytesIO()
+    workbook.save(output)
+    return SimpleUploadedFile('students.xlsx', output.getvalue())
+
+
+class ImportJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.section = create_section(cls.school)
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def upload(self, user, rows):
+        return client_for(user).post(reverse('students-upload-excel'), {
+            'file': student_sheet(rows), 'school_id': self.school.pk, 'section_id': self.section.pk,
+        })
+
+    def test_uploaded_sheet_is_imported_by_the_worker(self):
+        response = self.upload(self.school.user, [['imp-1', 'Ada', 'L', 10, 'F'], ['imp-2', 'Bo', 'K', 'ten', 'M']])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(ImportJob.objects.get(pk=response.json()['job_id']).status, 'PENDING')
+
+        [job] = run_pending_jobs()
+        self.assertEqual((job.status, job.rows_processed, job.created, job.rows_failed), ('DONE', 2, 1, 1))
+        self.assertFalse(job.file)
+        self.assertTrue(Student.objects.filter(section=self.section, student_id='imp-1').exists())
+
+        report = client_for(self.school.user).get(reverse('import-job-error-report', args=[job.pk]))
+        self.assertEqual(
+            report.content.decode().splitlines(), ['row,field,message', '3,age,A valid non-negative integer is required.'],
+        )
+
+    @override_settings(IMPORT_CHUNK_SIZE=2)
+    def test_failed_chunk_is_resumed_without_importing_earlier_rows_again(self):
+        rows = [[f'imp-{n}', f'Name {n}', 'L', 10, 'F'] for n in range(5)]
+        rows[1][3] = 'ten'
+        job_id = self.upload(self.school.user, rows).json()['job_id']
+
+        # The second chunk fails as it is written; the first stays committed
+        with mock.patch('student.importers.bump_school_version', side_effect=[None, OSError('disk full')]):
+            [job] = run_pending_jobs()
+        self.assertEqual((job.status, job.error), ('FAILED', 'disk full'))
+        job.refresh_from_db()
+        self.assertEqual((job.rows_processed, job.created, job.rows_failed), (2, 1, 1))
+        self.assertTrue(job.file)
+        self.assertEqual(list(Student.objects.filter(section=self.section).values_list('student_id', flat=True)), ['imp-0'])
+
+        call_command('run_import_jobs', retry=[job_id], stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.rows_processed, job.created, job.rows_failed), ('DONE', '', 5, 4, 1))
+        self.assertEqual([entry['row'] for entry in job.errors], [3])
+        self.assertEqual(
+            list(Student.objects.filter(section=self.section).order_by('student_id').values_list('student_id', flat=True)),
+            ['imp-0', 'imp-2', 'imp-3', 'imp-4'],
+        )
+
+        # Done jobs are not run again
+        call_command('run_import_jobs', retry=[job_id], stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(ImportJob.objects.get(pk=job_id).status, 'DONE')
+
+    def test_non_spreadsheet_is_rejected_without_a_job(self):
+        response = client_for(self.school.user).post(reverse('parents-upload-parent'), {
+            'file': SimpleUploadedFile('parents.csv', b'a,b\n1,2\n'), 'school_id': self.school.pk,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_teachers_only_see_their_own_imports(self):
+        teacher = create_teacher(self.school)
+        own = self.upload(teacher.user, [['imp-3', 'Cy', 'M', 11, 'M']]).json()['job_id']
+        other = self.upload(self.school.user, [['imp-4', 'Di', 'N', 12, 'F']]).json()['job_id']
+
+        listed = client_for(teacher.user).get(reverse('import-job-list')).json()['results']
+        self.assertEqual([job['id'] for job in listed], [own])
+        listed = client_for(self.school.user).get(reverse('import-job-list')).json()['results']
+        self.assertEqual([job['id'] for job in listed], [own, other])
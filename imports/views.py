@@ -0,0 +1,53 @@
+import csv
+import io
+
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from imports.models import ImportJob
+from imports.serializers import ImportJobSerializer
+
+
+def import_accepted(request, job, noun):
+    """202 response for a queued upload, pointing at the job's status endpoint."""
+    return Response(
+        {
+            "message": f"The {noun} import has been queued.",
+            "job_id": job.id,
+            "status_url": request.build_absolute_uri(reverse('import-job-detail', args=[job.id])),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # A school sees all of its imports, anyone else only the ones they uploaded
+        principal = self.request.user.principal
+        if principal.role == 'SCHOOL' and principal.school_id:
+            return ImportJob.objects.filter(school_id=principal.school_id)
+        return ImportJob.objects.filter(created_by_id=self.request.user.pk)
+
+    @action(detail=True, methods=['get'], url_path='error-report', url_name='error-report')
+    def error_report(self, request, pk=None):
+        """The failed rows as CSV: one line per (row, field, message)."""
+        job = self.get_object()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['row', 'field', 'message'])
+        for entry in job.errors:
+            for field, messages in entry['errors'].items():
+                for message in messages:
+                    writer.writerow([entry['row'], field, message])
+
+        response = HttpResponse(buffer.getvalue(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="import-{job.id}-errors.csv"'
+        return response
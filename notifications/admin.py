@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from notifications.models import OutboxEmail
+
+# Register your models here.
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
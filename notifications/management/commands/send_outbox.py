@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over a single mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new emails instead of exiting once drained.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to wait between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain(batch_size=options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils import timezone
+
+# Create your models here.
+class OutboxEmail(models.Model):
+    """An email queued in the same transaction as the change that triggers it."""
+    STATUS_CHOICES = [
+        ('PENDING', 'PENDING'),
+        ('SENT', 'SENT'),
+        ('FAILED', 'FAILED'),
+    ]
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # Pending mails are not retried before this
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.recipients)} ({self.status})'
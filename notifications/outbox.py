@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import OutboxEmail
+
+# How long a claimed batch is hidden from other runs before it becomes due again
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def build_email(subject, message, from_email, recipient_list):
+    """Return an unsaved outbox entry; use bulk_create to queue many at once."""
+    return OutboxEmail(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    """Queue an email for the delivery worker. Takes the same arguments as send_mail."""
+    email = build_email(subject, message, from_email, recipient_list)
+    email.save()
+    return email
+
+
+def retry_delay(attempts):
+    # Exponential backoff: base, 2*base, 4*base, ...
+    return timedelta(seconds=settings.OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def claim_batch(batch_size):
+    """Pick the next due pending emails and lease them so a crash only delays them."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(id__in=ids).update(next_attempt_at=now + CLAIM_LEASE)
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def deliver_batch(emails, connection):
+    """
+    Send `emails` over `connection` and record the outcome of each.
+
+    The caller is expected to have opened the connection so it is reused for the
+    whole batch. Returns a (sent, failed) tuple; failed emails are rescheduled
+    with backoff until OUTBOX_MAX_ATTEMPTS is reached, then marked FAILED.
+    Bodies can hold account credentials, so they are cleared once an email is
+    SENT or FAILED and no longer needed.
+    """
+    sent = failed = 0
+    now = timezone.now()
+
+    for email in emails:
+        email.attempts += 1
+        message = EmailMessage(email.subject, email.body, email.from_email, email.recipients, connection=connection)
+        try:
+            message.send()
+        except Exception as e:
+            failed += 1
+            email.last_error = str(e)
+            if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                email.status = 'FAILED'
+                email.body = ''
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+        else:
+            sent += 1
+            email.status = 'SENT'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.body = ''
+
+    OutboxEmail.objects.bulk_update(emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'body'])
+    return sent, failed
+
+
+def drain(batch_size=None, connection=None):
+    """Deliver every email that is currently due, one batch at a time over one connection."""
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    total_sent = total_failed = 0
+
+    emails = claim_batch(batch_size)
+    if not emails:
+        return total_sent, total_failed
+
+    # Only connect once there is something to send, then reuse the connection
+    with connection or get_connection() as connection:
+        while emails:
+            sent, failed = deliver_batch(emails, connection)
+            total_sent += sent
+            total_failed += failed
+            emails = claim_batch(batch_size)
+
+    return total_sent, total_failed
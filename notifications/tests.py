@@ -0,0 +1,33 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from notifications.outbox import drain, enqueue_email
+
+
+class OutboxDeliveryTests(TestCase):
+    def test_sent_emails_keep_no_body(self):
+        email = enqueue_email('Credentials', 'Username: a\nPassword: secret', None, ['a@example.com'])
+
+        self.assertEqual(drain(), (1, 0))
+        self.assertEqual(mail.outbox[0].body, 'Username: a\nPassword: secret')
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), ('SENT', ''))
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_failed_emails_keep_no_body(self):
+        email = enqueue_email('Credentials', 'Password: secret', None, ['a@example.com'])
+
+        with mock.patch('notifications.outbox.EmailMessage.send', side_effect=OSError('refused')):
+            self.assertEqual(drain(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body, email.last_error), ('FAILED', '', 'refused'))
+
+    def test_retried_emails_keep_their_body(self):
+        email = enqueue_email('Credentials', 'Password: secret', None, ['a@example.com'])
+
+        with mock.patch('notifications.outbox.EmailMessage.send', side_effect=OSError('refused')):
+            drain()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), ('PENDING', 'Password: secret'))
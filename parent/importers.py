@@ -0,0 +1,90 @@
+import pandas as pd
+from django.db import transaction
+from django.db.models import Q
+
+from core.importing import ImportReport, check_columns, check_duplicates, check_emails, check_text_columns, row_numbers, text_column
+from parent.models import Parent
+from school.versions import bump_school_version
+from student.models import Student
+from users.provisioning import prepare_accounts, save_accounts
+
+
+class ParentImporter:
+    """
+    Imports a parent sheet for a school, linking each parent to a student by student_id.
+
+    Students and existing parents are resolved with one query each, so the
+    number of queries does not grow with the number of rows.
+    """
+    REQUIRED_COLUMNS = ['student_id', 'first_name', 'last_name', 'email', 'phone']
+    BATCH_SIZE = 500
+
+    def __init__(self, school, batch_size=BATCH_SIZE):
+        self.school = school
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self.unmatched_student_ids = []
+        self._seen = {'stu_id': set(), 'email': set()}
+
+    def run(self, df, offset=0, progress=None):
+        """
+        Validate and insert the rows of `df`; `offset` is the number of rows already
+        imported. `progress(rows_read)` is called in the transaction that inserts them.
+        """
+        check_columns(df, self.REQUIRED_COLUMNS)
+        rows = row_numbers(df, offset)
+        data = pd.DataFrame({column: text_column(df[column]) for column in self.REQUIRED_COLUMNS})
+        data = data.rename(columns={'student_id': 'stu_id'})
+        data['email'] = data['email'].str.lower()
+
+        check_text_columns(self.report, Parent, data, rows)
+        check_emails(self.report, data, rows)
+        check_duplicates(self.report, data, rows, 'stu_id', self._seen['stu_id'])
+        check_duplicates(self.report, data, rows, 'email', self._seen['email'])
+
+        # Resolve every student_id in the sheet with one query scoped to the school
+        stu_ids = data['stu_id']
+        students = dict(
+            Student.objects.filter(school=self.school, student_id__in=list(stu_ids.dropna().unique()))
+            .values_list('student_id', 'id')
+        )
+        unmatched = stu_ids.notna() & ~stu_ids.isin(students.keys())
+        self.report.add_errors(rows[unmatched], 'student_id', "No student with this student_id in this school.")
+        self.unmatched_student_ids.extend(stu_ids[unmatched].unique())
+
+        emails = data['email']
+        existing = Parent.objects.filter(
+            Q(email__in=list(emails.dropna().unique())) | Q(stu_id__in=list(stu_ids.dropna().unique()))
+        ).values_list('email', 'stu_id')
+        existing_emails = {email for email, _ in existing}
+        existing_stu_ids = {stu_id for _, stu_id in existing}
+        self.report.add_errors(rows[emails.isin(existing_emails)], 'email', "A parent with this email already exists.")
+        self.report.add_errors(rows[stu_ids.isin(existing_stu_ids)], 'student_id', "A parent is already registered for this student.")
+
+        valid = ~rows.map(self.report.has_error)
+        parents = [
+            Parent(
+                stu_id=row.stu_id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                email=row.email,
+                phone=row.phone,
+                student_id=students[row.stu_id],
+                school=self.school,
+            )
+            for row in data[valid].itertuples(index=False)
+        ]
+
+        # Hash passwords before taking the write lock, so other writers aren't kept waiting
+        accounts = prepare_accounts(parents, 'PARENT')
+        with transaction.atomic():
+            Parent.objects.bulk_create(parents, batch_size=self.batch_size)
+            save_accounts(accounts)
+            bump_school_version(self.school.id)  # bulk_create sends no post_save signals
+            self.report.created += len(parents)
+            if progress:
+                progress(offset + len(df))
+        return self.report
+
+    def as_dict(self):
+        return {**self.report.as_dict(), 'unmatched_student_ids': self.unmatched_student_ids}
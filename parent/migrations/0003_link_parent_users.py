@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def link_users(apps, schema_editor):
+    # Until now a parent and its login account were only matched by email
+    Parent = apps.get_model('parent', 'Parent')
+    User = apps.get_model('users', 'User')
+    db_alias = schema_editor.connection.alias
+
+    user_ids = dict(User.objects.using(db_alias).filter(role='PARENT').exclude(email='').values_list('email', 'id'))
+    profiles = [profile for profile in Parent.objects.using(db_alias).filter(user__isnull=True) if profile.email in user_ids]
+    for profile in profiles:
+        profile.user_id = user_ids[profile.email]
+    Parent.objects.using(db_alias).bulk_update(profiles, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parent', '0002_parent_user'),
+        ('users', '0003_user_email_index_and_unique_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_users, migrations.RunPython.noop),
+    ]
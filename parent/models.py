@@ -1,5 +1,5 @@
 from django.db import models
-from django.core.mail import send_mail
+from notifications.outbox import build_email
 from school.models import School
 from student.models import Student
 import random
@@ -16,6 +16,7 @@ class Parent(models.Model):
     
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='studentss')
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='studentss')
+    user = models.OneToOneField(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='parent_profile')  # Login account, set by create_user_account
 
     def __str__(self):
         return f'{self.first_name} {self.last_name} - {self.school.name}'
@@ -33,24 +34,27 @@ class Parent(models.Model):
         # Generate a random password
         characters = string.ascii_letters + string.digits + string.punctuation
         return ''.join(random.choice(characters) for _ in range(length))
-    def send_credentials_via_email(self,username,password):
+    def credentials_email(self, username, password):
+        # Build (but don't queue) the credentials email, so bulk imports can queue many at once
         subject = 'Your Parent Account Credentials'
         message = f'Hello {self.first_name},\n\nYour account has been created successfully.\n\nUsername: {username}\nPassword: {password}\n\nPlease keep your credentials safe.'
         recipient_list = [self.email]
+        return build_email(subject, message, self.school.email, recipient_list)
 
-        # Send the email
-        send_mail(subject, message, self.school.email, recipient_list)
+    def send_credentials_via_email(self,username,password):
+        # Queue the email; it is delivered by the outbox worker once the transaction commits
+        self.credentials_email(username, password).save()
 
     def create_user_account(self):
         # Generate a username and password
         username = self.generate_username()
         password = self.generate_password()
 
-        # Create a user in the User model
+        # Create a user in the User model, or reuse the one this email already has for the role
         user, created = User.objects.get_or_create(
-            username=username,
             email=self.email,
-            role='PARENT'
+            role='PARENT',
+            defaults={'username': username},
         )
 
         # If the user was newly created, set the password and save
@@ -61,9 +65,10 @@ class Parent(models.Model):
         
         # Save the user with the hashed password
         user.save()
+        self.user = user
 
         # Send credentials via email
-        self.send_credentials_via_email(username,password)
+        self.send_credentials_via_email(user.username,password)
 
         # Save the school instance with the generated username and password
         self.save()
\ No newline at end of file
@@ -4,4 +4,5 @@ from rest_framework import serializers
 class ParentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Parent
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+        read_only_fields = ['user']
\ No newline at end of file
@@ -1,3 +1,64 @@
-from django.test import TestCase
+import pandas as pd
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from core.testing import create_parent, create_school, create_section, create_student
+from notifications.models import OutboxEmail
+from parent.importers import ParentImporter
+from parent.models import Parent
+
+
+def parent_sheet(rows):
+    return pd.DataFrame(rows, columns=ParentImporter.REQUIRED_COLUMNS)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ParentImporterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        for n in range(22):
+            create_student(section, student_id=f'P{n}')
+        cls.with_parent = create_student(section, student_id='HAS-PARENT')
+        cls.existing = create_parent(cls.with_parent)
+        create_student(create_section(create_school()), student_id='ELSEWHERE')
+
+    def test_invalid_and_unmatched_rows_are_reported(self):
+        importer = ParentImporter(self.school)
+        importer.run(parent_sheet([
+            ['P0', 'Abel', 'Kebede', 'Abel@Example.com', '0911'],
+            ['P1', 'Sara', 'Alemu', 'not-an-email', '0912'],
+            ['P2', 'Hana', 'Bekele', 'abel@example.com', '0913'],
+            ['MISSING', 'Liya', 'Girma', 'liya@example.com', '0914'],
+            ['ELSEWHERE', 'Dawit', 'Haile', 'dawit@example.com', '0915'],
+            ['HAS-PARENT', 'Meron', 'Tesfaye', 'meron@example.com', '0916'],
+            ['P3', 'Yonas', 'Tadesse', self.existing.email, '0917'],
+        ]))
+
+        self.assertEqual(importer.as_dict(), {
+            'created': 1,
+            'failed': 6,
+            'errors': [
+                {'row': 3, 'errors': {'email': ["Enter a valid email address."]}},
+                {'row': 4, 'errors': {'email': ["Duplicate email in the uploaded file."]}},
+                {'row': 5, 'errors': {'student_id': ["No student with this student_id in this school."]}},
+                {'row': 6, 'errors': {'student_id': ["No student with this student_id in this school."]}},
+                {'row': 7, 'errors': {'student_id': ["A parent is already registered for this student."]}},
+                {'row': 8, 'errors': {'email': ["A parent with this email already exists."]}},
+            ],
+            'unmatched_student_ids': ['MISSING', 'ELSEWHERE'],
+        })
+        parent = Parent.objects.select_related('user').get(stu_id='P0')
+        self.assertEqual((parent.email, parent.student.student_id), ('abel@example.com', 'P0'))
+        self.assertEqual((parent.user.email, parent.user.role), ('abel@example.com', 'PARENT'))
+        self.assertEqual(OutboxEmail.objects.get().recipients, ['abel@example.com'])
+
+    def test_query_count_does_not_grow_with_the_sheet(self):
+        for size, first in ((2, 0), (20, 2)):
+            # Distinct first names, so no generated username can clash and cost a retry query
+            rows = [[f'P{n}', f'Name{n}', 'Last', f'p{n}@example.com', '0911'] for n in range(first, first + size)]
+            rows[-1][0] = 'MISSING'
+            with self.subTest(rows=size), self.assertNumQueries(12):
+                importer = ParentImporter(self.school)
+                report = importer.run(parent_sheet(rows))
+            self.assertEqual((report.created, report.failed), (size - 1, 1))
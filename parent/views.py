@@ -6,13 +6,13 @@ from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.views import APIView
-import pandas as pd
+from core.importing import SpreadsheetError
+from imports.jobs import enqueue_import
+from imports.views import import_accepted
 from rest_framework.parsers import MultiPartParser
 from django.db import transaction, IntegrityError
 
 from school.models import School
-from student.models import Student
-from student.serializers import StudentSerializer
 
 class ParentViewSet(viewsets.ModelViewSet):
     queryset = Parent.objects.all()
@@ -59,39 +59,9 @@ class ParentViewSet(viewsets.ModelViewSet):
             return Response({"error": "School not found."}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            # Read the Excel file into a pandas DataFrame
-            df = pd.read_excel(file)
-
-            # Iterate over the rows in the DataFrame and create Parent records
-            for index, row in df.iterrows():
-                stu_id = row.get('student_id')
-
-                # Retrieve the student instance using the `student_id` field
-                try:
-                    student = Student.objects.get(student_id=stu_id)
-                except Student.DoesNotExist:
-                    continue  # Skip if student not found
-
-                parent_data = {
-                    'first_name': row.get('first_name'),
-                    'last_name': row.get('last_name'),
-                    'email': row.get('email'),
-                    'phone': row.get('phone'),
-                    'stu_id': row.get('student_id'),
-                    'student': student.id,  # Assign the student to the parent
-                    'school': school.id  # Assign the school to the parent
-                }
-
-                # Validate and create the parent instance
-                serializer = ParentSerializer(data=parent_data)
-                if serializer.is_valid():
-                    parent = serializer.save()
-                    parent.create_user_account()
-                else:
-                    # Log or handle the error as needed
-                    continue
-
-            return Response({"message": "Parents imported successfully."}, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
+            # Parsing, validation, inserts and account emails happen in the import worker
+            job = enqueue_import('PARENTS', file, school, user_id=request.user.pk)
+        except SpreadsheetError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return import_accepted(request, job, 'parent')
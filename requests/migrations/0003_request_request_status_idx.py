@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests', '0002_alter_request_status'),
+        ('school', '0005_link_school_users'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['status'], name='request_status_idx'),
+        ),
+    ]
@@ -10,6 +10,12 @@ class Request(models.Model):
     ]
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
 
+    class Meta:
+        indexes = [
+            # The list is filtered by ?status=; SQLite stores the id in the index, so pages come in key order
+            models.Index(fields=['status'], name='request_status_idx'),
+        ]
+
     def __str__(self):
         return f"Request {self.id} for School {self.school.name} - Status: {self.status}"
 
@@ -1,3 +1,34 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from core.testing import create_school
+from notifications.models import OutboxEmail
+from requests.models import Request
+
+
+class RequestEmailTests(TestCase):
+    def setUp(self):
+        self.school = create_school(account=False)
+        self.request = Request.objects.create(school=self.school)
+
+    def approve(self):
+        return self.client.put(reverse('request-approve-request', args=[self.request.pk]))
+
+    def test_approving_creates_the_account_and_queues_the_credentials(self):
+        self.assertEqual(self.approve().status_code, 200)
+
+        self.school.refresh_from_db()
+        self.assertEqual((self.school.user.email, self.school.user.role), (self.school.email, 'SCHOOL'))
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.recipients, email.status), ([self.school.email], 'PENDING'))
+        self.assertIn(f'Username: {self.school.user.username}', email.body)
+
+    def test_a_request_is_approved_once(self):
+        self.approve()
+        self.assertEqual(self.approve().status_code, 400)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_cancelling_queues_a_notice(self):
+        response = self.client.put(reverse('request-cancel-request', args=[self.request.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(OutboxEmail.objects.get().subject, 'Registration Canceled')
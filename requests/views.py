@@ -4,13 +4,20 @@ from rest_framework.response import Response
 from .models import Request, School
 from .serializers import RequestSerializer
 from django.db import transaction
-from django.core.mail import send_mail  # For sending email
+from notifications.outbox import enqueue_email  # Queued and sent by the outbox worker
 from django.conf import settings  # To access email configurations
 
 class RequestViewSet(viewsets.ModelViewSet):
     queryset = Request.objects.all()
     serializer_class = RequestSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter.upper())
+        return queryset
+
     @action(detail=True, methods=['put'], url_path='approve')
     def approve_request(self, request, pk=None):
         try:
@@ -61,11 +68,10 @@ class RequestViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Request not found.'}, status=status.HTTP_404_NOT_FOUND)
 
     def send_cancellation_email(self, school):
-        # Use Django's send_mail function to send an email
-        send_mail(
+        # Queue the email in the same transaction as the cancellation
+        enqueue_email(
             subject='Registration Canceled',
             message=f'Dear {school.name},\n\nYour school registration has been canceled. If you have any questions, feel free to contact us.\n\nBest regards,\nThe Team',
             from_email=settings.DEFAULT_FROM_EMAIL,  # Make sure this is set in your settings.py
             recipient_list=[school.email],  # Send the email to the school's email address
-            fail_silently=False,
         )
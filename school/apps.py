@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SchoolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'school'
+
+    def ready(self):
+        # Keep the cached school structure and the schools' versions in sync with their records
+        from school import signals  # noqa: F401
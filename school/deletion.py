@@ -0,0 +1,121 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from attendance.models import (
+    RosterEntry, SectionAttendance, SectionAttendanceSummary, SectionRoster, StudentAttendanceSummary,
+)
+from grade.models import Grade
+from gradebook.models import Assessment, Score
+from imports.models import ImportJob
+from parent.models import Parent
+from requests.models import Request
+from school.models import School
+from school.structure import invalidate_school_structure
+from school.versions import bump_school_versions
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+from users.models import User
+
+
+def deletion_plan(school_ids):
+    """
+    (model, filter) pairs covering every row that belongs to `school_ids`, children
+    before parents, so rows can be deleted without Django's cascade collector.
+    Add new tables that reference school data here.
+    """
+    return [
+        (User, Q(id__in=School.objects.filter(id__in=school_ids).values('user_id'))),
+        (User, Q(id__in=Teacher.objects.filter(school_id__in=school_ids).values('user_id'))),
+        (User, Q(id__in=Parent.objects.filter(school_id__in=school_ids).values('user_id'))),
+        (TeacherSectionSubject, Q(teacher__school_id__in=school_ids) | Q(section__grade__school_id__in=school_ids) | Q(subject__school_id__in=school_ids)),
+        (Parent, Q(school_id__in=school_ids) | Q(student__school_id__in=school_ids)),
+        (ImportJob, Q(school_id__in=school_ids) | Q(section__grade__school_id__in=school_ids)),
+        (Score, Q(assessment__section__grade__school_id__in=school_ids) | Q(student__school_id__in=school_ids)),
+        (Assessment, Q(section__grade__school_id__in=school_ids) | Q(subject__school_id__in=school_ids)),
+        (StudentAttendanceSummary, Q(student__school_id__in=school_ids)),
+        (SectionAttendanceSummary, Q(section__grade__school_id__in=school_ids)),
+        (RosterEntry, Q(roster__section__grade__school_id__in=school_ids) | Q(student__school_id__in=school_ids)),
+        (SectionAttendance, Q(section__grade__school_id__in=school_ids)),
+        (SectionRoster, Q(section__grade__school_id__in=school_ids)),
+        (Student, Q(school_id__in=school_ids) | Q(section__grade__school_id__in=school_ids)),
+        (Teacher, Q(school_id__in=school_ids)),
+        (Section, Q(grade__school_id__in=school_ids)),
+        (Grade, Q(school_id__in=school_ids)),
+        (Subject, Q(school_id__in=school_ids)),
+        (Request, Q(school_id__in=school_ids)),
+        (School, Q(id__in=school_ids)),
+    ]
+
+
+def count_rows(school_ids):
+    return sum(model.objects.filter(q).count() for model, q in deletion_plan(school_ids))
+
+
+def delete_chunk(model, ids):
+    queryset = model.objects.filter(pk__in=ids)
+    if model is User:
+        # Users have third-party relations (token blacklist, admin log), so let Django cascade them
+        queryset.delete()
+    else:
+        # The plan already removed every dependent row, so skip the collector and delete by primary key
+        queryset._raw_delete(queryset.db)
+
+
+def delete_schools(school_ids, chunk_size=None, progress=None):
+    """
+    Delete the schools in `school_ids` and everything that belongs to them.
+
+    Each table is emptied with `DELETE ... WHERE id IN (...)` statements of at most
+    `chunk_size` rows, each in its own short transaction, so the write lock is
+    released between chunks. `progress(table, deleted)` is called after each chunk.
+    Returns the number of rows deleted.
+    """
+    school_ids = list(school_ids)
+    chunk_size = chunk_size or settings.SCHOOL_DELETION_CHUNK_SIZE
+    total = 0
+
+    for model, q in deletion_plan(school_ids):
+        while True:
+            ids = list(model.objects.filter(q).values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                delete_chunk(model, ids)
+            total += len(ids)
+            if progress:
+                progress(model._meta.db_table, len(ids))
+
+    # Raw deletes send no signals
+    for school_id in school_ids:
+        invalidate_school_structure(school_id)
+    bump_school_versions(school_ids)
+    return total
+
+
+def run_deletion_job(job):
+    """Run a SchoolDeletionJob to completion, recording its progress as it goes."""
+    job.status = 'RUNNING'
+    job.started_at = timezone.now()
+    job.total_rows = count_rows(job.school_ids)
+    job.save(update_fields=['status', 'started_at', 'total_rows'])
+
+    def progress(table, deleted):
+        job.current_table = table
+        job.deleted_rows += deleted
+        job.save(update_fields=['current_table', 'deleted_rows'])
+
+    try:
+        delete_schools(job.school_ids, progress=progress)
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+    else:
+        job.status = 'DONE'
+        job.current_table = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'current_table', 'finished_at'])
+    return job
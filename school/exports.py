@@ -0,0 +1,83 @@
+import csv
+import io
+
+from parent.models import Parent
+from student.models import Student
+from teacher.models import Teacher, TeacherSectionSubject
+
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched from the database per round trip
+ROWS_PER_WRITE = 500  # Rows encoded into each chunk of the response
+
+# name -> (model, school filter, [(CSV header, values_list field)])
+EXPORTS = {
+    'students': (Student, 'school_id', [
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('age', 'age'),
+        ('gender', 'gender'),
+        ('grade', 'section__grade__grade_name'),
+        ('section', 'section__section'),
+    ]),
+    'teachers': (Teacher, 'school_id', [
+        ('id', 'id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+    ]),
+    'parents': (Parent, 'school_id', [
+        ('id', 'id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('student_id', 'stu_id'),
+    ]),
+    'assignments': (TeacherSectionSubject, 'teacher__school_id', [
+        ('id', 'id'),
+        ('teacher_id', 'teacher_id'),
+        ('teacher_first_name', 'teacher__first_name'),
+        ('teacher_last_name', 'teacher__last_name'),
+        ('grade', 'section__grade__grade_name'),
+        ('section', 'section__section'),
+        ('subject', 'subject__subject'),
+    ]),
+}
+
+
+def export_rows(name, school_id):
+    """Tuples for export `name`, fetched from the database EXPORT_CHUNK_SIZE rows at a time."""
+    model, school_field, columns = EXPORTS[name]
+    queryset = model.objects.filter(**{school_field: school_id}).order_by('id')
+    return queryset.values_list(*[field for _, field in columns]).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(name, school_id):
+    """
+    Yield export `name` as CSV text. The header goes out before the query runs, so
+    the first byte doesn't wait on the database; after that each chunk holds
+    ROWS_PER_WRITE rows and memory stays flat whatever the size of the school.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow([header for header, _ in EXPORTS[name][2]])
+    yield flush()
+
+    pending = 0
+    for row in export_rows(name, school_id):
+        writer.writerow(row)
+        pending += 1
+        if pending == ROWS_PER_WRITE:
+            yield flush()
+            pending = 0
+    if pending:
+        yield flush()
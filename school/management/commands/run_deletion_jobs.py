@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from school.deletion import run_deletion_job
+from school.models import SchoolDeletionJob
+
+
+class Command(BaseCommand):
+    help = "Run pending school deletion jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new jobs instead of exiting.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to wait between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            for job in SchoolDeletionJob.objects.filter(status='PENDING').order_by('id'):
+                # Claim the job so a second worker doesn't pick it up too
+                if not SchoolDeletionJob.objects.filter(pk=job.pk, status='PENDING').update(status='RUNNING'):
+                    continue
+                job = run_deletion_job(job)
+                self.stdout.write(f"Job {job.id}: {job.status}, {job.deleted_rows} row(s) deleted.")
+
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
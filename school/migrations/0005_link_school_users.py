@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def link_users(apps, schema_editor):
+    # Until now a school and its login account were only matched by email
+    School = apps.get_model('school', 'School')
+    User = apps.get_model('users', 'User')
+    db_alias = schema_editor.connection.alias
+
+    user_ids = dict(User.objects.using(db_alias).filter(role='SCHOOL').exclude(email='').values_list('email', 'id'))
+    profiles = [profile for profile in School.objects.using(db_alias).filter(user__isnull=True) if profile.email in user_ids]
+    for profile in profiles:
+        profile.user_id = user_ids[profile.email]
+    School.objects.using(db_alias).bulk_update(profiles, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0004_school_user'),
+        ('users', '0003_user_email_index_and_unique_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0005_link_school_users'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolVersion',
+            fields=[
+                ('school_id', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('modified_at', models.DateTimeField()),
+            ],
+        ),
+    ]
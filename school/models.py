@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from notifications.outbox import build_email
 from django.conf import settings
 from django.utils import timezone
 import random
@@ -13,6 +13,7 @@ class School(models.Model):
     address = models.CharField(max_length=255)
     phone = models.CharField(max_length=15)
     email = models.EmailField(unique=True)
+    user = models.OneToOneField(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='school_profile')  # Login account, set by create_user_account
 
     def __str__(self):
         return self.name
@@ -27,24 +28,27 @@ class School(models.Model):
         # Generate a random password
         characters = string.ascii_letters + string.digits + string.punctuation
         return ''.join(random.choice(characters) for _ in range(length))
-    def send_credentials_via_email(self,username,password):
+    def credentials_email(self, username, password):
+        # Build (but don't queue) the credentials email, so bulk imports can queue many at once
         subject = 'Your School Account Credentials'
         message = f'Hello {self.name},\n\nYour account has been created successfully.\n\nUsername: {username}\nPassword: {password}\n\nPlease keep your credentials safe.'
         recipient_list = [self.email]
+        return build_email(subject, message, settings.DEFAULT_FROM_EMAIL, recipient_list)
 
-        # Send the email
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipient_list)
+    def send_credentials_via_email(self,username,password):
+        # Queue the email; it is delivered by the outbox worker once the transaction commits
+        self.credentials_email(username, password).save()
 
     def create_user_account(self):
         # Generate a username and password
         username = self.generate_username()
         password = self.generate_password()
 
-        # Create a user in the User model
+        # Create a user in the User model, or reuse the one this email already has for the role
         user, created = User.objects.get_or_create(
-            username=username,
             email=self.email,
-            role='SCHOOL'
+            role='SCHOOL',
+            defaults={'username': username},
         )
 
         # If the user was newly created, set the password and save
@@ -55,9 +59,45 @@ class School(models.Model):
         
         # Save the user with the hashed password
         user.save()
+        self.user = user
 
         # Send credentials via email
-        self.send_credentials_via_email(username,password)
+        self.send_credentials_via_email(user.username,password)
 
         # Save the school instance with the generated username and password
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+class SchoolDeletionJob(models.Model):
+    """Background deletion of one or more schools, run by `python manage.py run_deletion_jobs`."""
+    STATUS_CHOICES = [
+        ('PENDING', 'PENDING'),
+        ('RUNNING', 'RUNNING'),
+        ('DONE', 'DONE'),
+        ('FAILED', 'FAILED'),
+    ]
+    school_ids = models.JSONField(default=list)  # Not a FK: the schools are gone once the job is done
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.PositiveIntegerField(default=0)
+    deleted_rows = models.PositiveIntegerField(default=0)
+    current_table = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Deletion job {self.id} - {self.status}'
+
+
+class SchoolVersion(models.Model):
+    """
+    Change counter of a school's records, bumped by school.versions.bump_school_version.
+    Not a FK: the counter outlives the school, so a recycled id never repeats a version.
+    """
+    school_id = models.PositiveBigIntegerField(primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'School {self.school_id} version {self.version}'
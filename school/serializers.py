@@ -1,8 +1,13 @@
 # school/serializers.py
 from rest_framework import serializers
-from .models import School
+from .models import School, SchoolDeletionJob
 
 class SchoolSerializer(serializers.ModelSerializer):
     class Meta:
         model = School
-        fields = ['id', 'name', 'address', 'phone', 'email'] 
+        fields = ['id', 'name', 'address', 'phone', 'email']
+
+class SchoolDeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SchoolDeletionJob
+        fields = ['id', 'school_ids', 'status', 'total_rows', 'deleted_rows', 'current_table', 'error', 'created_at', 'started_at', 'finished_at']
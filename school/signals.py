@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.transactions import collect_on_commit
+from grade.models import Grade
+from parent.models import Parent
+from school.models import School
+from school.structure import invalidate_school_structure
+from school.versions import bump_school_version
+from section.models import Section
+from student.models import Student
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+
+
+@receiver([post_save, post_delete], sender=Grade)
+@receiver([post_save, post_delete], sender=Subject)
+@receiver([post_save, post_delete], sender=Teacher)
+def school_child_changed(sender, instance, **kwargs):
+    touch_schools([instance.school_id])
+
+
+def touch_schools(school_ids):
+    for school_id in school_ids:
+        invalidate_school_structure(school_id)
+        bump_school_version(school_id)
+
+
+def touch_parent_school(instance, field, model):
+    """
+    touch_schools() for the school of `instance`'s `field` row (a grade or teacher). Unless
+    that row is already loaded, its school is looked up on commit, in one query for every
+    row the transaction changed, rather than loading the row for each one.
+    """
+    if getattr(type(instance), field).is_cached(instance):
+        touch_schools([getattr(instance, field).school_id])
+        return
+    collect_on_commit(
+        f'{model._meta.label}-schools', [getattr(instance, f'{field}_id')],
+        lambda ids: touch_schools(model.objects.filter(pk__in=ids).values_list('school_id', flat=True).distinct()),
+    )
+
+
+@receiver([post_save, post_delete], sender=Section)
+def section_changed(sender, instance, **kwargs):
+    touch_parent_school(instance, 'grade', Grade)
+
+
+@receiver([post_save, post_delete], sender=TeacherSectionSubject)
+def assignment_changed(sender, instance, **kwargs):
+    touch_parent_school(instance, 'teacher', Teacher)
+
+
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Parent)
+def roster_changed(sender, instance, **kwargs):
+    # Not part of the cached structure, but of the school's ETags
+    bump_school_version(instance.school_id)
+
+
+@receiver([post_save, post_delete], sender=School)
+def school_changed(sender, instance, **kwargs):
+    bump_school_version(instance.id)
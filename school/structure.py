@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from grade.models import Grade
+from section.models import Section
+from subject.models import Subject
+from teacher.models import Teacher, TeacherSectionSubject
+
+STRUCTURE_CACHE_TIMEOUT = 60 * 60
+
+
+def structure_cache_key(school_id):
+    return f'school-structure:{school_id}'
+
+
+def build_school_structure(school):
+    """
+    Nested grades -> sections -> assignments for a school, plus its subjects and teachers.
+
+    Always five queries, whatever the size of the school.
+    """
+    grades = list(Grade.objects.filter(school=school).order_by('id').values('id', 'grade_name'))
+    sections = Section.objects.filter(grade__school=school).order_by('id').values('id', 'section', 'grade_id')
+    subjects = list(Subject.objects.filter(school=school).order_by('id').values('id', 'subject'))
+    teachers = list(Teacher.objects.filter(school=school).order_by('id').values('id', 'first_name', 'last_name', 'email'))
+    assignments = (
+        TeacherSectionSubject.objects.filter(section__grade__school=school)
+        .order_by('id')
+        .values('id', 'section_id', 'subject_id', 'teacher_id')
+    )
+
+    subject_names = {subject['id']: subject['subject'] for subject in subjects}
+    teacher_names = {teacher['id']: teacher['first_name'] for teacher in teachers}
+
+    sections_by_id = {}
+    for grade in grades:
+        grade['sections'] = []
+    grades_by_id = {grade['id']: grade for grade in grades}
+    for section in sections:
+        section['assignments'] = []
+        grades_by_id[section.pop('grade_id')]['sections'].append(section)
+        sections_by_id[section['id']] = section
+
+    for assignment in assignments:
+        sections_by_id[assignment['section_id']]['assignments'].append({
+            'id': assignment['id'],
+            'subject_id': assignment['subject_id'],
+            'subject': subject_names.get(assignment['subject_id']),
+            'teacher_id': assignment['teacher_id'],
+            'teacher': teacher_names.get(assignment['teacher_id']),
+        })
+
+    return {
+        'id': school.id,
+        'name': school.name,
+        'grades': grades,
+        'subjects': subjects,
+        'teachers': teachers,
+    }
+
+
+def get_cached_structure(school_id):
+    return cache.get(structure_cache_key(school_id))
+
+
+def cache_structure(school_id, structure):
+    cache.set(structure_cache_key(school_id), structure, STRUCTURE_CACHE_TIMEOUT)
+
+
+def invalidate_school_structure(school_id):
+    # Drop the entry once the change is committed, so a concurrent reader can't re-cache stale data
+    transaction.on_commit(lambda: cache.delete(structure_cache_key(school_id)))
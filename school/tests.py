@@ -1,3 +1,279 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from attendance.recording import record_attendance
+from core.endpoints import client_for
+from core.testing import (
+    assign, create_assessment, create_grade, create_parent, create_school, create_section, create_student, create_subject,
+    create_teacher,
+)
+from school.deletion import count_rows
+from school.exports import stream_csv
+from school.models import School, SchoolDeletionJob, SchoolVersion
+from section.models import Section
+from student.models import Student
+
+
+def build_school(students):
+    """A school of two grades, each with a section of `students` students, a parent, an assessment and a day of attendance."""
+    school = create_school()
+    subject = create_subject(school)
+    teacher = create_teacher(school)
+    for grade in (create_grade(school), create_grade(school)):
+        section = create_section(grade=grade)
+        assign(teacher, section, subject)
+        pupils = [create_student(section) for _ in range(students)]
+        create_parent(pupils[0])
+        create_assessment(section, subject, scores=[(pupil, 50) for pupil in pupils])
+        record_attendance(section, datetime.date(2026, 10, 5), {})
+    return school
+
+
+def school_version(school):
+    return SchoolVersion.objects.filter(school_id=school.pk).values_list('version', flat=True).first() or 0
+
+
+class StructureTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school(name='Central')
+        cls.grade = create_grade(cls.school, 'Grade 1')
+        cls.sections = [create_section(grade=cls.grade, name=name) for name in ('A', 'B')]
+        cls.subject = create_subject(cls.school, 'Maths')
+        cls.teacher = create_teacher(cls.school)
+        cls.assignment = assign(cls.teacher, cls.sections[0], cls.subject)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.school.user)
+        self.url = reverse('school-structure', args=[self.school.pk])
+
+    def test_grades_sections_and_assignments_are_nested(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'id': self.school.pk,
+            'name': 'Central',
+            'grades': [{'id': self.grade.pk, 'grade_name': 'Grade 1', 'sections': [
+                {'id': self.sections[0].pk, 'section': 'A', 'assignments': [{
+                    'id': self.assignment.pk, 'subject_id': self.subject.pk, 'subject': 'Maths',
+                    'teacher_id': self.teacher.pk, 'teacher': self.teacher.first_name,
+                }]},
+                {'id': self.sections[1].pk, 'section': 'B', 'assignments': []},
+            ]}],
+            'subjects': [{'id': self.subject.pk, 'subject': 'Maths'}],
+            'teachers': [{'id': self.teacher.pk, 'first_name': self.teacher.first_name, 'last_name': 'Test', 'email': self.teacher.email}],
+        })
+
+    def test_built_once_then_served_from_the_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse([query for query in queries if 'FROM "grade_grade"' in query['sql']])
+
+    def test_changes_show_once_committed(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            subject = create_subject(self.school, 'Physics')
+            assign(self.teacher, self.sections[1], subject)
+        structure = self.client.get(self.url).json()
+        self.assertEqual([subject['subject'] for subject in structure['subjects']], ['Maths', 'Physics'])
+        self.assertEqual([row['subject'] for row in structure['grades'][0]['sections'][1]['assignments']], ['Physics'])
+
+    def test_sections_deleted_in_bulk_look_their_school_up_once(self):
+        self.client.get(self.url)
+        before = school_version(self.school)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            Section.objects.filter(grade__school=self.school).delete()
+        grade_lookups = [query for query in queries if 'FROM "grade_grade"' in query['sql']]
+        self.assertEqual(len(grade_lookups), 1)
+        self.assertGreater(school_version(self.school), before)
+        self.assertEqual(self.client.get(self.url).json()['grades'][0]['sections'], [])
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        grade = create_grade(cls.school, 'Grade 1')
+        cls.section = create_section(grade=grade, name='A')
+        cls.students = [
+            create_student(cls.section, first_name=name, last_name='Doe, Jr.', age=9)
+            for name in ('Ann', 'Ben', 'Cal', 'Dee', 'Eve')
+        ]
+        cls.teacher = create_teacher(cls.school)
+        assign(cls.teacher, cls.section, create_subject(cls.school, 'Maths'))
+
+    def test_streams_the_school_roster_as_csv(self):
+        response = client_for(self.school.user).get(reverse('school-export', args=[self.school.pk, 'students']))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="school-{self.school.pk}-students.csv"')
+
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ['id', 'student_id', 'first_name', 'last_name', 'age', 'gender', 'grade', 'section'])
+        self.assertEqual(rows[1:], [
+            [str(student.pk), student.student_id, student.first_name, 'Doe, Jr.', '9', 'F', 'Grade 1', 'A']
+            for student in self.students
+        ])
+
+        response = client_for(self.school.user).get(reverse('school-export', args=[self.school.pk, 'assignments']))
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[1][1:], [str(self.teacher.pk), self.teacher.first_name, 'Test', 'Grade 1', 'A', 'Maths'])
+
+    def test_header_goes_out_before_the_query_then_rows_in_chunks(self):
+        chunks = stream_csv('students', self.school.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(next(chunks), 'id,student_id,first_name,last_name,age,gender,grade,section\r\n')
+        with mock.patch('school.exports.ROWS_PER_WRITE', 2):
+            self.assertEqual([chunk.count('\n') for chunk in chunks], [2, 2, 1])
+
+    def test_only_the_school_itself_can_export(self):
+        url = reverse('school-export', args=[self.school.pk, 'students'])
+        for user in (self.teacher.user, create_school().user):
+            self.assertEqual(client_for(user).get(url).status_code, 403)
+
+
+class SchoolVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Run the builders' version bumps now, or the tests' own changes join their pending batch
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.school = create_school()
+            section = create_section(cls.school)
+            for _ in range(5):
+                create_student(section)
+
+    def test_bumped_once_per_transaction(self):
+        before = school_version(self.school)
+        with self.captureOnCommitCallbacks(execute=True):
+            for student in Student.objects.filter(school=self.school):
+                student.first_name = 'Renamed'
+                student.save()
+        self.assertEqual(school_version(self.school), before + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.filter(pk__in=Student.objects.filter(school=self.school).values('pk')[:3]).delete()
+        self.assertEqual(school_version(self.school), before + 2)
+
+    def test_rolled_back_changes_are_not_counted(self):
+        before = school_version(self.school)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Student.objects.filter(school=self.school).first().save()
+                transaction.set_rollback(True)
+        self.assertEqual(school_version(self.school), before)
+
+
+class AsyncCollectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        assign(create_teacher(cls.school), section, create_subject(cls.school))
+        create_student(section), create_student(section)
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+
+    def test_async_views_answer_like_the_sync_ones(self):
+        for collection in ('grades', 'school-sections', 'subjects', 'teachers', 'students'):
+            sync = self.client.get(reverse(f'school-get-{collection}', args=[self.school.pk]))
+            async_ = self.client.get(reverse(f'async-school-get-{collection}', args=[self.school.pk]))
+            self.assertEqual(sync.status_code, 200, collection)
+            self.assertEqual((async_.status_code, async_.json()), (sync.status_code, sync.json()), collection)
+
+    def test_missing_school_is_a_json_404(self):
+        response = self.client.get(reverse('async-school-get-grades', args=[0]))
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('detail', response.json())
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.school = create_school()
+            cls.student = create_student(create_section(cls.school))
+            create_teacher(cls.school)
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+
+    def test_unchanged_collection_answers_304_until_the_school_changes(self):
+        for name in ('school-get-students', 'async-school-get-students'):
+            url = reverse(name, args=[self.school.pk])
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etag = response['ETag']
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.student.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_are_checked_after_permissions(self):
+        response = client_for(create_parent(self.student).user).get(reverse('school-get-teachers', args=[self.school.pk]))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class DeleteActionQueryTests(TransactionTestCase):
+    """Run outside a test transaction, so the on-commit version bumps count towards the request."""
+
+    def setUp(self):
+        cache.clear()  # Cached account checks would make the first request of each school differ
+
+    def delete_queries(self, school, action):
+        client = client_for(school.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.delete(reverse(f'school-{action}', args=[school.pk]))
+        self.assertEqual(response.status_code, 204, action)
+        return len(queries)
+
+    def test_bulk_deletes_take_a_fixed_number_of_queries(self):
+        # Parents are deleted with the students, and teachers' assignments with the teachers
+        for action in ('delete-students', 'delete-teachers', 'delete-subjects', 'delete-school-sections', 'delete-grades'):
+            # Both small enough for Django to delete each table's rows in one batch
+            small, large = build_school(students=2), build_school(students=40)
+            self.assertEqual(self.delete_queries(small, action), self.delete_queries(large, action), action)
+
+
+class SchoolDeletionTests(TransactionTestCase):
+    """Outside a test transaction, so each chunk's transaction costs what it does in production."""
+
+    def setUp(self):
+        cache.clear()
+
+    # The defaults' ratio of inline limit to chunk size, so the request runs as many chunks as it can in production
+    @override_settings(SCHOOL_DELETION_CHUNK_SIZE=10, SCHOOL_DELETION_INLINE_LIMIT=100)
+    def test_schools_up_to_the_inline_limit_are_deleted_within_budget(self):
+        school = build_school(students=5)
+        self.assertGreater(count_rows([school.pk]), 80)
+
+        # Strict query budgets turn an over-budget request into a 500
+        response = client_for(school.user).delete(reverse('school-detail', args=[school.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(count_rows([school.pk]), 0)
+
+    @override_settings(SCHOOL_DELETION_INLINE_LIMIT=10)
+    def test_larger_schools_are_left_to_a_job(self):
+        school = build_school(students=1)
+        response = client_for(school.user).delete(reverse('school-detail', args=[school.pk]))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(SchoolDeletionJob.objects.get(pk=response.json()['job_id']).school_ids, [school.pk])
+        self.assertTrue(School.objects.filter(pk=school.pk).exists())
@@ -1,6 +1,7 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import views
 from .views import SchoolViewSet
 
 router = DefaultRouter()
@@ -9,4 +10,9 @@ router.register(r'schools', SchoolViewSet)
 # urlpatterns = router.urls
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/schools/<int:pk>/get-grades/', views.async_get_grades, name='async-school-get-grades'),
+    path('async/schools/<int:pk>/get-school-sections/', views.async_get_school_sections, name='async-school-get-school-sections'),
+    path('async/schools/<int:pk>/get-subjects/', views.async_get_subjects, name='async-school-get-subjects'),
+    path('async/schools/<int:pk>/get-teachers/', views.async_get_teachers, name='async-school-get-teachers'),
+    path('async/schools/<int:pk>/get-students/', views.async_get_students, name='async-school-get-students'),
     ]
\ No newline at end of file
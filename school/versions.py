@@ -0,0 +1,87 @@
+"""
+Conditional GETs for school-scoped endpoints.
+
+Every change to a school's grades, sections, subjects, teachers, students, parents or
+teacher assignments bumps its SchoolVersion (see school/signals.py; bulk writers call
+bump_school_version themselves), once per transaction, when it commits. The ETag of a school-scoped response is derived from
+that counter, so a client's If-None-Match can be answered with a 304 after one
+primary-key lookup, before the collection is queried or serialized.
+"""
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from core.transactions import collect_on_commit
+from school.models import SchoolVersion
+
+
+def bump_school_version(school_id):
+    """
+    Mark everything under the school as changed once the caller's transaction commits.
+    However many rows the transaction touches, each school is bumped once.
+    """
+    if school_id is not None:
+        collect_on_commit('school-versions', [school_id], bump_school_versions)
+
+
+def bump_school_versions(school_ids):
+    now = timezone.now()
+    versions = SchoolVersion.objects.filter(school_id__in=school_ids)
+    if versions.update(version=F('version') + 1, modified_at=now) == len(school_ids):
+        return
+    # Schools never bumped before
+    for school_id in set(school_ids) - set(versions.values_list('school_id', flat=True)):
+        try:
+            with transaction.atomic():
+                SchoolVersion.objects.create(school_id=school_id, version=1, modified_at=now)
+        except IntegrityError:
+            # Created by a concurrent writer in the meantime
+            SchoolVersion.objects.filter(school_id=school_id).update(version=F('version') + 1, modified_at=now)
+
+
+class SchoolValidators:
+    """
+    ETag and Last-Modified of one school-scoped GET. The ETag also covers the path,
+    query string and response format, as each of them gives a different body.
+    """
+
+    def __init__(self, request, school_id, version, modified_at, format):
+        digest = hashlib.sha1(f'{request.get_full_path()}|{format}'.encode()).hexdigest()[:16]
+        # Weak: the body may be re-encoded (e.g. compressed) on the way out
+        self.etag = f'W/"{school_id}-{version}-{digest}"'
+        self.last_modified = int(modified_at.timestamp()) if modified_at else None  # HTTP dates have whole seconds
+
+    @classmethod
+    def lookup(cls, school_id):
+        return SchoolVersion.objects.filter(school_id=school_id).values_list('version', 'modified_at')
+
+    @classmethod
+    def for_request(cls, request, school_id, format='json'):
+        version, modified_at = cls.lookup(school_id).first() or (0, None)
+        return cls(request, school_id, version, modified_at, format)
+
+    @classmethod
+    async def afor_request(cls, request, school_id, format='json'):
+        version, modified_at = await cls.lookup(school_id).afirst() or (0, None)
+        return cls(request, school_id, version, modified_at, format)
+
+    def not_modified(self, request):
+        """The 304 (or 412) response when the request's preconditions say so, else None."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        if response.status_code not in (200, 304):
+            return response
+        response['ETag'] = self.etag
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified)
+        # Clients must revalidate, and shared caches must not serve one user's copy to another
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -1,4 +1,4 @@
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from grade.models import Grade
 from grade.serializers import GradeSerializer
@@ -7,8 +7,11 @@ from rest_framework.permissions import AllowAny
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.db import transaction
 
+from core.asyncviews import async_api_view, paginate
+
 from section.models import Section
 from section.serializers import SectionSerializer
 from student.models import Student
@@ -17,15 +20,39 @@ from subject.models import Subject
 from subject.serializers import SubjectSerializer
 from teacher.models import Teacher
 from teacher.serializers import TeacherSerializer
-from users.models import User
-from .models import School
-from .serializers import SchoolSerializer
+from .deletion import count_rows, delete_schools
+from .exports import EXPORTS, stream_csv
+from .models import School, SchoolDeletionJob
+from .serializers import SchoolDeletionJobSerializer, SchoolSerializer
+from .structure import build_school_structure, cache_structure, get_cached_structure
+from .versions import SchoolValidators
 from requests.models import Request  # Assuming this is your Request model
 
 class SchoolViewSet(viewsets.ModelViewSet):
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
     permission_classes = [AllowAny]  # Adjust based on your needs
+    school_validators = None
+
+    def not_modified(self, pk):
+        """
+        Conditional GET on the school's version: the 304 response when the client's copy
+        is current, else None (the response then gets an ETag in finalize_response).
+        Call it after the permission checks and before any other query.
+        """
+        if not str(pk).isdigit():
+            return None  # get_object() answers 404
+        self.school_validators = SchoolValidators.for_request(self.request, pk, self.request.accepted_renderer.format)
+        return self.school_validators.not_modified(self.request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.school_validators is not None:
+            self.school_validators.apply(response)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.not_modified(kwargs['pk']) or super().retrieve(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         # Use transaction to ensure both School and Request are created together
@@ -45,66 +72,90 @@ class SchoolViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_201_CREATED, headers=headers)
 
     def destroy(self, request, *args, **kwargs):
-        # Override destroy method to delete school, related user and request
+        # Override destroy method to delete the school with its users, requests and all related records
         school = self.get_object()  # Get the school instance
 
-        with transaction.atomic():
-            # Find and delete the associated user by the school's email
-            try:
-                user = User.objects.get(email=school.email)
-                user.delete()  # Delete the corresponding user
-            except User.DoesNotExist:
-                pass  # If no user is found, continue
+        # Small schools are deleted right away, large ones by the background worker
+        if count_rows([school.id]) <= settings.SCHOOL_DELETION_INLINE_LIMIT:
+            delete_schools([school.id])
+            return Response({"message": "School and related records have been deleted."}, status=status.HTTP_204_NO_CONTENT)
 
-            # Delete related requests
-            Request.objects.filter(school=school).delete()
+        job = SchoolDeletionJob.objects.create(school_ids=[school.id])
+        return Response({"message": "School deletion has been scheduled.", "job_id": job.id}, status=status.HTTP_202_ACCEPTED)
 
-            # Delete the school itself
-            school.delete()
-
-        return Response({"message": "School and related records have been deleted."}, status=status.HTTP_204_NO_CONTENT)
     # Add a custom action to retrieve a school by email
     @action(detail=False, methods=['get'], url_path='email=(?P<email>.+)')
     def get_school_by_email(self, request, email=None):
-        print(f"Received email: {email}")  # Print the email for debugging
-
         try:
             school = School.objects.get(email=email)
             serializer = self.get_serializer(school)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except School.DoesNotExist:
-            print("School not found")  # Debug print
             raise Http404("School not found")
     
     @action(detail=False, methods=['delete'], url_path='delete-all')
     def delete_all(self, request):
-        # Perform bulk deletion of all school records and related users and requests
-        with transaction.atomic():
-            for school in School.objects.all():
-                # Find and delete the associated user by the school's email
-                try:
-                    user = User.objects.get(email=school.email)
-                    user.delete()  # Delete the corresponding user
-                except User.DoesNotExist:
-                    pass  # If no user is found, continue
+        # Schedule the deletion of all school records and related users and requests
+        school_ids = list(School.objects.values_list('id', flat=True))
+        if not school_ids:
+            return Response({"message": "There are no schools to delete."}, status=status.HTTP_404_NOT_FOUND)
 
-                # Delete related requests
-                Request.objects.filter(school=school).delete()
+        job = SchoolDeletionJob.objects.create(school_ids=school_ids)
+        return Response({"message": "Deletion of all schools has been scheduled.", "job_id": job.id}, status=status.HTTP_202_ACCEPTED)
 
-            # Delete all schools
-            School.objects.all().delete()
+    @action(detail=False, methods=['get'], url_path=r'deletion-jobs/(?P<job_id>\d+)')
+    def deletion_job(self, request, job_id=None):
+        # Progress of a scheduled school deletion
+        job = get_object_or_404(SchoolDeletionJob, id=job_id)
+        return Response(SchoolDeletionJobSerializer(job).data, status=status.HTTP_200_OK)
 
-        return Response({"message": "All schools and related records have been deleted."}, status=status.HTTP_204_NO_CONTENT)
     @action(detail=True, methods=['get'], url_path='get-grades')
     def get_grades(self, request, pk=None):
+        if response := self.not_modified(pk):
+            return response
         school = self.get_object()  # Get the school instance by pk (school_id)
         grades = Grade.objects.filter(school=school)  # Assuming Grade has ForeignKey to School
 
         if not grades.exists():
             return Response({"message": "No grades found for this school."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = GradeSerializer(grades, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(grades)
+        serializer = GradeSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='structure')
+    def structure(self, request, pk=None):
+        """Grades -> sections -> subject/teacher assignments, plus subjects and teachers, in one response."""
+        user = self.request.user
+        
+        # Ensure that the user is authenticated
+        if not user.is_authenticated:
+            raise PermissionDenied("You need to be authenticated to view the school structure.")
+
+        if response := self.not_modified(pk):
+            return response
+        structure = get_cached_structure(pk)
+        if structure is None:
+            school = self.get_object()
+            structure = build_school_structure(school)
+            cache_structure(school.id, structure)
+        return Response(structure, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path=r'export/(?P<kind>{})'.format('|'.join(EXPORTS)))
+    def export(self, request, pk=None, kind=None):
+        """Stream the school's students, teachers, parents or teacher assignments as CSV."""
+        user = self.request.user
+
+        # Only the school's own account can export its records
+        if not user.is_authenticated or not user.principal.owns_school(pk):
+            raise PermissionDenied("You do not have permission to export this school's records.")
+
+        if response := self.not_modified(pk):
+            return response
+        school = self.get_object()
+        response = StreamingHttpResponse(stream_csv(kind, school.id), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="school-{school.id}-{kind}.csv"'
+        return response
 
     # Additional action to delete all grades for a specific school
     @action(detail=True, methods=['delete'], url_path='delete-grades')
@@ -120,6 +171,8 @@ class SchoolViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'], url_path='get-school-sections')
     def get_school_sections(self, request, pk=None):
+        if response := self.not_modified(pk):
+            return response
         school = self.get_object()  # Get the school instance by pk (school_id)
         grades = Grade.objects.filter(school=school)  # Assuming Grade has ForeignKey to School
         
@@ -127,14 +180,15 @@ class SchoolViewSet(viewsets.ModelViewSet):
             return Response({"message": "No grades found for this school."}, status=status.HTTP_404_NOT_FOUND)
 
         # Filter sections where the grade is in the grades queryset
-        sections = Section.objects.filter(grade__in=grades)
+        sections = Section.objects.filter(grade__in=grades).select_related('grade')
 
         if not sections.exists():
             return Response({"message": "No sections found for this school."}, status=status.HTTP_404_NOT_FOUND)
         
         # Serialize the sections
-        serializer = SectionSerializer(sections, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(sections)
+        serializer = SectionSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['delete'], url_path='delete-school-sections')
     def delete_school_sections(self, request, pk=None):
@@ -145,7 +199,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
             return Response({"message": "No grades found for this school."}, status=status.HTTP_404_NOT_FOUND)
 
         # Filter sections where the grade is in the grades queryset
-        sections = Section.objects.filter(grade__in=grades)
+        sections = Section.objects.filter(grade__in=grades).select_related('grade')
 
         if not sections.exists():
             return Response({"message": "No sections found for this school."}, status=status.HTTP_404_NOT_FOUND)
@@ -156,14 +210,17 @@ class SchoolViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'], url_path='get-subjects')
     def get_subjects(self, request, pk=None):
+        if response := self.not_modified(pk):
+            return response
         school = self.get_object()  # Get the school instance by pk (school_id)
         subjects = Subject.objects.filter(school=school)  # Assuming Subject has ForeignKey to School
 
         if not subjects.exists():
             return Response({"message": "No subjects found for this school."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = SubjectSerializer(subjects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(subjects)
+        serializer = SubjectSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     # Additional action to delete all grades for a specific school
     @action(detail=True, methods=['delete'], url_path='delete-subjects')
@@ -188,14 +245,17 @@ class SchoolViewSet(viewsets.ModelViewSet):
         # Check if the user's role is 'school'
         if user.role != 'SCHOOL':
             raise PermissionDenied("You do not have permission to create a grade.")
+        if response := self.not_modified(pk):
+            return response
         school = self.get_object()  # Get the school instance by pk (school_id)
         teachers = Teacher.objects.filter(school=school)  # Assuming Subject has ForeignKey to School
 
         if not teachers.exists():
             return Response({"message": "No teachers found for this school."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = TeacherSerializer(teachers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(teachers)
+        serializer = TeacherSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     # Additional action to delete all grades for a specific school
     @action(detail=True, methods=['delete'], url_path='delete-teachers')
@@ -225,15 +285,18 @@ class SchoolViewSet(viewsets.ModelViewSet):
         # Ensure that the user is authenticated
         if not user.is_authenticated:
             raise PermissionDenied("You need to be authenticated to view students.")
-        
+
+        if response := self.not_modified(pk):
+            return response
         school = self.get_object()  # Get the school instance by pk (school_id)
         students = Student.objects.filter(school=school) 
 
         if not students.exists():
             return Response({"message": "No students found for this school."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = StudentSerializer(students, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(students)
+        serializer = StudentSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     # Additional action to delete all grades for a specific school
     @action(detail=True, methods=['delete'], url_path='delete-students')
@@ -251,4 +314,48 @@ class SchoolViewSet(viewsets.ModelViewSet):
             return Response({"message": "No students found to delete for this school."}, status=status.HTTP_404_NOT_FOUND)
         
         students.delete()  # Delete all grades for this school
-        return Response({"message": "All students for the school have been deleted."}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response({"message": "All students for the school have been deleted."}, status=status.HTTP_204_NO_CONTENT)
+
+
+# Async versions of the collection reads above, run on the event loop under ASGI (see core/asyncviews.py)
+
+async def school_collection(request, pk, queryset, serializer_class, empty_message):
+    """A keyset page of one of the school's collections, answered with a 304 when the client's copy is current."""
+    validators = await SchoolValidators.afor_request(request, pk)
+    if response := validators.not_modified(request):
+        return response
+    if not await School.objects.filter(pk=pk).aexists():
+        raise Http404("No School matches the given query.")
+    return validators.apply(await paginate(request, queryset, serializer_class, empty_message))
+
+
+@async_api_view
+async def async_get_grades(request, pk):
+    return await school_collection(request, pk, Grade.objects.filter(school_id=pk), GradeSerializer, "No grades found for this school.")
+
+
+@async_api_view
+async def async_get_school_sections(request, pk):
+    sections = Section.objects.filter(grade__school_id=pk).select_related('grade')
+    return await school_collection(request, pk, sections, SectionSerializer, "No sections found for this school.")
+
+
+@async_api_view
+async def async_get_subjects(request, pk):
+    return await school_collection(request, pk, Subject.objects.filter(school_id=pk), SubjectSerializer, "No subjects found for this school.")
+
+
+@async_api_view
+async def async_get_teachers(request, pk):
+    if not request.user.is_authenticated:
+        raise PermissionDenied("You need to be authenticated to view teachers.")
+    if request.user.role != 'SCHOOL':
+        raise PermissionDenied("You do not have permission to view teachers.")
+    return await school_collection(request, pk, Teacher.objects.filter(school_id=pk), TeacherSerializer, "No teachers found for this school.")
+
+
+@async_api_view
+async def async_get_students(request, pk):
+    if not request.user.is_authenticated:
+        raise PermissionDenied("You need to be authenticated to view students.")
+    return await school_collection(request, pk, Student.objects.filter(school_id=pk), StudentSerializer, "No students found for this school.")
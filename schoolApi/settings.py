@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -27,6 +29,8 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['*']
 
+TESTING = 'test' in sys.argv
+
 # settings.py
 AUTH_USER_MODEL = 'users.User'
 
@@ -49,6 +53,11 @@ INSTALLED_APPS = [
     'subject',
     'users',
     'requests',
+    'core',
+    'notifications',
+    'attendance',
+    'gradebook',
+    'imports',
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -74,6 +83,11 @@ EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 DEFAULT_FROM_EMAIL = 'your_email@example.com'
 
+# Outbox delivery (see `python manage.py send_outbox`)
+OUTBOX_BATCH_SIZE = 100  # Emails sent per batch over one connection
+OUTBOX_MAX_ATTEMPTS = 5  # Attempts before an email is marked FAILED
+OUTBOX_RETRY_BACKOFF = 60  # Seconds before the first retry, doubled on each attempt
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -83,16 +97,39 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,  # Set to a secret key
+    'TOKEN_USER_CLASS': 'users.authentication.PrincipalTokenUser',
 }
 
+# Seconds a user's "still exists and is active" check is cached for stateless JWT
+# authentication; None skips the check entirely.
+STATELESS_JWT_USER_CHECK_TTL = 60
+
 # Rest Framework authentication settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from the token claims instead of querying the users table
+        'users.authentication.StatelessJWTAuthentication',
+    ),
+    # Keyset pagination for every list endpoint, see core/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
+    # Same output as DRF's JSONRenderer, serialized by JSON_RENDERER_BACKEND, see core/renderers.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',  # Login attempts per client IP
+        'login_account': '10/min',  # Login attempts per email
+    },
 }
 
+# 'orjson' (used when installed, else the stdlib) or 'json'
+JSON_RENDERER_BACKEND = 'orjson'
+
 MIDDLEWARE = [
+    'core.instrumentation.QueryInstrumentationMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -102,6 +139,83 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-view query budgets, keyed by URL name (optionally prefixed with the HTTP method,
+# e.g. 'DELETE school-detail'); 'default' applies to every other API view.
+# 'queries' caps the number of queries and 'db_ms' the total time spent in the database.
+# Over-budget requests raise in DEBUG and under `manage.py test`, and log a warning otherwise.
+QUERY_BUDGET_STRICT = DEBUG or TESTING
+QUERY_BUDGETS = {
+    'default': {'queries': 20},
+    # Each includes the school version lookup of the conditional GET (see school/versions.py)
+    'school-get-school-sections': {'queries': 6},
+    'school-get-students': {'queries': 5},
+    'school-get-teachers': {'queries': 5},
+    'section-get-subject-and-teachers': {'queries': 3},
+    'students-get-teacher-subject': {'queries': 3},
+    'GET section-attendance': {'queries': 5},
+    # Roster snapshot plus summary updates: one statement per (old, new) state pair, not per student
+    'POST section-attendance': {'queries': 30},
+    'student-attendance': {'queries': 5},
+    # Inline school deletion: about 45 queries to count and find the rows, then 4 per chunk of
+    # SCHOOL_DELETION_CHUNK_SIZE rows (13 for users); SCHOOL_DELETION_INLINE_LIMIT caps the chunks
+    'DELETE school-detail': {'queries': 200},
+    # Bulk deletes: 12 to 35 queries, a fixed number per dependent table, plus one per further
+    # 100 rows Django collects (it deletes them in batches); school/tests.py checks they don't grow per row
+    'school-delete-students': {'queries': 25},
+    'school-delete-teachers': {'queries': 20},
+    'school-delete-subjects': {'queries': 25},
+    'school-delete-school-sections': {'queries': 50},
+    'school-delete-grades': {'queries': 50},
+    # Cascading deletes of a section's or grade's students, rosters, attendance and scores: about 25
+    # queries at any size up to 100 rows per table, plus one per further 100 rows (attendance/tests.py)
+    'grade-delete-sections': {'queries': 40},
+    'DELETE grade-detail': {'queries': 40},
+    'DELETE section-detail': {'queries': 40},
+}
+
+# Response compression (see core/compression.py), keyed by URL name like QUERY_BUDGETS.
+# Entries are merged over 'default'; None turns compression off for the view.
+# 'encodings' are in order of preference; 'br' needs the brotli package.
+RESPONSE_COMPRESSION = {
+    'default': {'min_size': 1024, 'encodings': ('br', 'gzip'), 'gzip_level': 6, 'brotli_quality': 4},
+    # Streamed CSV of a whole school: favour speed over size
+    'school-export': {'gzip_level': 1, 'brotli_quality': 1},
+    # Tokens in the body: never compressed, so they can't be guessed from response sizes (BREACH)
+    'login': None,
+}
+
+# Tables `manage.py audit_query_plans` accepts full scans of in filtered queries
+QUERY_PLAN_ALLOWED_SCANS = set()
+
+# School deletion (see school/deletion.py)
+SCHOOL_DELETION_CHUNK_SIZE = 500  # Rows per DELETE statement and transaction
+SCHOOL_DELETION_INLINE_LIMIT = 5000  # Larger schools are deleted by `manage.py run_deletion_jobs`
+
+# Uploads always go to a temporary file, and spreadsheets are imported in chunks of this many rows
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_JOB_STALE_AFTER = 15 * 60  # Seconds without progress before a running import is considered dead
+
+# Attendance summary periods (see attendance/summaries.py)
+ATTENDANCE_YEAR_START_MONTH = 9
+ATTENDANCE_TERM_START_MONTHS = [9, 1, 4]
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO' if DEBUG and not TESTING else 'WARNING',
+        },
+    },
+}
+
 ROOT_URLCONF = 'schoolApi.urls'
 
 TEMPLATES = [
@@ -126,14 +240,54 @@ WSGI_APPLICATION = 'schoolApi.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite connection profiles, picked with the SQLITE_PROFILE environment variable.
+# production: WAL so reads never wait for the writer, a busy timeout so writers queue
+# instead of failing with "database is locked", and BEGIN IMMEDIATE so a transaction
+# takes the write lock up front rather than failing when it upgrades from a read.
+# WAL is stored in the database file itself, so development keeps SQLite's defaults.
+SQLITE_PROFILES = {
+    'development': {},
+    'production': {
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'  # Durable at checkpoints; safe from corruption under WAL
+            'PRAGMA cache_size=-32000;'  # 32 MB page cache per connection
+            'PRAGMA mmap_size=268435456;'  # 256 MB of the file memory-mapped for reads
+            'PRAGMA temp_store=MEMORY;'
+        ),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    },
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'development' if DEBUG else 'production')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PROFILES[SQLITE_PROFILE],
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The local-memory cache is per process; use a shared backend (Redis, Memcached)
+# when running several workers so signal-driven invalidations reach all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'schoolapi-default',
+    },
+    # Login attempt counters; kept in process memory on purpose so they cost no I/O
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'schoolapi-throttle',
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -170,6 +324,9 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files, e.g. spreadsheets waiting for the import worker
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -27,6 +27,9 @@ urlpatterns = [
     path('api/', include('subject.urls')),
     path('api/', include('teacher.urls')),
     path('api/', include('student.urls')),
-    path('api/', include('parent.urls'))
+    path('api/', include('parent.urls')),
+    path('api/', include('attendance.urls')),
+    path('api/', include('gradebook.urls')),
+    path('api/', include('imports.urls')),
 ]
 
@@ -1,11 +1,56 @@
-# urls.py
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from section.views import SectionViewSet
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-router = DefaultRouter()
-router.register(r'section', SectionViewSet)
+from core.endpoints import client_for
+from core.testing import assign, create_school, create_section, create_student, create_subject, create_teacher
 
-urlpatterns = [
-    path('', include(router.urls)),
-]
+
+class SubjectAndTeacherViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.small, cls.large = create_section(cls.school), create_section(cls.school)
+        cls.teacher = create_teacher(cls.school)
+        cls.subjects = [create_subject(cls.school, name) for name in ('Maths', 'Physics', 'Biology')]
+        cls.assignments = [assign(cls.teacher, cls.small, cls.subjects[0])]
+        cls.assignments += [assign(create_teacher(cls.school), cls.large, subject) for subject in cls.subjects]
+        cls.student = create_student(cls.large)
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+
+    def get(self, name, pk):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(name, args=[pk]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(context)
+
+    def test_section_rows_carry_teacher_and_subject_names(self):
+        results, _ = self.get('section-get-subject-and-teachers', self.large.pk)
+        self.assertEqual(results, [
+            {'id': assignment.id, 'teacher_id': assignment.teacher_id, 'teacher': assignment.teacher.first_name,
+             'subject_id': assignment.subject_id, 'subject': assignment.subject.subject}
+            for assignment in self.assignments[1:]
+        ])
+
+    def test_student_rows_are_those_of_their_section(self):
+        results, _ = self.get('students-get-teacher-subject', self.student.pk)
+        self.assertEqual([row['subject'] for row in results], ['Maths', 'Physics', 'Biology'])
+
+    def test_query_count_does_not_grow_with_the_assignments(self):
+        self.get('section-get-subject-and-teachers', self.large.pk)  # Caches the account check
+        _, small = self.get('section-get-subject-and-teachers', self.small.pk)
+        _, large = self.get('section-get-subject-and-teachers', self.large.pk)
+        self.assertEqual(small, large)
+
+    def test_async_view_answers_like_the_sync_one(self):
+        sync = self.client.get(reverse('section-get-subject-and-teachers', args=[self.large.pk]))
+        async_ = self.client.get(reverse('async-section-get-subject-and-teachers', args=[self.large.pk]))
+        self.assertEqual((async_.status_code, async_.json()), (sync.status_code, sync.json()))
+
+    def test_anonymous_requests_are_rejected(self):
+        for name in ('section-get-subject-and-teachers', 'async-section-get-subject-and-teachers'):
+            response = Client().get(reverse(name, args=[self.large.pk]))
+            self.assertEqual(response.status_code, 401, name)
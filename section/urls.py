@@ -1,6 +1,7 @@
 # urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import views
 from .views import SectionViewSet
 
 router = DefaultRouter()
@@ -8,4 +9,6 @@ router.register(r'sections', SectionViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/sections/<int:pk>/view_teacher_subject/', views.async_get_subject_and_teachers,
+         name='async-section-get-subject-and-teachers'),
 ]
@@ -3,15 +3,18 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.http import Http404
+
+from core.asyncviews import async_api_view, paginate, require_authentication
 
 from section.models import Section
 from section.serializers import SectionSerializer
 from teacher.models import TeacherSectionSubject
-from teacher.serializers import TeacherSectionSubjectSerializer
+from teacher.serializers import TeacherSubjectSerializer
 
 
 class SectionViewSet(viewsets.ModelViewSet):
-    queryset = Section.objects.all()
+    queryset = Section.objects.select_related('grade')  # SectionSerializer reads grade.grade_name
     serializer_class = SectionSerializer
     permission_classes = [IsAuthenticated]  # Ensures the user is authenticated
 
@@ -35,27 +38,30 @@ class SectionViewSet(viewsets.ModelViewSet):
             # Retrieve the section by primary key (pk)
             section = self.get_object()
 
-            # Query TeacherSectionSubject relationships for the given section
-            subjects_teachers = TeacherSectionSubject.objects.filter(section=section)
+            # One joined query per page for the assignments with teacher and subject names
+            subjects_teachers = TeacherSectionSubject.objects.filter(section=section).with_names()
+            page = self.paginate_queryset(subjects_teachers)
 
-            if not subjects_teachers.exists():
+            if not page and self.paginator.cursor_query_param not in request.query_params:
                 return Response(
                     {"message": "No subjects and teachers found for this section."},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # Prepare a response with only serializable fields
-            response_data = [
-                {
-                    "teacher": st.teacher.first_name,
-                    "subject": st.subject.subject,
-                }
-                for st in subjects_teachers
-            ]
-
-            return Response(response_data, status=status.HTTP_200_OK)
+            serializer = TeacherSubjectSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
 
         except Section.DoesNotExist:
             return Response(
                 {"error": "Section not found."}, status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+
+# Async version of get_subject_and_teachers, run on the event loop under ASGI (see core/asyncviews.py)
+@async_api_view
+async def async_get_subject_and_teachers(request, pk):
+    require_authentication(request)
+    if not await Section.objects.filter(pk=pk).aexists():
+        raise Http404("No Section matches the given query.")
+    subjects_teachers = TeacherSectionSubject.objects.filter(section_id=pk).with_names()
+    return await paginate(request, subjects_teachers, TeacherSubjectSerializer, "No subjects and teachers found for this section.")
@@ -0,0 +1,77 @@
+import pandas as pd
+from django.db import transaction
+
+from core.importing import ImportReport, check_columns, check_duplicates, check_text_columns, row_numbers, text_column
+from school.versions import bump_school_version
+from student.models import Student
+
+
+class StudentImporter:
+    """
+    Imports a roster sheet into a single section.
+
+    The whole DataFrame is validated column by column, existing students are
+    looked up with one query and the valid rows are written with bulk_create.
+    """
+    REQUIRED_COLUMNS = ['student_id', 'first_name', 'last_name', 'age', 'gender']
+    TEXT_COLUMNS = ['student_id', 'first_name', 'last_name', 'gender']
+    BATCH_SIZE = 500
+
+    def __init__(self, school, section, batch_size=BATCH_SIZE):
+        self.school = school
+        self.section = section
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self._seen_ids = set()
+
+    def run(self, df, offset=0, progress=None):
+        """
+        Validate and insert the rows of `df`; `offset` is the number of rows already
+        imported. `progress(rows_read)` is called in the transaction that inserts them.
+        """
+        check_columns(df, self.REQUIRED_COLUMNS)
+        rows = row_numbers(df, offset)
+        data = pd.DataFrame({column: text_column(df[column]) for column in self.TEXT_COLUMNS})
+
+        check_text_columns(self.report, Student, data, rows)
+
+        age = pd.to_numeric(df['age'], errors='coerce')
+        bad_age = age.isna() | (age < 0) | (age % 1 != 0)
+        self.report.add_errors(rows[bad_age], 'age', "A valid non-negative integer is required.")
+        data['age'] = age
+
+        check_duplicates(self.report, data, rows, 'student_id', self._seen_ids)
+
+        # One IN query for every id in the sheet; student_id is unique across schools
+        ids = data['student_id']
+        existing = dict(
+            Student.objects.filter(student_id__in=list(ids.dropna().unique()))
+            .values_list('student_id', 'school_id')
+        )
+        if existing:
+            exists = ids.isin(existing.keys())
+            same_school = exists & ids.map(existing).eq(self.school.id).fillna(False)
+            self.report.add_errors(rows[same_school], 'student_id', "A student with this student_id already exists in this school.")
+            self.report.add_errors(rows[exists & ~same_school], 'student_id', "This student_id is already registered to another school.")
+
+        valid = ~rows.map(self.report.has_error)
+        students = [
+            Student(
+                student_id=row.student_id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                age=int(row.age),
+                gender=row.gender,
+                section=self.section,
+                school=self.school,
+            )
+            for row in data[valid].itertuples(index=False)
+        ]
+
+        with transaction.atomic():
+            Student.objects.bulk_create(students, batch_size=self.batch_size)
+            bump_school_version(self.school.id)  # bulk_create sends no post_save signals
+            self.report.created += len(students)
+            if progress:
+                progress(offset + len(df))
+        return self.report
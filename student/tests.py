@@ -1,3 +1,103 @@
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from core.endpoints import client_for
+from core.testing import assign, create_school, create_section, create_student, create_subject, create_teacher
+from student.importers import StudentImporter
+from student.models import Student
+
+
+def roster(rows):
+    return pd.DataFrame(rows, columns=StudentImporter.REQUIRED_COLUMNS)
+
+
+class StudentImporterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.section = create_section(cls.school)
+        create_student(cls.section, student_id='EXISTS')
+        create_student(create_section(create_school()), student_id='ELSEWHERE')
+
+    def test_invalid_rows_are_reported_and_the_rest_created(self):
+        importer = StudentImporter(self.school, self.section)
+        report = importer.run(roster([
+            ['S1', 'Abel', 'Kebede', 12, 'M'],
+            ['S2', '', 'Tadesse', 11, 'F'],
+            ['S3', 'Sara', 'Alemu', -1, 'F'],
+            ['S1', 'Abel', 'Again', 12, 'M'],
+            ['EXISTS', 'Hana', 'Bekele', 10, 'F'],
+            ['ELSEWHERE', 'Liya', 'Girma', 10, 'F'],
+            ['S4', 'Dawit', 'Haile', 9.0, 'M'],
+        ]))
+
+        self.assertEqual(report.as_dict(), {
+            'created': 2,
+            'failed': 5,
+            'errors': [
+                {'row': 3, 'errors': {'first_name': ["This field is required."]}},
+                {'row': 4, 'errors': {'age': ["A valid non-negative integer is required."]}},
+                {'row': 5, 'errors': {'student_id': ["Duplicate student_id in the uploaded file."]}},
+                {'row': 6, 'errors': {'student_id': ["A student with this student_id already exists in this school."]}},
+                {'row': 7, 'errors': {'student_id': ["This student_id is already registered to another school."]}},
+            ],
+        })
+        self.assertEqual(
+            sorted(Student.objects.filter(section=self.section).values_list('student_id', 'age')),
+            [('EXISTS', 10), ('S1', 12), ('S4', 9)],
+        )
+
+    def test_row_numbers_continue_across_chunks(self):
+        importer = StudentImporter(self.school, self.section)
+        importer.run(roster([['S1', 'Abel', 'Kebede', 12, 'M']]))
+        report = importer.run(roster([['S1', 'Abel', 'Kebede', 12, 'M']]), offset=1)
+        self.assertEqual(report.errors, [{'row': 3, 'errors': {'student_id': [
+            "Duplicate student_id in the uploaded file.",
+            "A student with this student_id already exists in this school.",
+        ]}}])
+
+    def test_query_count_does_not_grow_with_the_sheet(self):
+        for size in (2, 20):
+            rows = [[f'N{size}-{n}', 'First', 'Last', 10, 'F'] for n in range(size)]
+            rows[0][0] = 'EXISTS'
+            with self.subTest(rows=size), self.assertNumQueries(4):
+                report = StudentImporter(self.school, self.section).run(roster(rows))
+            self.assertEqual((report.created, report.failed), (size - 1, 1))
+
+
+class AsyncStudentViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        section = create_section(cls.school)
+        assign(create_teacher(cls.school), section, create_subject(cls.school))
+        cls.student = create_student(section)
+
+    def setUp(self):
+        self.client = client_for(self.school.user)
+
+    def test_async_views_answer_like_the_sync_ones(self):
+        for name in ('students-detail', 'students-get-teacher-subject'):
+            sync = self.client.get(reverse(name, args=[self.student.pk]))
+            async_ = self.client.get(reverse(f'async-{name}', args=[self.student.pk]))
+            self.assertEqual(sync.status_code, 200, name)
+            self.assertEqual((async_.status_code, async_.json()), (sync.status_code, sync.json()), name)
+
+    def test_missing_student_is_a_json_404(self):
+        response = self.client.get(reverse('async-students-detail', args=[0]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail', response.json())
+
+
+class StudentUploadTests(TestCase):
+    def test_section_must_belong_to_the_school(self):
+        school = create_school()
+        other_section = create_section(create_school())
+        response = client_for(school.user).post(reverse('students-upload-excel'), {
+            'file': SimpleUploadedFile('students.xlsx', b''), 'school_id': school.pk, 'section_id': other_section.pk,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': "Section does not belong to this school."})
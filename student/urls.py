@@ -1,10 +1,14 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 
+from student import views
 from student.views import StudentViewSet
 
 router = DefaultRouter()
-router.register(r'students', StudentViewSet, basename='teachers')
+router.register(r'students', StudentViewSet, basename='students')
 
 urlpatterns = [
-    path('', include(router.urls)),]
\ No newline at end of file
+    path('', include(router.urls)),
+    path('async/students/<int:pk>/', views.async_student_detail, name='async-students-detail'),
+    path('async/students/<int:pk>/get-teacher-subject/', views.async_get_teacher_subject, name='async-students-get-teacher-subject'),
+]
\ No newline at end of file
@@ -1,19 +1,21 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
+from django.http import Http404
+
+from core.asyncviews import api_response, async_api_view, paginate, require_authentication
 
 from school.models import School
 from section.models import Section
 from student.models import Student
 from student.serializers import StudentSerializer
-import pandas as pd
-from rest_framework.parsers import MultiPartParser
-from django.db import transaction, IntegrityError
+from core.importing import SpreadsheetError
+from imports.jobs import enqueue_import
+from imports.views import import_accepted
 
 from teacher.models import TeacherSectionSubject
-from teacher.serializers import TeacherSectionSubjectSerializer
+from teacher.serializers import TeacherSubjectSerializer
 
 # Create your views here.
 class StudentViewSet(viewsets.ModelViewSet):
@@ -24,7 +26,7 @@ class StudentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'], url_path='upload-excel')
     def upload_excel(self, request):
         """
-        Upload an Excel file and import the data into the Teacher table with a school_id.
+        Upload an Excel file and import the data into the Student table for a school and section.
         """
         file = request.FILES.get('file')
         school_id = request.data.get('school_id')
@@ -39,56 +41,54 @@ class StudentViewSet(viewsets.ModelViewSet):
         # Check if the school_id exists in the School model
         try:
             school = School.objects.get(id=school_id)
-            section = Section.objects.get(id=section_id)
+            section = Section.objects.select_related('grade').get(id=section_id)
 
-        except (School.DoesNotExist, Section.DoesnotExist):
+        except (School.DoesNotExist, Section.DoesNotExist):
             return Response({"error": "School or Section not found."}, status=status.HTTP_404_NOT_FOUND)
 
+        if section.grade.school_id != school.id:
+            return Response({"error": "Section does not belong to this school."}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            # Read the Excel file into a pandas DataFrame
-            df = pd.read_excel(file)
-
-            # Iterate over the rows in the DataFrame and create Teacher records
-            for index, row in df.iterrows():
-                student_data = {
-                    'first_name': row.get('first_name'),
-                    'last_name': row.get('last_name'),
-                    'student_id': row.get('student_id'),
-                    'section': section_id,
-                    'age': row.get('age'),
-                    'gender': row.get('gender'),
-                    'school': school_id  # Assign the school to the teacher
-                }
-
-                # Validate and create the teacher instance
-                serializer = StudentSerializer(data=student_data)
-                if serializer.is_valid():
-                    serializer.save()
-                else:
-                    # If there's a validation error, you could either log it, skip, or handle it as needed
-                    continue
-
-            return Response({"message": "Students imported successfully."}, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
+            # Parsing, validation, inserts and account emails happen in the import worker
+            job = enqueue_import('STUDENTS', file, school, section=section, user_id=request.user.pk)
+        except SpreadsheetError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return import_accepted(request, job, 'student')
     
     @action(detail=True, methods=['get'], url_path='get-teacher-subject')
     def get_teacher_subject(self, request, pk=None):
 
         student = self.get_object()
-        section = student.section 
-        subjects_teachers = TeacherSectionSubject.objects.filter(section=section) 
+        # Filter on section_id so the section itself is never loaded
+        subjects_teachers = TeacherSectionSubject.objects.filter(section_id=student.section_id).with_names()
+        page = self.paginate_queryset(subjects_teachers)
 
-        if not subjects_teachers.exists():
+        if not page and self.paginator.cursor_query_param not in request.query_params:
             return Response({"message": "No subject and teacher found for this student."}, status=status.HTTP_404_NOT_FOUND)
-        
-        response_data = [
-                {
-                    "teacher": st.teacher.first_name,
-                    "subject": st.subject.subject,
-                }
-                for st in subjects_teachers
-            ]
-
-        return Response(response_data, status=status.HTTP_200_OK)
+
+        serializer = TeacherSubjectSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+# Async versions of the student reads, run on the event loop under ASGI (see core/asyncviews.py)
+
+@async_api_view
+async def async_student_detail(request, pk):
+    require_authentication(request)
+    student = await Student.objects.filter(pk=pk).afirst()
+    if student is None:
+        raise Http404("No Student matches the given query.")
+    return api_response(StudentSerializer(student).data)
+
+
+@async_api_view
+async def async_get_teacher_subject(request, pk):
+    require_authentication(request)
+    # Only the section_id is needed, as in get_teacher_subject
+    section_id = await Student.objects.filter(pk=pk).values_list('section_id', flat=True).afirst()
+    if section_id is None:
+        raise Http404("No Student matches the given query.")
+    subjects_teachers = TeacherSectionSubject.objects.filter(section_id=section_id).with_names()
+    return await paginate(request, subjects_teachers, TeacherSubjectSerializer, "No subject and teacher found for this student.")
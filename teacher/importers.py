@@ -0,0 +1,71 @@
+import pandas as pd
+from django.db import transaction
+
+from core.importing import ImportReport, check_columns, check_duplicates, check_emails, check_text_columns, row_numbers, text_column
+from school.structure import invalidate_school_structure
+from school.versions import bump_school_version
+from teacher.models import Teacher
+from users.provisioning import prepare_accounts, save_accounts
+
+
+class TeacherImporter:
+    """
+    Imports a staff sheet for a school and provisions a login for every new teacher.
+
+    Rows are validated column by column, existing emails are looked up with one
+    query, and teachers and their accounts are inserted in bulk.
+    """
+    REQUIRED_COLUMNS = ['first_name', 'last_name', 'email', 'phone']
+    BATCH_SIZE = 500
+
+    def __init__(self, school, batch_size=BATCH_SIZE):
+        self.school = school
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self._seen_emails = set()
+
+    def run(self, df, offset=0, progress=None):
+        """
+        Validate and insert the rows of `df`; `offset` is the number of rows already
+        imported. `progress(rows_read)` is called in the transaction that inserts them.
+        """
+        check_columns(df, self.REQUIRED_COLUMNS)
+        rows = row_numbers(df, offset)
+        data = pd.DataFrame({column: text_column(df[column]) for column in self.REQUIRED_COLUMNS})
+        data['email'] = data['email'].str.lower()
+
+        check_text_columns(self.report, Teacher, data, rows)
+        check_emails(self.report, data, rows)
+        check_duplicates(self.report, data, rows, 'email', self._seen_emails)
+
+        emails = data['email']
+        existing = set(
+            Teacher.objects.filter(email__in=list(emails.dropna().unique()))
+            .values_list('email', flat=True)
+        )
+        self.report.add_errors(rows[emails.isin(existing)], 'email', "A teacher with this email already exists.")
+
+        valid = ~rows.map(self.report.has_error)
+        teachers = [
+            Teacher(
+                first_name=row.first_name,
+                last_name=row.last_name,
+                email=row.email,
+                phone=row.phone,
+                school=self.school,
+            )
+            for row in data[valid].itertuples(index=False)
+        ]
+
+        # Hash passwords before taking the write lock, so other writers aren't kept waiting
+        accounts = prepare_accounts(teachers, 'TEACHER')
+        with transaction.atomic():
+            Teacher.objects.bulk_create(teachers, batch_size=self.batch_size)
+            save_accounts(accounts)
+            # bulk_create sends no post_save signals
+            invalidate_school_structure(self.school.id)
+            bump_school_version(self.school.id)
+            self.report.created += len(teachers)
+            if progress:
+                progress(offset + len(df))
+        return self.report
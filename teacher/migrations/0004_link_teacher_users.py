@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def link_users(apps, schema_editor):
+    # Until now a teacher and its login account were only matched by email
+    Teacher = apps.get_model('teacher', 'Teacher')
+    User = apps.get_model('users', 'User')
+    db_alias = schema_editor.connection.alias
+
+    user_ids = dict(User.objects.using(db_alias).filter(role='TEACHER').exclude(email='').values_list('email', 'id'))
+    profiles = [profile for profile in Teacher.objects.using(db_alias).filter(user__isnull=True) if profile.email in user_ids]
+    for profile in profiles:
+        profile.user_id = user_ids[profile.email]
+    Teacher.objects.using(db_alias).bulk_update(profiles, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher', '0003_teacher_user'),
+        ('users', '0003_user_email_index_and_unique_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_users, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 
 from school.models import School
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from notifications.outbox import build_email
 from django.conf import settings
 from django.utils import timezone
 import random
@@ -19,6 +19,7 @@ class Teacher(models.Model):
     phone = models.CharField(max_length=15)
     email = models.EmailField(max_length=255, unique=True)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='teachers')
+    user = models.OneToOneField(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='teacher_profile')  # Login account, set by create_user_account
 
     def __str__(self):
         return f'{self.first_name} - {self.school.name}'
@@ -32,24 +33,27 @@ class Teacher(models.Model):
         # Generate a random password
         characters = string.ascii_letters + string.digits + string.punctuation
         return ''.join(random.choice(characters) for _ in range(length))
-    def send_credentials_via_email(self,username,password):
+    def credentials_email(self, username, password):
+        # Build (but don't queue) the credentials email, so bulk imports can queue many at once
         subject = 'Your Teacher Account Credentials'
         message = f'Hello {self.first_name},\n\nYour account has been created successfully.\n\nUsername: {username}\nPassword: {password}\n\nPlease keep your credentials safe.'
         recipient_list = [self.email]
+        return build_email(subject, message, self.school.email, recipient_list)
 
-        # Send the email
-        send_mail(subject, message, self.school.email, recipient_list)
+    def send_credentials_via_email(self,username,password):
+        # Queue the email; it is delivered by the outbox worker once the transaction commits
+        self.credentials_email(username, password).save()
 
     def create_user_account(self):
         # Generate a username and password
         username = self.generate_username()
         password = self.generate_password()
 
-        # Create a user in the User model
+        # Create a user in the User model, or reuse the one this email already has for the role
         user, created = User.objects.get_or_create(
-            username=username,
             email=self.email,
-            role='TEACHER'
+            role='TEACHER',
+            defaults={'username': username},
         )
 
         # If the user was newly created, set the password and save
@@ -60,17 +64,26 @@ class Teacher(models.Model):
         
         # Save the user with the hashed password
         user.save()
+        self.user = user
 
         # Send credentials via email
-        self.send_credentials_via_email(username,password)
+        self.send_credentials_via_email(user.username,password)
 
         # Save the school instance with the generated username and password
         self.save()
 
+class TeacherSectionSubjectQuerySet(models.QuerySet):
+    def with_names(self):
+        # Teacher and subject names joined in the same query, as plain dicts
+        return self.values('id', 'teacher_id', 'teacher__first_name', 'subject_id', 'subject__subject')
+
+
 class TeacherSectionSubject(models.Model):
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='teachers_section')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='teacher_section')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='teacher_subject')
+
+    objects = TeacherSectionSubjectQuerySet.as_manager()
     
     class Meta:
         constraints = [
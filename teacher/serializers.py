@@ -11,3 +11,11 @@ class TeacherSectionSubjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeacherSectionSubject
         fields = "__all__"
+
+class TeacherSubjectSerializer(serializers.Serializer):
+    """Who teaches what, read from TeacherSectionSubject.objects.with_names() rows."""
+    id = serializers.IntegerField(read_only=True)
+    teacher_id = serializers.IntegerField(read_only=True)
+    teacher = serializers.CharField(source='teacher__first_name', read_only=True)
+    subject_id = serializers.IntegerField(read_only=True)
+    subject = serializers.CharField(source='subject__subject', read_only=True)
@@ -4,10 +4,13 @@ from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.views import APIView
-import pandas as pd
 from rest_framework.parsers import MultiPartParser
 from django.db import transaction, IntegrityError
 
+from core.importing import SpreadsheetError
+from imports.jobs import enqueue_import
+from imports.views import import_accepted
+from core.pagination import KeysetPagination
 from school.models import School
 from section.models import Section
 from subject.models import Subject
@@ -63,33 +66,13 @@ class TeacherViewSet(viewsets.ModelViewSet):
             return Response({"error": "School not found."}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            # Read the Excel file into a pandas DataFrame
-            df = pd.read_excel(file)
-
-            # Iterate over the rows in the DataFrame and create Teacher records
-            for index, row in df.iterrows():
-                teacher_data = {
-                    'first_name': row.get('first_name'),
-                    'last_name': row.get('last_name'),
-                    'email': row.get('email'),
-                    'phone': row.get('phone'),
-                    'school': school.id  # Assign the school to the teacher
-                }
-
-                # Validate and create the teacher instance
-                serializer = TeacherSerializer(data=teacher_data)
-                if serializer.is_valid():
-                    teacher = serializer.save()
-                    teacher.create_user_account()
-                else:
-                    # If there's a validation error, you could either log it, skip, or handle it as needed
-                    continue
-
-            return Response({"message": "Teachers imported successfully."}, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
+            # Parsing, validation, inserts and account emails happen in the import worker
+            job = enqueue_import('TEACHERS', file, school, user_id=request.user.pk)
+        except SpreadsheetError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        return import_accepted(request, job, 'teacher')
+
     @action(detail=True, methods=['get'], url_path='view_subject_section')
     def get_subject_and_sections(self, request, pk=None):
         teacher = self.get_object()  # Get the school instance by pk (school_id)
@@ -98,8 +81,9 @@ class TeacherViewSet(viewsets.ModelViewSet):
         if not subjects_sections.exists():
             return Response({"message": "No subjects and sections found for this teacher."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = TeacherSectionSubjectSerializer(subjects_sections, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(subjects_sections)
+        serializer = TeacherSectionSubjectSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 
@@ -152,8 +136,10 @@ class TeacherSectionSubjectView(APIView):
                 )
         else:
             assignments = TeacherSectionSubject.objects.all()
-            serializer = TeacherSectionSubjectSerializer(assignments, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(assignments, request, view=self)
+            serializer = TeacherSectionSubjectSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
     def put(self, request, pk, *args, **kwargs):
         """Update an entire assignment by ID."""
@@ -0,0 +1,81 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from users.models import User
+from users.principal import Principal
+
+
+def is_active_user(user_id):
+    """Whether the user still exists and is active, cached for STATELESS_JWT_USER_CHECK_TTL seconds."""
+    return cache.get_or_set(
+        f'user-active:{user_id}',
+        lambda: User.objects.filter(pk=user_id, is_active=True).exists(),
+        settings.STATELESS_JWT_USER_CHECK_TTL,
+    )
+
+
+async def ais_active_user(user_id):
+    """is_active_user through the async cache and ORM API, for async views."""
+    key = f'user-active:{user_id}'
+    active = await cache.aget(key)
+    if active is None:
+        active = await User.objects.filter(pk=user_id, is_active=True).aexists()
+        await cache.aset(key, active, settings.STATELESS_JWT_USER_CHECK_TTL)
+    return active
+
+
+class PrincipalTokenUser(TokenUser):
+    """TokenUser that also exposes the token claims as a Principal, like User.principal."""
+
+    @cached_property
+    def principal(self):
+        return Principal.from_token(self.token)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token claims.
+
+    Tokens issued by RoleRefreshToken carry the role and school/teacher/parent
+    ids, so request.user is a PrincipalTokenUser (user.role, user.principal, ...
+    read the claims) and no users table query is needed. Deleted or deactivated
+    users are still rejected through a small TTL cache unless
+    STATELESS_JWT_USER_CHECK_TTL is None. Tokens without a role claim fall back
+    to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if 'role' not in validated_token:
+            return super().get_user(validated_token)
+
+        user = PrincipalTokenUser(validated_token)
+        if settings.STATELESS_JWT_USER_CHECK_TTL is not None and not is_active_user(user.id):
+            raise AuthenticationFailed(_("User not found or inactive"), code="user_inactive")
+        return user
+
+
+async def aauthenticate(request):
+    """
+    StatelessJWTAuthentication for plain async views (see core/asyncviews.py): the
+    same token checks, with the active-user check awaited. Returns None without a token.
+    """
+    authentication = StatelessJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+
+    validated_token = authentication.get_validated_token(raw_token)
+    if 'role' not in validated_token:
+        return await sync_to_async(authentication.get_user)(validated_token)
+
+    user = PrincipalTokenUser(validated_token)
+    if settings.STATELESS_JWT_USER_CHECK_TTL is not None and not await ais_active_user(user.id):
+        raise AuthenticationFailed(_("User not found or inactive"), code="user_inactive")
+    return user
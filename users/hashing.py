@@ -0,0 +1,47 @@
+# Password hashing spread over a process pool.
+# This module must not import models: with the spawn/forkserver start methods
+# the pool workers import it without Django being set up.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.utils.module_loading import import_string
+
+# Below this many passwords, starting the pool costs more than it saves
+PARALLEL_THRESHOLD = 16
+
+
+def hash_passwords_serial(hasher_path, passwords):
+    hasher = import_string(hasher_path)()
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+
+def worker_count():
+    workers = getattr(settings, 'PASSWORD_HASHING_WORKERS', None)
+    if workers:
+        return workers
+    try:
+        return len(os.sched_getaffinity(0))  # Cores this process may actually run on
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash `passwords` with the default password hasher, like make_password(),
+    using one process per available core for large batches.
+    """
+    hasher = get_hasher('default')
+    hasher_path = f'{type(hasher).__module__}.{type(hasher).__qualname__}'
+    workers = min(workers or worker_count(), len(passwords))
+
+    if workers <= 1 or len(passwords) < PARALLEL_THRESHOLD:
+        return hash_passwords_serial(hasher_path, passwords)
+
+    # A few chunks per worker keeps the cores busy if some finish early
+    chunk_size = -(-len(passwords) // (workers * 4))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(hash_passwords_serial, [hasher_path] * len(chunks), chunks)
+        return [encoded for chunk in results for encoded in chunk]
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from school.models import School
+from teacher.models import Teacher
+from users.hashing import worker_count
+from users.provisioning import provision_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-row create_user_account() loop with bulk provisioning. "
+        "Everything runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,5000', help="Comma separated batch sizes.")
+        parser.add_argument(
+            '--serial-sample', type=int, default=200,
+            help="Rows actually timed for the per-row loop; larger sizes are extrapolated linearly.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        self.stdout.write(f"Hashing workers: {worker_count()}")
+        self.stdout.write(f"{'accounts':>8}  {'per-row (s)':>12}  {'bulk (s)':>9}  {'speedup':>8}")
+
+        with transaction.atomic():
+            school = School.objects.create(name='Benchmark School', address='-', phone='-', email='bench-school@example.com')
+            for size in sizes:
+                sample = min(size, options['serial_sample'])
+                serial = self.time_per_row(school, size, sample) * size / sample
+                bulk = self.time_bulk(school, size)
+                note = '' if sample == size else f'  (per-row extrapolated from {sample})'
+                self.stdout.write(f"{size:>8}  {serial:>12.2f}  {bulk:>9.2f}  {serial / bulk:>7.1f}x{note}")
+            transaction.set_rollback(True)
+
+    def make_teachers(self, school, count, prefix):
+        teachers = [
+            Teacher(first_name=f'Bench {i}', last_name='Teacher', phone='0', email=f'{prefix}-{i}@bench.example.com', school=school)
+            for i in range(count)
+        ]
+        return Teacher.objects.bulk_create(teachers)
+
+    def time_per_row(self, school, size, sample):
+        teachers = self.make_teachers(school, sample, f'serial-{size}')
+        start = time.perf_counter()
+        for teacher in teachers:
+            teacher.create_user_account()
+        return time.perf_counter() - start
+
+    def time_bulk(self, school, size):
+        teachers = self.make_teachers(school, size, f'bulk-{size}')
+        start = time.perf_counter()
+        provision_accounts(teachers, 'TEACHER')
+        return time.perf_counter() - start
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+def merge_duplicate_users(apps, schema_editor):
+    # Accounts used to be created per upload, so some emails have several accounts of one role.
+    # Keep the newest of each (its password is the one last emailed), move whatever references
+    # the others over to it, then delete them.
+    User = apps.get_model('users', 'User')
+    db_alias = schema_editor.connection.alias
+    users = User.objects.using(db_alias)
+
+    duplicates = (
+        users.exclude(email='').values('email', 'role')
+        .annotate(count=models.Count('id'), keep=models.Max('id'))
+        .filter(count__gt=1)
+    )
+    for group in duplicates:
+        others = list(
+            users.filter(email=group['email'], role=group['role']).exclude(pk=group['keep']).values_list('pk', flat=True)
+        )
+        for relation in User._meta.get_fields(include_hidden=True):
+            if not relation.auto_created or relation.concrete or relation.many_to_many:
+                continue  # Not a reference to users
+            if relation.related_model._meta.auto_created:
+                continue  # Group and permission links go with the deleted accounts
+            rows = relation.related_model._base_manager.using(db_alias)
+            name = relation.field.name
+            if relation.one_to_one:
+                # Only one row can point at the kept account: the newest, unless it already has one
+                if rows.filter(**{name: group['keep']}).exists():
+                    continue
+                rows = rows.filter(pk=rows.filter(**{f'{name}__in': others}).order_by('-pk').values_list('pk', flat=True).first())
+            else:
+                rows = rows.filter(**{f'{name}__in': others})
+            rows.update(**{name: group['keep']})
+        users.filter(pk__in=others).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+        migrations.RunPython(merge_duplicate_users, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('email', ''), _negated=True), fields=('email', 'role'), name='unique_user_email_role'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:36
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_user_email_index_and_unique_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('role'), name='user_email_lower_role_idx'),
+        ),
+    ]
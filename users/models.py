@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+from users.principal import Principal
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -10,5 +14,19 @@ class User(AbstractUser):
     
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['email'], name='user_email_idx'),
+            models.Index(Lower('email'), 'role', name='user_email_lower_role_idx'),  # Login matches emails case-insensitively
+        ]
+        constraints = [
+            # One account per email and role; blank emails (e.g. superusers) are exempt
+            models.UniqueConstraint(fields=['email', 'role'], condition=~models.Q(email=''), name='unique_user_email_role'),
+        ]
+
     def __str__(self):
         return self.username
+
+    @cached_property
+    def principal(self):
+        return Principal.from_user(self)
@@ -0,0 +1,61 @@
+class Principal:
+    """
+    Who is making a request: the user's role and the School/Teacher/Parent it is
+    linked to. Available as `request.user.principal` for both database users and
+    stateless token users.
+    """
+    PROFILE_ROLES = ('SCHOOL', 'TEACHER', 'PARENT')
+
+    def __init__(self, user_id, role, school_id=None, teacher_id=None, parent_id=None):
+        self.user_id = user_id
+        self.role = role
+        self.school_id = school_id
+        self.teacher_id = teacher_id
+        self.parent_id = parent_id
+
+    def __repr__(self):
+        return (
+            f'Principal(user_id={self.user_id}, role={self.role}, school_id={self.school_id}, '
+            f'teacher_id={self.teacher_id}, parent_id={self.parent_id})'
+        )
+
+    @classmethod
+    def from_user(cls, user):
+        """Resolve through the profile's user foreign key: one indexed query."""
+        # Imported here: the profile apps import users.models
+        from parent.models import Parent
+        from school.models import School
+        from teacher.models import Teacher
+
+        principal = cls(user.pk, user.role)
+        if user.role == 'SCHOOL':
+            principal.school_id = School.objects.filter(user=user).values_list('id', flat=True).first()
+        elif user.role in ('TEACHER', 'PARENT'):
+            model = Teacher if user.role == 'TEACHER' else Parent
+            profile = model.objects.filter(user=user).values('id', 'school_id').first()
+            if profile:
+                setattr(principal, f'{user.role.lower()}_id', profile['id'])
+                principal.school_id = profile['school_id']
+        return principal
+
+    @classmethod
+    def from_token(cls, token):
+        """Read from the claims set by users.tokens.RoleRefreshToken: no query."""
+        return cls(
+            token.get('user_id'),
+            token.get('role'),
+            school_id=token.get('school_id'),
+            teacher_id=token.get('teacher_id'),
+            parent_id=token.get('parent_id'),
+        )
+
+    def as_claims(self):
+        return {
+            'role': self.role,
+            'school_id': self.school_id,
+            'teacher_id': self.teacher_id,
+            'parent_id': self.parent_id,
+        }
+
+    def owns_school(self, school_id):
+        return self.role == 'SCHOOL' and self.school_id is not None and str(self.school_id) == str(school_id)
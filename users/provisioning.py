@@ -0,0 +1,119 @@
+import itertools
+import uuid
+
+from django.db import transaction
+
+from notifications.models import OutboxEmail
+from users.hashing import hash_passwords
+from users.models import User
+
+
+USERNAME_ATTEMPTS = 5  # Rounds of generate_username() before clashing usernames get a uuid suffix instead
+
+
+def with_uuid_suffix(username):
+    # Trimmed so the suffixed name still fits the username column
+    max_length = User._meta.get_field('username').max_length
+    suffix = uuid.uuid4().hex
+    return f"{username[:max_length - len(suffix) - 1]}_{suffix}"
+
+
+def unique_usernames(profiles):
+    """
+    Generate one username per profile, regenerating any that collide. Names like
+    "name_1234" only have 9999 suffixes, so after USERNAME_ATTEMPTS rounds the
+    ones still clashing get a uuid suffix.
+    """
+    usernames = [profile.generate_username() for profile in profiles]
+    for attempt in itertools.count(1):
+        taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        seen = set()
+        clashes = []
+        for i, username in enumerate(usernames):
+            if username in taken or username in seen:
+                clashes.append(i)
+            seen.add(username)
+
+        if not clashes:
+            return usernames
+        for i in clashes:
+            if attempt < USERNAME_ATTEMPTS:
+                usernames[i] = profiles[i].generate_username()
+            else:
+                usernames[i] = with_uuid_suffix(usernames[i])
+
+
+class PreparedAccounts:
+    """Users, passwords and credential emails for a batch of profiles, ready to be saved."""
+
+    def __init__(self, profiles, users, emails, existing_emails):
+        self.profiles = profiles
+        self.users = users
+        self.emails = emails
+        self.existing_emails = existing_emails
+
+
+def prepare_accounts(profiles, role):
+    """
+    The slow half of provision_accounts: look up existing accounts, pick usernames,
+    hash the passwords across a process pool and build the credential emails.
+    Nothing is written, so call it before opening the write transaction; that way
+    the database write lock isn't held while passwords are hashed.
+    """
+    profiles = list(profiles)
+    existing = {
+        user.email: user
+        for user in User.objects.filter(role=role, email__in=[profile.email for profile in profiles])
+    } if profiles else {}
+    new_profiles = [profile for profile in profiles if profile.email not in existing]
+    new_usernames = iter(unique_usernames(new_profiles))
+
+    users = [
+        existing.get(profile.email) or User(username=next(new_usernames), email=profile.email, role=role)
+        for profile in profiles
+    ]
+    passwords = [profile.generate_password() for profile in profiles]
+    for user, encoded in zip(users, hash_passwords(passwords)):
+        user.password = encoded
+
+    emails = [
+        profile.credentials_email(user.username, password)
+        for profile, user, password in zip(profiles, users, passwords)
+    ]
+    return PreparedAccounts(profiles, users, emails, set(existing))
+
+
+def save_accounts(prepared):
+    """
+    The write half of provision_accounts: insert the users, queue the emails and
+    link each profile to its account. The profiles must already be saved.
+    Returns the users in the same order as the profiles.
+    """
+    if not prepared.profiles:
+        return []
+
+    with transaction.atomic():
+        User.objects.bulk_create([user for user in prepared.users if user.pk is None], batch_size=500)
+        User.objects.bulk_update(
+            [user for user in prepared.users if user.email in prepared.existing_emails], ['password'], batch_size=500,
+        )
+        OutboxEmail.objects.bulk_create(prepared.emails, batch_size=500)
+
+        # Link each profile to its account
+        for profile, user in zip(prepared.profiles, prepared.users):
+            profile.user = user
+        type(prepared.profiles[0]).objects.bulk_update(prepared.profiles, ['user'], batch_size=500)
+    return prepared.users
+
+
+def provision_accounts(profiles, role):
+    """
+    Create User accounts for many School/Teacher/Parent profiles at once.
+
+    Passwords are hashed across a process pool, the users are inserted with
+    bulk_create and the credential emails are queued in the outbox. A profile
+    whose email already has an account for `role` gets a new password on that
+    account instead, like create_user_account().
+    Returns the users in the same order as `profiles`.
+    """
+    return save_accounts(prepare_accounts(profiles, role))
@@ -1,10 +1,10 @@
 # users/serializers.py
 from rest_framework import serializers
 
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+
 from .models import User
-from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework import serializers
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,23 +25,33 @@ class UserSerializer(serializers.ModelSerializer):
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)  # Needed when the email has an account for several roles
 
     def validate(self, data):
         email = data.get('email')
         password = data.get('password')
+        role = data.get('role')
 
-        if email and password:
-            try:
-                user = User.objects.get(email=email)
-                
-                # This will hash the input password and compare it to the stored hash
-                if not user.check_password(password):
-                    raise serializers.ValidationError("Incorrect password or password")
-                    
-            except User.DoesNotExist:
-                raise serializers.ValidationError("User does not exist")
-        else:
+        if not (email and password):
             raise serializers.ValidationError("Email and password are required")
 
+        # Emails are matched case-insensitively, as the login throttle counts them, through
+        # the lower(email) index
+        users = User.objects.filter(Exact(Lower('email'), email.lower()))
+        if role:
+            users = users.filter(role=role)
+        users = list(users[:2])
+
+        if len(users) != 1:
+            # Unknown email, or one with several roles and no role given. Either way, run the
+            # password hasher so the answer takes as long as a wrong password and gives nothing away
+            User().set_password(password)
+            raise serializers.ValidationError("Incorrect email or password")
+
+        user = users[0]
+        # This will hash the input password and compare it to the stored hash
+        if not user.check_password(password):
+            raise serializers.ValidationError("Incorrect email or password")
+
         data['user'] = user
         return data
@@ -1,3 +1,223 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from attendance.models import SectionAttendance
+from core.endpoints import client_for
+from core.testing import create_parent, create_school, create_section, create_student, create_teacher, create_user
+from users.models import User
+from users.principal import Principal
+from users.provisioning import USERNAME_ATTEMPTS, unique_usernames
+from users.tokens import RoleRefreshToken
+
+
+class PrincipalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.teacher = create_teacher(cls.school)
+        cls.parent = create_parent(create_student(create_section(cls.school)))
+
+    def test_profiles_are_resolved_through_their_link_in_one_query(self):
+        # Changed emails no longer break the link between a profile and its account
+        type(self.teacher).objects.filter(pk=self.teacher.pk).update(email='renamed@example.com')
+        cases = [
+            (self.school.user, {'school_id': self.school.pk, 'teacher_id': None, 'parent_id': None}),
+            (self.teacher.user, {'school_id': self.school.pk, 'teacher_id': self.teacher.pk, 'parent_id': None}),
+            (self.parent.user, {'school_id': self.school.pk, 'teacher_id': None, 'parent_id': self.parent.pk}),
+        ]
+        for user, ids in cases:
+            with self.subTest(role=user.role), self.assertNumQueries(1):
+                self.assertEqual(Principal.from_user(user).as_claims(), {'role': user.role, **ids})
+
+    def test_tokens_carry_the_principal(self):
+        token = RoleRefreshToken.for_user(self.teacher.user).access_token
+        with self.assertNumQueries(0):
+            principal = Principal.from_token(token)
+        self.assertEqual(principal.as_claims(), Principal.from_user(self.teacher.user).as_claims())
+        self.assertEqual(principal.user_id, self.teacher.user_id)
+
+    def test_only_the_schools_own_account_owns_it(self):
+        self.assertTrue(Principal.from_user(self.school.user).owns_school(self.school.pk))
+        self.assertTrue(Principal.from_user(self.school.user).owns_school(str(self.school.pk)))
+        self.assertFalse(Principal.from_user(self.school.user).owns_school(create_school().pk))
+        self.assertFalse(Principal.from_user(self.teacher.user).owns_school(self.school.pk))
+
+
+class StatelessAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.section = create_section(cls.school)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.school.user)
+        self.urls = [
+            reverse('school-get-school-sections', args=[self.school.pk]),
+            reverse('async-school-get-school-sections', args=[self.school.pk]),
+        ]
+
+    def user_queries(self, url, client=None):
+        with CaptureQueriesContext(connection) as context:
+            response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return [query['sql'] for query in context if 'FROM "users_user"' in query['sql']]
+
+    @override_settings(STATELESS_JWT_USER_CHECK_TTL=None)
+    def test_requests_make_no_users_query(self):
+        for url in self.urls:
+            self.assertEqual(self.user_queries(url), [], url)
+
+    def test_active_check_is_cached(self):
+        for url in self.urls:
+            cache.clear()
+            self.assertEqual(len(self.user_queries(url)), 1, url)
+            self.assertEqual(self.user_queries(url), [], url)
+
+    def test_deactivated_users_are_rejected(self):
+        User.objects.filter(pk=self.school.user_id).update(is_active=False)
+        for url in self.urls:
+            self.assertEqual(self.client.get(url).status_code, 401, url)
+
+    def test_tokens_without_claims_load_the_user(self):
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.school.user).access_token}')
+        self.assertEqual(len(self.user_queries(self.urls[0], client)), 1)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for role in ('SCHOOL', 'TEACHER'):
+            user = create_user(role, 'both@example.com')
+            user.set_password('secret')
+            user.save()
+        cls.user = create_user('PARENT', 'alice@example.com')
+        cls.user.set_password('secret')
+        cls.user.save()
+
+    def setUp(self):
+        caches['throttle'].clear()
+
+    def login(self, **data):
+        return self.client.post(reverse('login'), data, content_type='application/json')
+
+    def test_emails_match_whatever_their_case(self):
+        response = self.login(email='Alice@Example.COM', password='secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], self.user.pk)
+
+    def test_wrong_password_and_unknown_email_get_the_same_answer(self):
+        wrong = self.login(email='alice@example.com', password='wrong')
+        unknown = self.login(email='nobody@example.com', password='secret')
+        self.assertEqual((wrong.status_code, wrong.json()), (unknown.status_code, unknown.json()))
+
+    def test_several_roles_need_a_role_without_saying_so(self):
+        response = self.login(email='both@example.com', password='secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), self.login(email='nobody@example.com', password='secret').json())
+
+        response = self.login(email='both@example.com', password='secret', role='TEACHER')
+        self.assertEqual(response.json()['user']['role'], 'TEACHER')
+
+
+class MergeDuplicateUsersMigrationTests(TransactionTestCase):
+    """users.0003 merges duplicate (email, role) accounts before adding its unique constraint."""
+    before = [('users', '0002_alter_user_email')]
+
+    def setUp(self):
+        MigrationExecutor(connection).migrate(self.before)
+        loader = MigrationExecutor(connection).loader
+        self.apps = loader.project_state(list(loader.applied_migrations)).apps  # Every app as the database now is
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_merged_into_the_newest_account(self):
+        OldUser = self.apps.get_model('users', 'User')
+        School = self.apps.get_model('school', 'School')
+        Teacher = self.apps.get_model('teacher', 'Teacher')
+        Grade = self.apps.get_model('grade', 'Grade')
+        Section = self.apps.get_model('section', 'Section')
+        SectionRoster = self.apps.get_model('attendance', 'SectionRoster')
+        SectionAttendance = self.apps.get_model('attendance', 'SectionAttendance')
+
+        school = School.objects.create(name='School', address='Test', phone='0', email='school@example.com')
+        teachers = [
+            OldUser.objects.create(username=f'teacher_{n}', email='teacher@example.com', role='TEACHER') for n in range(3)
+        ]
+        parent = OldUser.objects.create(username='parent', email='teacher@example.com', role='PARENT')
+        Teacher.objects.create(first_name='T', last_name='T', phone='0', email='teacher@example.com', school=school, user=teachers[0])
+        section = Section.objects.create(section='A', grade=Grade.objects.create(grade_name='1', school=school))
+        roster = SectionRoster.objects.create(section=section, size=0)
+        SectionAttendance.objects.create(section=section, roster=roster, date='2024-01-01', states=b'', taken_by=teachers[1])
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+        self.assertEqual(
+            sorted(User.objects.values_list('username', 'role')), [('parent', 'PARENT'), ('teacher_2', 'TEACHER')],
+        )
+        kept = User.objects.get(role='TEACHER')
+        self.assertEqual(kept.teacher_profile.email, 'teacher@example.com')
+        self.assertEqual(SectionAttendance.objects.get().taken_by_id, kept.pk)
+        self.assertTrue(User.objects.filter(pk=parent.pk).exists())
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+
+    def login(self, data, **extra):
+        return self.client.post(reverse('login'), data, content_type='application/json', **extra)
+
+    def test_non_string_email_is_rejected_not_a_server_error(self):
+        for email in (123, ['a@example.com'], {'email': 'a@example.com'}):
+            response = self.login({'email': email, 'password': 'x'})
+            self.assertEqual(response.status_code, 400)
+
+    def test_forwarded_for_header_does_not_reset_the_ip_limit(self):
+        for i in range(30):
+            self.login({'email': f'user{i}@example.com', 'password': 'x'}, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}')
+        response = self.login({'email': 'other@example.com', 'password': 'x'}, HTTP_X_FORWARDED_FOR='10.0.1.1')
+        self.assertEqual(response.status_code, 429)
+
+    def test_account_limit_ignores_case_and_whitespace(self):
+        for _ in range(10):
+            self.login({'email': 'a@example.com', 'password': 'x'})
+        response = self.login({'email': ' A@Example.com ', 'password': 'x'}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 429)
+
+
+class UniqueUsernameTests(TestCase):
+    def profile(self, username):
+        calls = []
+        return SimpleNamespace(generate_username=lambda: calls.append(1) or username, calls=calls)
+
+    def test_usernames_that_keep_clashing_get_a_uuid_suffix(self):
+        User.objects.create(username='taken_1', email='taken@example.com')
+        profiles = [self.profile('taken_1'), self.profile('taken_1'), self.profile('free_1')]
+
+        usernames = unique_usernames(profiles)
+
+        self.assertEqual(usernames[2], 'free_1')
+        self.assertEqual(len(set(usernames)), 3)
+        for username in usernames[:2]:
+            self.assertRegex(username, r'^taken_1_[0-9a-f]{32}$')
+        self.assertEqual(len(profiles[0].calls), USERNAME_ATTEMPTS)
+
+    def test_suffixed_usernames_fit_the_column(self):
+        long_name = 'a' * 150
+        User.objects.create(username=long_name, email='long@example.com')
+
+        username, = unique_usernames([self.profile(long_name)])
+
+        self.assertEqual(len(username), User._meta.get_field('username').max_length)
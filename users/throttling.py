@@ -0,0 +1,29 @@
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """
+    Base for the login throttles. Attempts are counted in the local 'throttle'
+    cache, and requests over the rate are rejected before any password hashing.
+    """
+    cache = caches['throttle']
+
+
+class LoginIPThrottle(LoginRateThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        # Not get_ident(): it trusts X-Forwarded-For, which any client can set to dodge the limit
+        return self.cache_format % {'scope': self.scope, 'ident': request.META.get('REMOTE_ADDR')}
+
+
+class LoginAccountThrottle(LoginRateThrottle):
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not email or not isinstance(email, str):
+            # Left to the serializer to reject; LoginIPThrottle still counts the attempt
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
@@ -0,0 +1,19 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.principal import Principal
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's role and school/teacher/parent ids.
+
+    The claims are copied into the access tokens it issues, so requests can be
+    authenticated without loading the user (see users.authentication).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in Principal.from_user(user).as_claims().items():
+            token[claim] = value
+        return token
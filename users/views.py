@@ -7,6 +7,8 @@ from .serializers import UserSerializer,LoginSerializer
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
+from .throttling import LoginAccountThrottle, LoginIPThrottle
+from .tokens import RoleRefreshToken
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -19,13 +21,16 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response({"message": "All users have been deleted."}, status=status.HTTP_204_NO_CONTENT)
 
 class LoginView(APIView):
+    # Checked before the serializer runs, so throttled attempts never reach the password hasher
+    throttle_classes = [LoginIPThrottle, LoginAccountThrottle]
+
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data['user']
 
-            # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            # Generate JWT tokens carrying the role and school/teacher/parent ids
+            refresh = RoleRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),